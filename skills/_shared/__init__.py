@@ -25,7 +25,7 @@ from .hash_helpers import hash_file, hash_string
 from .path_safety import PathSafetyError, is_safe_path, validate_path
 from .platform_utils import get_long_path, is_windows_path, is_wsl
 from .redaction import SecretRedactor, redact_secrets
-from .safe_io import safe_load_json, safe_update_json, safe_write_json, safe_write_text
+from .safe_io import flush_pending, safe_load_json, safe_update_json, safe_write_json, safe_write_text
 from .url_utils import clone_with_auth_fallback, redact_url_credentials, sanitize_json_urls
 from .cli_helpers import (
     add_dry_run_argument,
@@ -77,6 +77,7 @@ __all__ = [
     "safe_write_json",
     "safe_update_json",
     "safe_load_json",
+    "flush_pending",
     # Path safety
     "validate_path",
     "is_safe_path",
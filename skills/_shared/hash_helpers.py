@@ -5,9 +5,17 @@ hash_helpers.py - File hashing helper functions
 Provides file hashing utilities for tracking changes and matching artifacts.
 """
 
+import fnmatch
 import hashlib
+import re
+import stat
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Dict, List, Optional, Tuple
+
+# has_file_changed() side-table, least recently used first:
+# path -> ((st_dev, st_ino, mtime_ns, size), sha256 hex digest)
+_mtime_cache: Dict[str, Tuple[Tuple[int, int, int, int], str]] = {}
+_MTIME_CACHE_MAX = 1024
 
 
 def hash_file(file_path: Path) -> Optional[str]:
@@ -35,6 +43,34 @@ def hash_string(content: str) -> str:
     return hashlib.sha256(content.encode("utf-8")).hexdigest()
 
 
+# A "**" path segment in _compile_globs() output: zero or more directories.
+_ANY_DIRS = None
+
+
+def _compile_globs(patterns: List[str]) -> List[List[Optional["re.Pattern[str]"]]]:
+    """
+    Compile rglob-style patterns to one regex per path segment.
+
+    Matching is case-sensitive, like rglob on POSIX. As with rglob, a
+    pattern may match at any depth, so each one starts with _ANY_DIRS.
+    """
+    return [
+        [_ANY_DIRS]
+        + [_ANY_DIRS if segment == "**" else re.compile(fnmatch.translate(segment)) for segment in pattern.split("/")]
+        for pattern in patterns
+    ]
+
+
+def _glob_matches(segments: List[Optional["re.Pattern[str]"]], parts: Tuple[str, ...]) -> bool:
+    """Return True if compiled glob `segments` match the relative path `parts`."""
+    if not segments:
+        return not parts
+    head, rest = segments[0], segments[1:]
+    if head is _ANY_DIRS:
+        return any(_glob_matches(rest, parts[i:]) for i in range(len(parts) + 1))
+    return bool(parts) and head.match(parts[0]) is not None and _glob_matches(rest, parts[1:])
+
+
 def hash_directory_files(
     directory: Path, patterns: list[str] = None, exclude_patterns: list[str] = None
 ) -> Dict[str, str]:
@@ -43,7 +79,7 @@ def hash_directory_files(
 
     Args:
         directory: Directory to scan
-        patterns: List of glob patterns to include (e.g., ['*.md', '*.py'])
+        patterns: List of glob patterns to include (e.g., ['*.md', 'scripts/*.py'])
                  If None, includes all files
         exclude_patterns: List of glob patterns to exclude
 
@@ -55,20 +91,19 @@ def hash_directory_files(
 
     file_hashes = {}
 
-    # Get all files if no patterns specified
-    if patterns is None:
-        files = [f for f in directory.rglob("*") if f.is_file()]
-    else:
-        files = []
-        for pattern in patterns:
-            files.extend(directory.rglob(pattern))
-
-    # Apply exclusions
-    if exclude_patterns:
-        excluded = set()
-        for pattern in exclude_patterns:
-            excluded.update(directory.rglob(pattern))
-        files = [f for f in files if f not in excluded]
+    # Compile each glob once instead of re-walking the tree per pattern
+    include_res = _compile_globs(patterns) if patterns is not None else None
+    exclude_res = _compile_globs(exclude_patterns) if exclude_patterns else []
+
+    files = []
+    for file_path in directory.rglob("*"):
+        parts = file_path.relative_to(directory).parts
+        if include_res is not None and not any(_glob_matches(g, parts) for g in include_res):
+            continue
+        if any(_glob_matches(g, parts) for g in exclude_res):
+            continue
+        if file_path.is_file():
+            files.append(file_path)
 
     # Hash each file
     for file_path in files:
@@ -80,26 +115,73 @@ def hash_directory_files(
     return file_hashes
 
 
-def files_match(file1: Path, file2: Path) -> bool:
-    """Check if two files have the same content (by hash)."""
-    hash1 = hash_file(file1)
-    hash2 = hash_file(file2)
+def files_match(file1: Path, file2: Path, chunk_size: int = 65536) -> bool:
+    """
+    Check if two files have the same content.
+
+    Compares sizes first, then streams both files block by block and stops
+    at the first difference. Returns False if either file is missing,
+    not a regular file, or unreadable.
+    """
+    try:
+        stat1 = file1.stat()
+        stat2 = file2.stat()
+    except OSError:
+        return False
 
-    if hash1 is None or hash2 is None:
+    if not (stat.S_ISREG(stat1.st_mode) and stat.S_ISREG(stat2.st_mode)):
+        return False
+    if stat1.st_size != stat2.st_size:
         return False
 
-    return hash1 == hash2
+    try:
+        with open(file1, "rb") as f1, open(file2, "rb") as f2:
+            while True:
+                block1 = f1.read(chunk_size)
+                if block1 != f2.read(chunk_size):
+                    return False
+                if not block1:
+                    return True
+    except OSError:
+        return False
 
 
 def has_file_changed(file_path: Path, expected_hash: str) -> bool:
     """
     Check if a file has changed from an expected hash.
 
+    Digests are remembered per path together with the file's device,
+    inode, mtime_ns and size; when none of them has moved since the last
+    check the cached digest is reused instead of re-hashing the file. An
+    atomic rename swap changes the inode, so it is always re-hashed. Only
+    the _MTIME_CACHE_MAX most recently checked paths are remembered.
+
     Returns True if file is different or missing, False if matches.
     """
+    key = str(file_path)
+    try:
+        st = file_path.stat()
+    except OSError:
+        _mtime_cache.pop(key, None)
+        return True  # File missing or unreadable
+
+    stat_key = (st.st_dev, st.st_ino, st.st_mtime_ns, st.st_size)
+    cached = _mtime_cache.pop(key, None)
+    if cached is not None and cached[0] == stat_key:
+        _mtime_cache[key] = cached  # re-insert as most recently used
+        return cached[1] != expected_hash
+
     current_hash = hash_file(file_path)
 
     if current_hash is None:
         return True  # File missing or unreadable
 
+    _mtime_cache[key] = (stat_key, current_hash)
+    if len(_mtime_cache) > _MTIME_CACHE_MAX:
+        del _mtime_cache[next(iter(_mtime_cache))]
     return current_hash != expected_hash
+
+
+def clear_hash_cache() -> None:
+    """Forget all digests remembered by has_file_changed()."""
+    _mtime_cache.clear()
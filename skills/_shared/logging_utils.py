@@ -167,7 +167,8 @@ def log_action(action: str, target: str, dry_run: bool = False) -> None:
     """
     logger = get_logger("mine")
     prefix = "[DRY-RUN] " if dry_run else ""
-    logger.info(f"{prefix}{action} {target}")
+    # %-style args defer formatting until a handler actually emits the record
+    logger.info("%s%s %s", prefix, action, target)
 
 
 def log_skip(reason: str, target: str) -> None:
@@ -183,4 +184,4 @@ def log_skip(reason: str, target: str) -> None:
         # Output: SKIP: /path/to/file.md (Already exists)
     """
     logger = get_logger("mine")
-    logger.info(f"SKIP: {target} ({reason})")
+    logger.info("SKIP: %s (%s)", target, reason)
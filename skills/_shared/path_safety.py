@@ -13,6 +13,8 @@ Usage:
     validate_path("/some/path", root="/allowed/root")
 """
 
+import os
+import stat
 from pathlib import Path
 from typing import Optional, Union
 
@@ -34,6 +36,31 @@ def resolve_path(path: Union[str, Path]) -> Path:
     return Path(path).resolve()
 
 
+def _is_within(abs_path: Path, abs_root: Path) -> bool:
+    """Check containment of one already-resolved path in another."""
+    # Check if root is actually a parent of path
+    # This handles ../ traversal attempts automatically via resolve()
+    try:
+        abs_path.relative_to(abs_root)
+        return True
+    except ValueError:
+        # On case-insensitive filesystems (including WSL mounts),
+        # relative_to might fail due to case mismatch
+        if not platform_utils.is_path_case_sensitive(abs_root):
+            # Check parts case-insensitively
+            root_parts = abs_root.parts
+            path_parts = abs_path.parts
+
+            if len(path_parts) >= len(root_parts):
+                # Compare prefix parts case-insensitively
+                for r, p in zip(root_parts, path_parts):
+                    if r.lower() != p.lower():
+                        return False
+                return True
+
+        return False
+
+
 def is_safe_path(path: Union[str, Path], root: Union[str, Path]) -> bool:
     """
     Check if a path is safely contained within a root directory.
@@ -47,37 +74,17 @@ def is_safe_path(path: Union[str, Path], root: Union[str, Path]) -> bool:
     """
     try:
         # Convert to absolute paths and resolve symlinks
-        abs_path = resolve_path(path)
-        abs_root = resolve_path(root)
-
-        # Check if root is actually a parent of path
-        # This handles ../ traversal attempts automatically via resolve()
-        try:
-            abs_path.relative_to(abs_root)
-            return True
-        except ValueError:
-            # On case-insensitive filesystems (including WSL mounts),
-            # relative_to might fail due to case mismatch
-            if not platform_utils.is_path_case_sensitive(abs_root):
-                # Check parts case-insensitively
-                root_parts = abs_root.parts
-                path_parts = abs_path.parts
-
-                if len(path_parts) >= len(root_parts):
-                    # Compare prefix parts case-insensitively
-                    for r, p in zip(root_parts, path_parts):
-                        if r.lower() != p.lower():
-                            return False
-                    return True
-
-            return False
-
+        return _is_within(resolve_path(path), resolve_path(root))
     except (OSError, RuntimeError):
         return False
 
 
 def validate_path(
-    path: Union[str, Path], root: Union[str, Path], allow_symlinks: bool = False, error_msg: Optional[str] = None
+    path: Union[str, Path],
+    root: Union[str, Path],
+    allow_symlinks: bool = False,
+    error_msg: Optional[str] = None,
+    root_resolved: bool = False,
 ) -> Path:
     """
     Validate that a path is safe and within the allowed root.
@@ -87,6 +94,8 @@ def validate_path(
         root: Allowed root directory
         allow_symlinks: Whether to allow the final path to be a symlink
         error_msg: Custom error message used if validation fails
+        root_resolved: root is already resolve()d (e.g. cached by a caller
+            validating many paths against it), so it is not resolved again
 
     Returns:
         Path: The resolved absolute path
@@ -107,19 +116,30 @@ def validate_path(
     # This prevents symlink-based escapes from the allowed root
     if not allow_symlinks:
         try:
-            # Check if the path exists and is a symlink
-            if path_obj.exists() and path_obj.is_symlink():
-                raise PathSafetyError(f"Symlink not allowed: {path}. Set allow_symlinks=True to permit.")
+            # lstat() the unresolved path: one syscall, and unlike exists() it
+            # does not follow the link, so a dangling symlink is caught too
+            is_link = stat.S_ISLNK(os.lstat(path_obj).st_mode)
         except OSError:
-            # If we can't check (permission issues, etc.), proceed with caution
-            # The is_safe_path check will still validate the resolved path
-            pass
+            # Nothing there yet, or we can't check (permission issues, etc.):
+            # proceed with caution, the containment check still validates
+            # the resolved path
+            is_link = False
+        if is_link:
+            raise PathSafetyError(f"Symlink not allowed: {path}. Set allow_symlinks=True to permit.")
+
+    # Resolve the path once: the same result is checked and returned
+    try:
+        abs_path = resolve_path(path)
+        abs_root = Path(root) if root_resolved else resolve_path(root)
+        safe = _is_within(abs_path, abs_root)
+    except (OSError, RuntimeError):
+        safe = False
 
-    if not is_safe_path(path, root):
+    if not safe:
         msg = error_msg or f"Path '{path}' is outside allowed root '{root}'"
         raise PathSafetyError(msg)
 
-    return resolve_path(path)
+    return abs_path
 
 
 def ensure_directory_safety(path: Union[str, Path], root: Union[str, Path]) -> None:
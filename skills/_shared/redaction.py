@@ -8,8 +8,15 @@ Removes common credential patterns from converted content.
 Part of Agentic Discovery & Conversion
 """
 
+import bisect
+import heapq
+import os
 import re
-from typing import List, Tuple
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Pattern, Sequence, Tuple, Union
 
 # Regex patterns for common secrets
 # Format: (pattern, replacement, description)
@@ -26,7 +33,10 @@ SECRET_PATTERNS: List[Tuple[str, str, str]] = [
     (r"AIza[a-zA-Z0-9_-]{35}", "[REDACTED-GOOGLE-API-KEY]", "Google API key"),
     # AWS keys
     (r"AKIA[A-Z0-9]{16}", "[REDACTED-AWS-ACCESS-KEY]", "AWS Access Key ID"),
-    # AWS Secret Key - handles: key=value, key: value, "key": "value", and JSON format
+    # AWS Secret Key - handles: key=value, key: value, "key": "value", and JSON format.
+    # Any amount of whitespace, line breaks included, is allowed on either side of the
+    # separator (YAML puts the value on the next line). Each run is followed by a fixed
+    # character class it cannot overlap, so matching stays linear.
     (
         r'(["\']?(?:aws[_-]?secret[_-]?access[_-]?key|secret[_-]?key)["\']?\s*[:=]\s*["\']?)([a-zA-Z0-9/+=]{40})(["\']?)',
         r"\1[REDACTED-AWS-SECRET]\3",
@@ -98,14 +108,211 @@ SECRET_PATTERNS: List[Tuple[str, str, str]] = [
     (r"[MN][a-zA-Z0-9]{23,}\.[a-zA-Z0-9_-]{6}\.[a-zA-Z0-9_-]{27}", "[REDACTED-DISCORD-TOKEN]", "Discord token"),
 ]
 
+_FLAGS = re.IGNORECASE | re.MULTILINE
+
+# Lowercase literals at least one of which appears in any text a pattern can match,
+# keyed by pattern description. Checking them with ``in`` is far cheaper than running
+# the regex, so patterns whose hints are all absent are skipped without a scan.
+_PATTERN_HINTS = {
+    "OpenAI API key": ("sk-",),
+    "GitHub Personal Access Token": ("ghp_",),
+    "GitHub OAuth Token": ("gho_",),
+    "GitHub User Token": ("ghu_",),
+    "GitHub Server Token": ("ghs_",),
+    "GitHub Refresh Token": ("ghr_",),
+    "Google API key": ("aiza",),
+    "AWS Access Key ID": ("akia",),
+    "AWS Secret Key": ("secret",),
+    "Anthropic API key": ("sk-ant-",),
+    "Azure API key": ("key", "secret"),
+    "Azure Storage connection string": ("defaultendpointsprotocol=",),
+    "Private key": ("-----begin",),
+    "EC Private key": ("-----begin",),
+    "SSH Private key": ("-----begin",),
+    "Generic API key": ("api", "secret", "token"),
+    "Password": ("pass", "pwd"),
+    "Generic token": ("token",),
+    "Bearer token": ("bearer",),
+    "Connection string": ("://",),
+    "Slack token": ("xox",),
+    "Stripe secret key": ("sk_live_",),
+    "Stripe public key": ("pk_live_",),
+    "Stripe restricted key": ("rk_live_",),
+    "SendGrid API key": ("sg.",),
+    "Twilio API key": ("sk",),
+    "npm token": ("npm_",),
+    "Discord token": (".",),
+}
+
+
+# Keyword regexes for the contextual patterns. Those patterns have no literal prefix, so
+# the engine tries them at every position; the keyword has one, so checking it first is
+# a fast literal search, and the full pattern only runs when its keyword is present.
+_CONTEXT_GATES = {
+    "AWS Secret Key": re.compile(r"secret[_-]?(?:access[_-]?)?key", _FLAGS),
+    "Azure API key": re.compile(
+        r"azure[_-]?(?:storage[_-]?)?(?:account[_-]?)?key|subscription[_-]?key|cognitive[_-]?services[_-]?key"
+        r"|client[_-]?secret|azure[_-]?api[_-]?key",
+        _FLAGS,
+    ),
+    "Generic API key": re.compile(
+        r"api[_-]?key|apikey|api_secret|secret_key|access_token|auth_token|bearer_token", _FLAGS
+    ),
+}
+
+
+# A marker written by redaction, as it appears in lowercased text
+_REDACTION_MARKER = re.compile(r"\[redacted[-a-z]*\]")
+
+
+def _compile_patterns(patterns: Sequence[Tuple[str, str, str]]) -> Tuple[Tuple[Pattern[str], str, str], ...]:
+    """
+    Compile (pattern, replacement, description) entries, dropping any that are invalid.
+
+    Args:
+        patterns: Entries in SECRET_PATTERNS format
+
+    Returns:
+        Tuple of (compiled pattern, replacement, description) in the original order
+    """
+    compiled = []
+    for pattern, replacement, description in patterns:
+        try:
+            compiled.append((re.compile(pattern, _FLAGS), replacement, description))
+        except re.error:
+            continue
+    return tuple(compiled)
+
+
+# SECRET_PATTERNS compiled once at import; every SecretRedactor shares this table
+_COMPILED = _compile_patterns(SECRET_PATTERNS)
+
+
+# Rank of each pattern when matches overlap (lower wins): table order, except that the
+# generic key/value patterns come after every specific one
+_GENERIC_PATTERNS = ("Generic API key", "Password", "Generic token")
+_PRIORITY = {
+    description: rank
+    for rank, description in enumerate(
+        [d for _, _, d in SECRET_PATTERNS if d not in _GENERIC_PATTERNS] + list(_GENERIC_PATTERNS)
+    )
+}
+
+
+# A group reference in a replacement template: \\1 or \\g<1>
+_GROUP_REFERENCE = re.compile(r"\\(\d+)|\\g<(\d+)>")
+
+# Marker for the part of a secret that an overlapping, higher-priority match left uncovered
+_PARTIAL_MARKER = "[REDACTED]"
+
+
+@lru_cache(maxsize=None)
+def _group_roles(pattern: Pattern[str], replacement: str) -> Tuple[Tuple[int, ...], Tuple[int, ...]]:
+    """Split a pattern's groups into those its replacement copies back and those it drops."""
+    kept = {int(number or named) for number, named in _GROUP_REFERENCE.findall(replacement)}
+    dropped = tuple(group for group in range(1, pattern.groups + 1) if group not in kept)
+    return tuple(sorted(kept)), dropped
+
+
+def _secret_ranges(match: "re.Match[str]", replacement: str) -> List[Tuple[int, int]]:
+    """
+    Return the spans of match that its replacement hides.
+
+    Groups the replacement drops hold the secret value (``password = (value)``); a
+    pattern without such groups hides everything it does not copy back.
+    """
+    kept, dropped = _group_roles(match.re, replacement)
+    if dropped:
+        return [match.span(group) for group in dropped if match.start(group) >= 0]
+    ranges = []
+    pos = match.start()
+    for group in kept:
+        start, end = match.span(group)
+        if start < 0:
+            continue
+        if start > pos:
+            ranges.append((pos, start))
+        pos = max(pos, end)
+    if pos < match.end():
+        ranges.append((pos, match.end()))
+    return ranges
+
+
+def _uncovered(start: int, end: int, starts: List[int], ends: List[int]) -> List[Tuple[int, int]]:
+    """Return the parts of [start, end) outside the sorted, disjoint intervals given."""
+    pieces = []
+    pos = start
+    i = bisect.bisect_right(ends, start)
+    while i < len(starts) and starts[i] < end:
+        if starts[i] > pos:
+            pieces.append((pos, starts[i]))
+        pos = max(pos, ends[i])
+        i += 1
+    if pos < end:
+        pieces.append((pos, end))
+    return pieces
+
+
+def _candidate_patterns(
+    content: str, patterns: Sequence[Tuple[Pattern[str], str, str]] = _COMPILED
+) -> Sequence[Tuple[Pattern[str], str, str]]:
+    """
+    Return the entries of patterns that could match content, in their original order.
+
+    Literal hints are only checked on ASCII content: IGNORECASE also folds a few
+    non-ASCII letters onto ASCII ones (e.g. the Kelvin sign onto "k"), which
+    str.lower() does not reproduce. Contextual patterns must also pass their gate.
+    """
+    text = content
+    if content.isascii():
+        text = content.lower()
+        if "[redacted" in text:
+            # Markers from an earlier pass (``[REDACTED-SLACK-TOKEN]``) would otherwise revive
+            # hints and gates such as "token" and "azure-key"; no pattern can match inside one
+            text = _REDACTION_MARKER.sub("", text)
+        patterns = [entry for entry in patterns if any(hint in text for hint in _PATTERN_HINTS.get(entry[2], ("",)))]
+    return [entry for entry in patterns if entry[2] not in _CONTEXT_GATES or _CONTEXT_GATES[entry[2]].search(text)]
+
+
+# Start of a PEM armour line; a BEGIN with no END after it must not be split across blocks
+_PEM_MARKER = re.compile(r"-----(BEGIN|END)\s", re.IGNORECASE)
+
+
+def _stream_cut(text: str) -> int:
+    """
+    Return how much of text can be redacted now without splitting a secret.
+
+    That is everything up to the last line break, less any PEM block still
+    waiting for its END line.
+    """
+    cut = text.rfind("\n") + 1
+    last = None
+    for last in _PEM_MARKER.finditer(text, 0, cut):
+        pass
+    if last is not None and last.group(1).upper() == "BEGIN":
+        cut = text.rfind("\n", 0, last.start()) + 1
+    return cut
+
 
 class SecretRedactor:
     """Redacts secrets from content."""
 
+    __slots__ = (
+        "verbose",
+        "_patterns",
+        "redaction_count",
+        "redaction_types",
+        "contextual_gate_hits",
+        "overlaps_suppressed",
+    )
+
     def __init__(self, verbose: bool = False):
         self.verbose = verbose
+        self._patterns = _COMPILED
         self.redaction_count = 0
         self.redaction_types: List[str] = []
+        self.contextual_gate_hits = 0
+        self.overlaps_suppressed = 0
 
     def redact(self, content: str) -> str:
         """
@@ -117,36 +324,200 @@ class SecretRedactor:
         Returns:
             Content with secrets replaced by redaction markers
         """
-        result = content
         self.redaction_count = 0
         self.redaction_types = []
+        self.contextual_gate_hits = 0
+        self.overlaps_suppressed = 0
+        return self._redact_block(content)
+
+    def redact_stream(self, chunks: Iterable[str]) -> Iterator[str]:
+        """
+        Redact content that arrives in pieces, yielding redacted blocks as they complete.
+
+        Blocks end at line breaks and never inside an unterminated PEM key, so peak
+        memory is one block plus the carried tail rather than the whole content and
+        its redacted copy. A secret split over several lines outside a PEM block
+        (``password =`` on one line, the value on the next) is only caught when
+        those lines fall in the same block.
+
+        Args:
+            chunks: Pieces of the content, in order
+
+        Yields:
+            Redacted text; joined together it is the redacted content
+        """
+        self.redaction_count = 0
+        self.redaction_types = []
+        self.contextual_gate_hits = 0
+        self.overlaps_suppressed = 0
+
+        carry = ""
+        for chunk in chunks:
+            buffer = carry + chunk
+            cut = _stream_cut(buffer)
+            if cut:
+                yield self._redact_block(buffer[:cut])
+            carry = buffer[cut:]
+        if carry:
+            yield self._redact_block(carry)
+
+    def redact_many(self, paths: Iterable[Union[str, Path]], max_workers: Optional[int] = None) -> List[str]:
+        """
+        Redact several files, spreading them over worker processes.
+
+        Each worker imports this module once, which compiles the pattern table once per
+        process; only paths go out and redacted text comes back. Statistics cover all files.
 
-        for pattern, replacement, description in SECRET_PATTERNS:
-            try:
-                matches = re.findall(pattern, result, flags=re.IGNORECASE | re.MULTILINE)
-                if matches:
-                    result = re.sub(pattern, replacement, result, flags=re.IGNORECASE | re.MULTILINE)
-                    count = len(matches) if isinstance(matches, list) else 1
-                    self.redaction_count += count
-                    self.redaction_types.append(description)
-
-                    if self.verbose:
-                        print(f"[REDACT] Found {count} {description}", file=__import__("sys").stderr)
-            except re.error as e:
-                if self.verbose:
-                    print(f"[REDACT] Regex error for {description}: {e}", file=__import__("sys").stderr)
+        Args:
+            paths: Files to read (UTF-8, undecodable bytes replaced)
+            max_workers: Worker processes; defaults to os.cpu_count(). 1 runs in-process.
+
+        Returns:
+            Redacted content of each file, in the order given
+        """
+        self.redaction_count = 0
+        self.redaction_types = []
+        self.contextual_gate_hits = 0
+        self.overlaps_suppressed = 0
+
+        paths = [os.fspath(path) for path in paths]
+        workers = min(max_workers or os.cpu_count() or 1, len(paths))
+        if workers <= 1:
+            results = [_redact_file(path, self.verbose) for path in paths]
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                # Batches of paths per task keep the IPC round trips down for many small files
+                chunksize = max(1, min(32, len(paths) // workers))
+                results = list(executor.map(_redact_file, paths, [self.verbose] * len(paths), chunksize=chunksize))
+
+        redacted = []
+        for text, count, types, gate_hits, overlaps in results:
+            redacted.append(text)
+            self.redaction_count += count
+            self.redaction_types.extend(types)
+            self.contextual_gate_hits += gate_hits
+            self.overlaps_suppressed += overlaps
+        return redacted
+
+    def _redact_block(self, content: str) -> str:
+        """Redact one block of content, adding to the running statistics."""
+        candidates = _candidate_patterns(content, self._patterns)
+        self.contextual_gate_hits += sum(1 for _, _, description in candidates if description in _CONTEXT_GATES)
+
+        # Every candidate match is taken from the original text, then overlapping ones are
+        # settled by pattern priority: a specific label (``xoxb-...`` as a Slack token) beats
+        # a generic one (``SLACK_TOKEN=...``) whichever starts first. A match that loses
+        # still hides whatever part of its secret the winners do not cover.
+        spans = []
+        for pattern, replacement, description in candidates:
+            rank = _PRIORITY.get(description, len(_PRIORITY))
+            for match in pattern.finditer(content):
+                spans.append((rank, match.start(), match.end(), len(spans), match, replacement, description))
+        if not spans:
+            return content
+
+        heapq.heapify(spans)
+        seen = {span[:3] for span in spans}
+        starts: List[int] = []
+        ends: List[int] = []
+        chosen = []
+        suppressed = []
+        while spans:
+            rank, start, end, _, match, replacement, description = span = heapq.heappop(spans)
+            i = bisect.bisect_right(starts, start)
+            if (i and ends[i - 1] > start) or (i < len(starts) and starts[i] < end):
+                suppressed.append(span)
+                # finditer() resumed after this match, so a match of the same pattern that
+                # starts inside it was never looked for; it may not overlap the winner
+                for later in match.re.finditer(content, start + 1):
+                    if later.start() >= end:
+                        break
+                    key = (rank, later.start(), later.end())
+                    if key not in seen:
+                        seen.add(key)
+                        heapq.heappush(spans, (*key, len(seen), later, replacement, description))
                 continue
+            starts.insert(i, start)
+            ends.insert(i, end)
+            chosen.insert(i, span)
+        self.overlaps_suppressed += len(suppressed)
+
+        # Secret bytes of the losing matches that no accepted span covers, merged into runs
+        masks = []
+        for _, _, _, _, match, replacement, description in suppressed:
+            for secret_start, secret_end in _secret_ranges(match, replacement):
+                for start, end in _uncovered(secret_start, secret_end, starts, ends):
+                    masks.append((start, end, description))
+        if masks:
+            masks.sort()
+            merged = [masks[0]]
+            for start, end, description in masks[1:]:
+                if start <= merged[-1][1]:
+                    merged[-1] = (merged[-1][0], max(end, merged[-1][1]), merged[-1][2])
+                else:
+                    merged.append((start, end, description))
+            chosen = sorted(
+                chosen
+                + [(None, start, end, None, None, _PARTIAL_MARKER, description) for start, end, description in merged],
+                key=lambda span: span[1],
+            )
+
+        # One pass over the accepted spans, in text order, writes the output
+        verbose = self.verbose
+        parts = []
+        found: Dict[str, int] = {}
+        pos = 0
+        for _, start, end, _, match, replacement, description in chosen:
+            if match is None:
+                redacted = replacement
+            else:
+                try:
+                    redacted = match.expand(replacement)
+                except re.error as e:
+                    if verbose:
+                        print(f"[REDACT] Regex error for {description}: {e}", file=sys.stderr)
+                    continue
+            parts.append(content[pos:start])
+            parts.append(redacted)
+            pos = end
+            found[description] = found.get(description, 0) + 1
+        if not found:
+            return content
+        parts.append(content[pos:])
 
-        return result
+        for description, count in found.items():
+            self.redaction_count += count
+            self.redaction_types.append(description)
+            if verbose:
+                print(f"[REDACT] Found {count} {description}", file=sys.stderr)
+
+        return "".join(parts)
 
     def get_stats(self) -> dict:
-        """Get redaction statistics from the last redact() call."""
+        """Get redaction statistics from the last redact(), redact_stream() or redact_many() call."""
         return {
             "redaction_count": self.redaction_count,
             "redaction_types": list(set(self.redaction_types)),
+            "contextual_gate_hits": self.contextual_gate_hits,
+            "overlaps_suppressed": self.overlaps_suppressed,
         }
 
 
+def _redact_file(path: str, verbose: bool = False) -> Tuple[str, int, List[str], int, int]:
+    """Worker for SecretRedactor.redact_many(): redact one file and return text plus stats."""
+    with open(path, "r", encoding="utf-8", errors="replace") as f:
+        content = f.read()
+    redactor = SecretRedactor(verbose=verbose)
+    result = redactor.redact(content)
+    return (
+        result,
+        redactor.redaction_count,
+        redactor.redaction_types,
+        redactor.contextual_gate_hits,
+        redactor.overlaps_suppressed,
+    )
+
+
 def redact_secrets(content: str, verbose: bool = False) -> str:
     """
     Convenience function to redact secrets from content.
@@ -172,10 +543,4 @@ def contains_secrets(content: str) -> bool:
     Returns:
         True if secrets are detected
     """
-    for pattern, _, _ in SECRET_PATTERNS:
-        try:
-            if re.search(pattern, content, flags=re.IGNORECASE | re.MULTILINE):
-                return True
-        except re.error:
-            continue
-    return False
+    return any(pattern.search(content) for pattern, _, _ in _candidate_patterns(content))
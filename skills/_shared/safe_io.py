@@ -11,18 +11,69 @@ Goal:
   - Readers see either the old complete file or the new complete file (never partial).
   - Multiple writers serialize via a lock file to avoid "last writer wins with stale data".
   - Read→modify→write operations are atomic (no lost updates).
+
+Durability: file contents are fdatasync'ed before every replace, and the
+parent directory is fsynced so the rename itself survives a crash. Writers
+of many regenerable files can pass durable=False to batch that directory
+fsync into flush_pending() (run at exit).
 """
 
 from __future__ import annotations
 
+import atexit
+import errno
 import json
 import os
 import shutil
+import signal
+import stat
 import tempfile
+import threading
 import time
+import weakref
 from contextlib import contextmanager
 from pathlib import Path
-from typing import Any, Callable, Iterator, Optional
+from typing import Any, Callable, Dict, Iterator, Optional, Set, Tuple
+
+# Files last seen holding valid JSON, least recently used first:
+# path -> (st_dev, st_ino, st_mtime_ns, st_size). Lets _is_valid_json_file()
+# skip re-parsing a file this process just read or wrote; os.replace() swaps
+# in a new inode, so any rewrite misses the cache.
+_valid_json_stats: Dict[str, Tuple[int, int, int, int]] = {}
+_VALID_JSON_CACHE_MAX = 1024
+
+
+# In-process locks keyed by absolute lock-file path. Threads of one process
+# queue here first, so only the thread holding this lock touches the lock
+# file; fcntl/msvcrt stays authoritative across processes. Weak values let
+# entries vanish once no thread is using that lock path. RLocks let a thread
+# re-enter file_lock() for a path it already holds (e.g. from an update_fn);
+# _held_locks records which keys a thread holds so the nested call skips the
+# OS lock, which would otherwise conflict with the outer call's lock file.
+_local_locks: "weakref.WeakValueDictionary[str, threading.RLock]" = weakref.WeakValueDictionary()
+_local_locks_guard = threading.Lock()
+_held_locks = threading.local()
+
+
+def _stat_key(st: os.stat_result) -> Tuple[int, int, int, int]:
+    return (st.st_dev, st.st_ino, st.st_mtime_ns, st.st_size)
+
+
+def _remember_valid_json(path: Path, key: Tuple[int, int, int, int]) -> None:
+    """Record `path` as valid JSON at `key`, evicting the least recently used entry."""
+    name = str(path)
+    _valid_json_stats.pop(name, None)
+    _valid_json_stats[name] = key
+    if len(_valid_json_stats) > _VALID_JSON_CACHE_MAX:
+        del _valid_json_stats[next(iter(_valid_json_stats))]
+
+
+def _known_valid_json(path: Path, key: Tuple[int, int, int, int]) -> bool:
+    """Return True if `path` was last seen holding valid JSON at `key`."""
+    if _valid_json_stats.get(str(path)) != key:
+        return False
+    _remember_valid_json(path, key)  # mark as most recently used
+    return True
 
 
 class FileLockTimeoutError(RuntimeError):
@@ -31,12 +82,61 @@ class FileLockTimeoutError(RuntimeError):
     pass
 
 
+# Wait for a contended POSIX lock in a blocking flock() bounded by an
+# ITIMER_REAL alarm instead of polling. Set False to always poll.
+_BLOCKING_FLOCK = hasattr(signal, "setitimer")
+
+
+class _LockWaitExpired(Exception):
+    """Raised by the SIGALRM handler to break out of a blocking flock()."""
+
+
+def _on_lock_alarm(signum: int, frame: Any) -> None:
+    raise _LockWaitExpired
+
+
+def _can_block_with_timer() -> bool:
+    """
+    True if this call may own SIGALRM for a blocking lock wait.
+
+    Signal handlers only run on the main thread, and an existing handler or
+    armed ITIMER_REAL belongs to the application, so poll in those cases.
+    """
+    return (
+        _BLOCKING_FLOCK
+        and threading.current_thread() is threading.main_thread()
+        and signal.getsignal(signal.SIGALRM) == signal.SIG_DFL
+        and signal.getitimer(signal.ITIMER_REAL) == (0.0, 0.0)
+    )
+
+
+def _flock_with_timer(fd: int, timeout_s: float) -> bool:  # pragma: posix-only
+    """Block in flock(LOCK_EX) for at most timeout_s; True once locked."""
+    import fcntl
+
+    previous = signal.signal(signal.SIGALRM, _on_lock_alarm)
+    try:
+        signal.setitimer(signal.ITIMER_REAL, timeout_s)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            return True
+        finally:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+    except _LockWaitExpired:
+        # If the alarm lands just after flock() returned, the caller closes
+        # the file, which drops the lock again.
+        return False
+    finally:
+        signal.signal(signal.SIGALRM, previous)
+
+
 @contextmanager
 def file_lock(lock_path: Path, timeout_s: float = 10.0, poll_s: float = 0.1) -> Iterator[None]:
     """
     Cross-platform advisory lock using a dedicated lock file.
 
-    - Unix: fcntl.flock (exclusive lock)
+    - Unix: fcntl.flock (exclusive lock); a contended wait on the main
+      thread blocks under an ITIMER_REAL alarm rather than polling
     - Windows: msvcrt.locking on 1 byte
 
     Usage:
@@ -47,8 +147,34 @@ def file_lock(lock_path: Path, timeout_s: float = 10.0, poll_s: float = 0.1) ->
     # without breaking directory existence checks inside pathlib.
     os.makedirs(lock_path.parent, exist_ok=True)
 
-    fh = open(lock_path, "a+", encoding="utf-8", errors="replace")
     start = time.monotonic()
+    key = os.path.abspath(lock_path)
+    with _local_locks_guard:
+        local = _local_locks.get(key)
+        if local is None:
+            local = _local_locks[key] = threading.RLock()
+    if not local.acquire(timeout=timeout_s):
+        raise FileLockTimeoutError(f"Timed out waiting for lock: {lock_path}")
+    held = _held_locks.__dict__.setdefault("keys", set())
+    try:
+        if key in held:
+            # Nested on this thread: the outer call holds the OS lock
+            yield
+            return
+        held.add(key)
+        try:
+            with _os_file_lock(lock_path, start, timeout_s, poll_s):
+                yield
+        finally:
+            held.discard(key)
+    finally:
+        local.release()
+
+
+@contextmanager
+def _os_file_lock(lock_path: Path, start: float, timeout_s: float, poll_s: float) -> Iterator[None]:
+    """Hold the cross-process lock on `lock_path`; `start` is when file_lock() began waiting."""
+    fh = open(lock_path, "a+", encoding="utf-8", errors="replace")
 
     def _try_lock() -> None:
         if os.name == "nt":  # pragma: win32-only
@@ -81,8 +207,13 @@ def file_lock(lock_path: Path, timeout_s: float = 10.0, poll_s: float = 0.1) ->
                 _try_lock()
                 break
             except OSError:
-                if (time.monotonic() - start) >= timeout_s:
+                remaining = timeout_s - (time.monotonic() - start)
+                if remaining <= 0:
                     raise FileLockTimeoutError(f"Timed out waiting for lock: {lock_path}")
+                if os.name != "nt" and _can_block_with_timer():  # pragma: posix-only
+                    if not _flock_with_timer(fh.fileno(), remaining):
+                        raise FileLockTimeoutError(f"Timed out waiting for lock: {lock_path}")
+                    break
                 time.sleep(poll_s)
 
         yield
@@ -116,6 +247,235 @@ def _fsync_dir_if_possible(directory: Path) -> None:
             pass
 
 
+# Linux can open an unnamed file in a directory (O_TMPFILE) and give it a
+# name later through /proc/self/fd; 0 disables that path.
+_O_TMPFILE = getattr(os, "O_TMPFILE", 0) if os.path.isdir("/proc/self/fd") else 0
+
+
+def _create_tempfile(directory: Path, prefix: str) -> Tuple[int, str]:
+    """Create a named 0600 `<prefix>XXXXXXXX.tmp` file in `directory`; return (fd, name)."""
+    return tempfile.mkstemp(prefix=prefix, suffix=".tmp", dir=str(directory))
+
+
+def _mkstemp_fast(path: Path) -> Tuple[int, Optional[str]]:
+    """
+    Open a new 0600 temp file for writing in the directory of `path`.
+
+    Returns (fd, None) for an unnamed O_TMPFILE inode, which leaves nothing
+    behind if the writer dies before _link_tempfile() names it. Falls back to
+    _create_tempfile() and returns (fd, name) where O_TMPFILE is missing or
+    the filesystem refuses it.
+    """
+    if _O_TMPFILE:
+        try:
+            return os.open(path.parent, os.O_RDWR | _O_TMPFILE, 0o600), None
+        except OSError:
+            pass
+    return _create_tempfile(path.parent, path.name + ".")
+
+
+def _link_tempfile(fd: int, path: Path) -> Path:
+    """
+    Name the unnamed temp file `fd` as `<path>.XXXXXXXX.tmp` and return that path.
+
+    The random part is retried until linkat() finds a free name, so an
+    existing file is never replaced. If /proc/self/fd cannot be linked
+    through (hidepid, sandboxes), the bytes and permission bits are copied
+    into a _create_tempfile() file and that name returned.
+    """
+    try:
+        # A dir_fd argument makes os.link() use linkat(AT_SYMLINK_FOLLOW);
+        # plain link() would try to hard-link the /proc symlink itself.
+        dir_fd = os.open(path.parent, os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            for _ in range(tempfile.TMP_MAX):
+                name = f"{path.name}.{os.urandom(4).hex()}.tmp"
+                try:
+                    os.link(f"/proc/self/fd/{fd}", name, dst_dir_fd=dir_fd, follow_symlinks=True)
+                except FileExistsError:
+                    continue
+                return path.parent / name
+        finally:
+            os.close(dir_fd)
+    except OSError:
+        pass
+
+    out_fd, name = _create_tempfile(path.parent, path.name + ".")
+    try:
+        os.lseek(fd, 0, os.SEEK_SET)
+        with os.fdopen(os.dup(fd), "rb") as src, os.fdopen(out_fd, "wb") as out:
+            # mkstemp() made the copy 0600; give it the mode set on `fd`
+            os.fchmod(out_fd, stat.S_IMODE(os.fstat(fd).st_mode))
+            shutil.copyfileobj(src, out)
+            out.flush()
+            _fdatasync(out.fileno())
+    except BaseException:
+        os.unlink(name)
+        raise
+    return Path(name)
+
+
+# fdatasync() skips flushing timestamps; it is missing on macOS and Windows.
+_fdatasync = getattr(os, "fdatasync", os.fsync)
+
+# Directories holding a rename that has not been fsynced yet (non-durable
+# writes). The data itself is already on disk; a crash can at worst bring
+# back the previous complete file. flush_pending() drains this set.
+_dirty_dirs: Set[str] = set()
+_dirty_dirs_guard = threading.Lock()
+
+
+def _sync_dir(directory: Path, durable: bool) -> None:
+    """Fsync `directory` now if `durable`, else defer it to flush_pending()."""
+    with _dirty_dirs_guard:
+        if durable:
+            _dirty_dirs.discard(str(directory))
+        else:
+            _dirty_dirs.add(str(directory))
+    if durable:
+        _fsync_dir_if_possible(directory)
+
+
+def flush_pending() -> None:
+    """
+    Fsync every directory with a rename left pending by a non-durable write.
+
+    Runs automatically at interpreter exit; call it to checkpoint earlier.
+    """
+    with _dirty_dirs_guard:
+        directories = list(_dirty_dirs)
+        _dirty_dirs.clear()
+    for directory in directories:
+        _fsync_dir_if_possible(Path(directory))
+
+
+atexit.register(flush_pending)
+
+
+# copy_file_range() errors meaning "not between these files", not "failed".
+_COPY_RANGE_UNSUPPORTED = {errno.ENOSYS, errno.EXDEV, errno.EINVAL, errno.EOPNOTSUPP}
+
+
+def _fast_copy(src: Path, dst: Path) -> None:
+    """
+    Copy `src` to `dst` in the kernel with copy_file_range(), keeping the
+    permission bits; btrfs/XFS turn this into a reflink. Uses shutil.copy2()
+    where copy_file_range() is missing or refuses the pair.
+    `dst` is truncated and rewritten in place, so pass a file nothing else
+    links to.
+    """
+    if not hasattr(os, "copy_file_range"):
+        shutil.copy2(src, dst)
+        return
+    try:
+        with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+            st = os.fstat(fsrc.fileno())
+            remaining = st.st_size
+            while remaining > 0:
+                copied = os.copy_file_range(fsrc.fileno(), fdst.fileno(), remaining)
+                if copied == 0:
+                    break
+                remaining -= copied
+            os.fchmod(fdst.fileno(), stat.S_IMODE(st.st_mode))
+    except OSError as e:
+        if e.errno not in _COPY_RANGE_UNSUPPORTED:
+            raise
+        shutil.copy2(src, dst)
+
+
+def _drop_page_cache(fd: int) -> None:
+    """
+    Ask the kernel to evict `fd`'s already-synced pages from the page cache.
+
+    Only for files nothing is about to read back; a no-op where
+    posix_fadvise() is unavailable (macOS, Windows).
+    """
+    try:
+        os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+    except (AttributeError, OSError):
+        pass
+
+
+def _backup_path(path: Path) -> Path:
+    """The one backup name for `path`: `<name>.bak` beside it."""
+    return path.parent / (path.name + ".bak")
+
+
+def _lock_path(path: Path) -> Path:
+    """The lock file guarding writes to `path`: `<name>.lock` beside it."""
+    # Appending to the name skips with_suffix()'s suffix parsing and checks
+    return path.parent / (path.name + ".lock")
+
+
+def _write_all(fd: int, data: bytes) -> None:
+    """os.write() `data` to `fd` until all of it is written (writes may be short)."""
+    view = memoryview(data)
+    while view:
+        view = view[os.write(fd, view) :]
+
+
+def _backup_file(path: Path, backup_path: Path) -> None:
+    """
+    Make `backup_path` hold the current contents of `path`.
+
+    Hardlinks when the filesystem allows it, so no bytes are copied: writers
+    always swap a new inode in with os.replace(), which leaves the link on
+    the old data. Falls back to _fast_copy() where links are unsupported
+    (FAT, cross-device, some network shares). Raises OSError if both fail.
+
+    Either way the new backup is staged under a unique name and renamed
+    over `backup_path`. The old backup may share its inode with other links
+    to an earlier version of `path`, so it is never rewritten in place.
+    """
+    for _ in range(tempfile.TMP_MAX):
+        staging = backup_path.parent / f"{backup_path.name}.{os.urandom(4).hex()}.link"
+        try:
+            os.link(path, staging)
+        except FileExistsError:
+            continue
+        except OSError:
+            break
+        try:
+            os.replace(staging, backup_path)
+            return
+        except OSError:
+            _unlink_quietly(staging)
+            break
+
+    fd, name = _create_tempfile(backup_path.parent, backup_path.name + ".")
+    os.close(fd)
+    try:
+        _fast_copy(path, Path(name))
+        os.replace(name, backup_path)
+    except BaseException:
+        _unlink_quietly(Path(name))
+        raise
+
+
+def _unlink_quietly(path: Path) -> None:
+    """Remove `path` if possible; cleanup must not mask the original error."""
+    try:
+        os.unlink(path)
+    except OSError:
+        pass
+
+
+def _load_json_file(path: Path) -> Any:
+    """
+    Parse `path` as UTF-8 JSON (bad bytes replaced) and record it as valid.
+
+    The file is read, not mmapped: editors and other tools truncate these
+    files in place, and touching a mapping past a shrunken end raises SIGBUS.
+    Raises OSError or json.JSONDecodeError like json.load().
+    """
+    with open(path, "rb") as f:
+        st = os.fstat(f.fileno())
+        text = f.read().decode("utf-8", "replace")
+    data = json.loads(text)
+    _remember_valid_json(path, _stat_key(st))
+    return data
+
+
 def safe_load_json(path: Path, default: Any = None) -> Any:
     """
     Safely load JSON from a file.
@@ -149,39 +509,47 @@ def _safe_load_json_unlocked(
                                for safe_update_json() to avoid "resetting"
                                state when main file is corrupt but .bak exists.
     """
-    if not path.exists():
-        return default
-
     try:
-        with open(path, "r", encoding="utf-8", errors="replace") as f:
-            return json.load(f)
+        return _load_json_file(path)
     except json.JSONDecodeError:
         # Main file is corrupt
         if allow_backup_recovery:
-            backup_path = path.with_suffix(path.suffix + ".bak")
-            if backup_path.exists():
-                try:
-                    with open(backup_path, "r", encoding="utf-8", errors="replace") as f:
-                        return json.load(f)
-                except (json.JSONDecodeError, OSError):
-                    pass
+            try:
+                return _load_json_file(_backup_path(path))
+            except (json.JSONDecodeError, OSError):
+                pass
         return default
     except OSError:
+        # Includes FileNotFoundError: a missing file loads as `default`
         return default
 
 
+# Bytes a JSON document may start with once leading whitespace is skipped.
+_JSON_FIRST_BYTES = frozenset(b'{["tfn-0123456789')
+_JSON_WHITESPACE = b" \t\r\n"
+
+
 def _is_valid_json_file(path: Path) -> bool:
     """
     Return True iff `path` exists and contains valid JSON.
 
+    Empty files and files whose first non-blank byte cannot start a JSON
+    value are rejected without reading the rest of the file.
+
     IMPORTANT: Used to avoid overwriting a previously-good `.bak` with corrupt
     bytes from a corrupted main file during recovery flows.
     """
     try:
-        if not path.exists():
-            return False
-        with open(path, "r", encoding="utf-8", errors="replace") as f:
-            json.load(f)
+        if _known_valid_json(path, _stat_key(os.stat(path))):
+            return True
+        with open(path, "rb") as f:
+            head = f.read(1)
+            while head and head in _JSON_WHITESPACE:
+                head = f.read(1)
+            if not head or head[0] not in _JSON_FIRST_BYTES:
+                return False
+            json.loads((head + f.read()).decode("utf-8", "replace"))
+            _remember_valid_json(path, _stat_key(os.fstat(f.fileno())))
         return True
     except (OSError, json.JSONDecodeError):
         return False
@@ -191,49 +559,58 @@ def _safe_write_json_unlocked(
     path: Path,
     data: Any,
     *,
-    indent: int = 2,
+    indent: Optional[int] = 2,
     ensure_ascii: bool = False,
     create_backup: bool = True,
+    durable: bool = True,
 ) -> bool:
     """
     Write JSON without acquiring lock (for use inside locked sections).
 
     INTERNAL USE ONLY - call this only when you already hold the lock.
+    The lock file sits beside `path`, so file_lock() already created the
+    parent directory.
     """
-    os.makedirs(path.parent, exist_ok=True)
-
     # Create UNIQUE temp file in the same directory
     tmp_path: Optional[Path] = None
 
     try:
-        tmp_fd, tmp_name = tempfile.mkstemp(
-            prefix=path.name + ".",
-            suffix=".tmp",
-            dir=str(path.parent),
-        )
-        tmp_path = Path(tmp_name)
+        # Serialize and encode in one pass, then hand the bytes straight to
+        # os.write(): no json.dump() chunking and no text-file wrapper.
+        # indent=0/None asks for no pretty-printing: drop the spaces after
+        # "," and ":" too rather than keeping json.dumps()'s ", " / ": ".
+        layout: Dict[str, Any] = {"indent": indent} if indent else {"separators": (",", ":")}
+        payload = json.dumps(data, ensure_ascii=ensure_ascii, **layout).encode("utf-8", "replace")
+
+        tmp_fd, tmp_name = _mkstemp_fast(path)
+        tmp_path = Path(tmp_name) if tmp_name else None
 
         # Write to temp file with fsync
-        with os.fdopen(tmp_fd, "w", encoding="utf-8", newline="\n", errors="replace") as f:
-            json.dump(data, f, indent=indent, ensure_ascii=ensure_ascii)
-            f.flush()
-            os.fsync(f.fileno())
+        try:
+            _write_all(tmp_fd, payload)
+            _fdatasync(tmp_fd)
+            written = _stat_key(os.fstat(tmp_fd))
+            if tmp_path is None:
+                tmp_path = _link_tempfile(tmp_fd, path)
+        finally:
+            os.close(tmp_fd)
 
         # Create backup BEFORE replacing (while we hold the lock)
-        if create_backup and os.path.exists(path):
-            backup_path = path.with_suffix(path.suffix + ".bak")
+        # (_is_valid_json_file is False for a missing file)
+        if create_backup:
             try:
                 if _is_valid_json_file(path):
                     # Main file is valid - safe to use as new backup
-                    shutil.copy2(path, backup_path)
+                    _backup_file(path, _backup_path(path))
             except Exception:
                 pass  # Best-effort backup
 
         # Atomic replace - works on both Unix and Windows
         os.replace(tmp_path, path)
+        _remember_valid_json(path, written)
 
-        # Fsync directory on Unix for crash safety
-        _fsync_dir_if_possible(path.parent)
+        # Fsync directory on Unix for crash safety (deferred if not durable)
+        _sync_dir(path.parent, durable)
 
         return True
     except Exception as e:
@@ -250,18 +627,21 @@ def safe_write_json(
     path: Path,
     data: Any,
     *,
-    indent: int = 2,
+    indent: Optional[int] = 2,
     ensure_ascii: bool = False,
     timeout_s: float = 10.0,
     create_backup: bool = True,
+    durable: bool = True,
 ) -> bool:
     """
     Safely write JSON to `path` with locking and backups.
     Returns True on success, False on failure.
-    """
-    path.parent.mkdir(parents=True, exist_ok=True)
 
-    lock_path = path.with_suffix(path.suffix + ".lock")
+    durable=False defers the parent-directory fsync to flush_pending()
+    instead of doing it before returning.
+    """
+    # file_lock() creates the parent directory along with the lock file
+    lock_path = _lock_path(path)
 
     try:
         with file_lock(lock_path, timeout_s=timeout_s):
@@ -271,6 +651,7 @@ def safe_write_json(
                 indent=indent,
                 ensure_ascii=ensure_ascii,
                 create_backup=create_backup,
+                durable=durable,
             )
     except FileLockTimeoutError:
         return False
@@ -281,10 +662,11 @@ def safe_update_json(
     update_fn: Callable[[Any], Any],
     *,
     default: Any = None,
-    indent: int = 2,
+    indent: Optional[int] = 2,
     ensure_ascii: bool = False,
     timeout_s: float = 10.0,
     create_backup: bool = True,
+    durable: bool = True,
 ) -> bool:
     """
     Atomically read→modify→write JSON with the lock held throughout.
@@ -293,12 +675,12 @@ def safe_update_json(
         path: Path to JSON file
         update_fn: Function that takes current data and returns new data.
         default: Value to pass to update_fn if file doesn't exist.
+        durable: Fsync the parent directory now; False defers it to flush_pending().
 
     Returns True on success, False on failure.
     """
-    path.parent.mkdir(parents=True, exist_ok=True)
-
-    lock_path = path.with_suffix(path.suffix + ".lock")
+    # file_lock() creates the parent directory along with the lock file
+    lock_path = _lock_path(path)
 
     try:
         with file_lock(lock_path, timeout_s=timeout_s):
@@ -323,6 +705,7 @@ def safe_update_json(
                 indent=indent,
                 ensure_ascii=ensure_ascii,
                 create_backup=create_backup,
+                durable=durable,
             )
     except FileLockTimeoutError:
         return False
@@ -336,76 +719,88 @@ def safe_write_text(
     timeout_s: float = 10.0,
     create_backup: bool = True,
     preserve_mode: bool = False,  # Set True for executable scripts
+    durable: bool = True,
 ) -> bool:
     """
     Safely write text content to `path` with:
       - Cross-process locking via `path.<suffix>.lock`
       - Backup creation (*.bak) before replacing
       - Unique temp file (no collisions between concurrent writers)
-      - flush + fsync for durability
+      - flush + fdatasync for durability
       - os.replace() for atomic replace semantics (Unix + Windows)
       - Optional mode preservation (for executable files)
+      - Directory fsync, deferred to flush_pending() if durable=False
 
     Returns True on success, False on failure (including lock timeout).
 
     NOTE: If preserve_mode=True and the file exists, the original file's
-    permission bits are restored after the atomic replace. This is important
-    for executable scripts where os.replace() would reset to umask defaults.
+    permission bits are applied to the temp file before the atomic replace
+    (after it where os.fchmod is unavailable). This is important for
+    executable scripts, which would otherwise get the temp file's 0600.
     """
-    os.makedirs(path.parent, exist_ok=True)
-    lock_path = path.with_suffix(path.suffix + ".lock")
-
-    # Capture original permission bits if we need to preserve them
-    # Use stat.S_IMODE() to extract only permission bits (0o777 mask)
-    # This avoids any ambiguity around file-type bits
-    original_mode = None
-    if preserve_mode and os.path.exists(path):
-        try:
-            import stat as stat_module
-
-            original_mode = stat_module.S_IMODE(path.stat().st_mode)
-        except OSError:
-            pass
+    # file_lock() creates the parent directory along with the lock file
+    lock_path = _lock_path(path)
 
     try:
         with file_lock(lock_path, timeout_s=timeout_s):
-            # Create backup if file exists and is non-empty
-            # Guard against stat() failures (e.g. permission denied)
+            # One stat() serves both checks: back up only an existing,
+            # non-empty file, and capture the original permission bits if we
+            # need to preserve them. stat.S_IMODE() extracts only permission
+            # bits (0o777 mask), avoiding any ambiguity around file-type bits.
+            # Guard against stat() failures (missing file, permission denied)
             should_backup = False
-            if create_backup and os.path.exists(path):
+            original_mode = None
+            if create_backup or preserve_mode:
                 try:
-                    should_backup = path.stat().st_size > 0
+                    st = path.stat()
+                    should_backup = create_backup and st.st_size > 0
+                    if preserve_mode:
+                        original_mode = stat.S_IMODE(st.st_mode)
                 except OSError:
                     pass
 
-            if should_backup:
-                backup_path = path.with_suffix(path.suffix + ".bak")
-                try:
-                    shutil.copy2(path, backup_path)
-                except Exception:
-                    pass  # Best-effort backup
-
             # Create unique temp file in same directory
             tmp_path: Optional[Path] = None
 
             try:
-                tmp_fd, tmp_name = tempfile.mkstemp(
-                    prefix=path.name + ".",
-                    suffix=".tmp",
-                    dir=str(path.parent),
-                )
-                tmp_path = Path(tmp_name)
-
-                with os.fdopen(tmp_fd, "w", encoding=encoding, newline="\n") as f:
-                    f.write(content)
-                    f.flush()
-                    os.fsync(f.fileno())
+                payload = content.encode(encoding)
+                tmp_fd, tmp_name = _mkstemp_fast(path)
+                tmp_path = Path(tmp_name) if tmp_name else None
+
+                try:
+                    _write_all(tmp_fd, payload)
+                    _fdatasync(tmp_fd)
+                    # Restore original permissions on the temp file itself, so
+                    # the file appears with them; skip it when they already match.
+                    # This must precede _link_tempfile(), whose copy fallback
+                    # takes the mode from this descriptor.
+                    if original_mode is not None and hasattr(os, "fchmod"):
+                        try:
+                            if stat.S_IMODE(os.fstat(tmp_fd).st_mode) != original_mode:
+                                os.fchmod(tmp_fd, original_mode)
+                        except OSError:
+                            pass  # Best-effort mode restoration
+                    if tmp_path is None:
+                        tmp_path = _link_tempfile(tmp_fd, path)
+                    # Generated text files are written, not re-read, by these
+                    # scripts (unlike JSON state, which the next update loads)
+                    _drop_page_cache(tmp_fd)
+                finally:
+                    os.close(tmp_fd)
+
+                # Back up only once the new content is safely on disk, right
+                # before the replace (a hardlink, so this is cheap)
+                if should_backup:
+                    try:
+                        _backup_file(path, _backup_path(path))
+                    except Exception:
+                        pass  # Best-effort backup
 
                 os.replace(tmp_path, path)
-                _fsync_dir_if_possible(path.parent)
+                _sync_dir(path.parent, durable)
 
-                # Restore original permissions if requested
-                if original_mode is not None:
+                # No fchmod() (Windows before 3.13): restore by path instead
+                if original_mode is not None and not hasattr(os, "fchmod"):
                     try:
                         os.chmod(path, original_mode)
                     except OSError:
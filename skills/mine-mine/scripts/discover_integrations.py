@@ -10,6 +10,7 @@ discover package for all orchestration logic.
 import argparse
 import sys
 from pathlib import Path
+from typing import Any, Dict, Optional
 
 # Setup path for shared modules and discover package
 try:
@@ -35,11 +36,6 @@ from discover import (
     save_registry,
 )
 
-try:
-    from url_utils import sanitize_json_urls
-except ImportError:
-    sanitize_json_urls = lambda x: x
-
 
 class IntegrationDiscovery:
     """
@@ -50,10 +46,11 @@ class IntegrationDiscovery:
     import_assets.py.
     """
 
-    def __init__(self, registry_path: Path, verbose: bool = False):
+    def __init__(self, registry_path: Path, verbose: bool = False, registry: Optional[Dict[str, Any]] = None):
         self.registry_path = registry_path
         self.verbose = verbose
-        self.registry = self._load_registry()
+        # An in-memory registry skips the disk load entirely
+        self.registry = registry if registry is not None else self._load_registry()
 
     def _log(self, message: str):
         if self.verbose:
@@ -63,9 +60,8 @@ class IntegrationDiscovery:
         return load_registry(self.registry_path)
 
     def _save_registry(self):
-        self.registry_path.parent.mkdir(parents=True, exist_ok=True)
-        sanitized_registry = sanitize_json_urls(self.registry)
-        save_registry(self.registry_path, sanitized_registry)
+        # save_registry() creates the parent directory and sanitizes URLs itself
+        save_registry(self.registry_path, self.registry)
 
 
 def main() -> int:
@@ -9,7 +9,7 @@ import shutil
 import sys
 import tempfile
 from pathlib import Path
-from typing import Callable, List
+from typing import Callable, List, Optional
 
 import platform_utils
 
@@ -26,10 +26,14 @@ class UpdateTransaction:
 
     If any operation fails, or if rollback() is called, all changes
     are reverted to their original state.
+
+    copy_fn performs every copy (backups, restores and the operation itself)
+    and defaults to shutil.copy2; pass shutil.copyfile to skip copying metadata.
     """
 
-    def __init__(self, verbose: bool = False):
+    def __init__(self, verbose: bool = False, copy_fn: Optional[Callable[[str, str], object]] = None):
         self.verbose = verbose
+        self._copy = copy_fn or shutil.copy2
         self._rollbacks: List[Callable[[], None]] = []
         self._temp_dir = tempfile.mkdtemp(prefix="claude-txn-")
         self._committed = False
@@ -72,16 +76,17 @@ class UpdateTransaction:
 
         dest = Path(dest).resolve()
         src = Path(src).resolve()
+        copy = self._copy
 
         if dest.exists():
             # Backup existing file
             backup_name = str(len(self._rollbacks)) + "_" + dest.name
             backup_path = Path(self._temp_dir) / backup_name
-            shutil.copy2(platform_utils.get_long_path(dest), platform_utils.get_long_path(backup_path))
+            copy(platform_utils.get_long_path(dest), platform_utils.get_long_path(backup_path))
 
             def restore_existing():
                 if backup_path.exists():
-                    shutil.copy2(platform_utils.get_long_path(backup_path), platform_utils.get_long_path(dest))
+                    copy(platform_utils.get_long_path(backup_path), platform_utils.get_long_path(dest))
 
             self._rollbacks.append(restore_existing)
         else:
@@ -95,7 +100,7 @@ class UpdateTransaction:
         # Perform operation
         try:
             os.makedirs(platform_utils.get_long_path(dest.parent), exist_ok=True)
-            shutil.copy2(platform_utils.get_long_path(src), platform_utils.get_long_path(dest))
+            copy(platform_utils.get_long_path(src), platform_utils.get_long_path(dest))
         except Exception as e:
             raise TransactionError(f"Failed to copy {src} to {dest}: {e}")
 
@@ -108,6 +113,7 @@ class UpdateTransaction:
             raise TransactionError("Transaction is not active")
 
         target = Path(target).resolve()
+        copy = self._copy
 
         if not target.exists():
             return  # Nothing to delete
@@ -115,11 +121,11 @@ class UpdateTransaction:
         # Backup for rollback
         backup_name = str(len(self._rollbacks)) + "_del_" + target.name
         backup_path = Path(self._temp_dir) / backup_name
-        shutil.copy2(platform_utils.get_long_path(target), platform_utils.get_long_path(backup_path))
+        copy(platform_utils.get_long_path(target), platform_utils.get_long_path(backup_path))
 
         def restore_deleted():
             os.makedirs(platform_utils.get_long_path(target.parent), exist_ok=True)
-            shutil.copy2(platform_utils.get_long_path(backup_path), platform_utils.get_long_path(target))
+            copy(platform_utils.get_long_path(backup_path), platform_utils.get_long_path(target))
 
         self._rollbacks.append(restore_deleted)
 
@@ -14,7 +14,7 @@ import subprocess
 import sys
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 # Import helpers
 sys.path.insert(0, os.path.dirname(__file__))
@@ -94,6 +94,7 @@ class IntegrationUpdater:
         auto_import_new: bool = False,
         delete_policy: str = "ask",
         verbose: bool = False,
+        registry: Optional[Dict[str, Any]] = None,
     ):
         self.registry_path = registry_path
         self.dry_run = dry_run
@@ -102,10 +103,28 @@ class IntegrationUpdater:
         self.auto_import_new = auto_import_new
         self.delete_policy = delete_policy
         self.logger = get_logger(__name__)
-        self.discovery = IntegrationDiscovery(registry_path, self.logger.isEnabledFor(logging.DEBUG))
+        self.discovery = IntegrationDiscovery(registry_path, self.logger.isEnabledFor(logging.DEBUG), registry=registry)
         self.registry = self.discovery.registry
         self.cache_dir = Path.home() / ".claude" / "mine" / "sources"
         self.cache_manager = CacheManager(self.cache_dir, verbose=self.logger.isEnabledFor(logging.DEBUG))
+        # Resolved install roots keyed by (scope, anchor directory); see _resolved_install_root()
+        self._root_cache: Dict[Tuple[str, str], Path] = {}
+
+    @classmethod
+    def from_dict(
+        cls,
+        registry: Dict[str, Any],
+        registry_path: Path,
+        dry_run: bool = True,
+        **kwargs,
+    ) -> "IntegrationUpdater":
+        """
+        Build an updater around an in-memory registry.
+
+        The registry file is not read; registry_path is only used if the
+        registry is later saved.
+        """
+        return cls(registry_path, dry_run=dry_run, registry=registry, **kwargs)
 
     def _log(self, message: str):
         self.logger.debug(message)
@@ -396,6 +415,28 @@ class IntegrationUpdater:
                 return Path(target_repo) / ".claude"
             return Path.cwd() / ".claude"
 
+    def _resolved_install_root(self, integration: Dict[str, Any]) -> Path:
+        """
+        Return the integration's install root, resolved once per scope and anchor.
+
+        Every artifact mapping of an integration is validated against the same
+        root, so the canonicalization is done on the first call and reused.
+        The key is (scope, anchor directory) rather than the integration, so
+        integrations installed into the same repo share one entry. The cache
+        lives on the instance, not in a process-wide lru_cache, so a later
+        updater sees symlinks or directories created since.
+        """
+        scope = integration.get("target_scope", "user")
+        if scope == "user":
+            anchor = str(Path.home())
+        else:
+            anchor = integration.get("target_repo_path") or os.getcwd()
+        key = (scope, anchor)
+        root = self._root_cache.get(key)
+        if root is None:
+            root = self._root_cache[key] = self._get_install_root(integration).resolve()
+        return root
+
     def _validate_destination_path(self, dest_path: Path, integration: Dict[str, Any]) -> Path:
         """
         Validate that a destination path is safe for the integration's scope.
@@ -415,12 +456,12 @@ class IntegrationUpdater:
         Raises:
             PathSafetyError: If path is unsafe or escapes allowed root
         """
-        install_root = self._get_install_root(integration)
+        install_root = self._resolved_install_root(integration)
 
         # Ensure install root exists for validation (may not exist yet)
         # We need to validate even if paths don't exist yet
         try:
-            return validate_path(dest_path, install_root, allow_symlinks=False)
+            return validate_path(dest_path, install_root, allow_symlinks=False, root_resolved=True)
         except PathSafetyError as e:
             raise PathSafetyError(f"Unsafe destination path in registry: {dest_path} (root: {install_root}): {e}")
 
@@ -126,7 +126,7 @@ class AgenticConverter:
         # Write output
         if not self.dry_run:
             output_path.parent.mkdir(parents=True, exist_ok=True)
-            if not safe_write_text(output_path, command_content):
+            if not safe_write_text(output_path, command_content, durable=False):
                 self._log(f"Failed to write command: {output_path}")
                 return None
             self._log(f"Wrote command: {output_path}")
@@ -156,7 +156,7 @@ class AgenticConverter:
 
         if not self.dry_run:
             output_path.parent.mkdir(parents=True, exist_ok=True)
-            if not safe_write_text(output_path, agent_content):
+            if not safe_write_text(output_path, agent_content, durable=False):
                 self._log(f"Failed to write agent: {output_path}")
                 return None
             self._log(f"Wrote agent: {output_path}")
@@ -187,7 +187,7 @@ class AgenticConverter:
 
         if not self.dry_run:
             skill_dir.mkdir(parents=True, exist_ok=True)
-            if not safe_write_text(skill_md, skill_content):
+            if not safe_write_text(skill_md, skill_content, durable=False):
                 self._log(f"Failed to write skill: {skill_md}")
                 return None
             self._log(f"Wrote skill: {skill_dir}/SKILL.md")
@@ -222,7 +222,7 @@ class AgenticConverter:
         redacted_json = redact_secrets(json.dumps(data, indent=2))
 
         if not self.dry_run:
-            if not safe_write_text(output_path, redacted_json):
+            if not safe_write_text(output_path, redacted_json, durable=False):
                 self._log(f"Failed to write MCP fragment: {output_path}")
                 return None
             self._log(f"Wrote MCP fragment: {output_path}")
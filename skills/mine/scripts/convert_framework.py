@@ -195,10 +195,10 @@ class FrameworkConverter:
                 # Skills need a SKILL.md file
                 skill_file = output_file / "SKILL.md"
                 skill_file.parent.mkdir(parents=True, exist_ok=True)
-                if not safe_write_text(skill_file, claude_content):
+                if not safe_write_text(skill_file, claude_content, durable=False):
                     print(f"[ERROR] Failed to write {skill_file}")
             else:
-                if not safe_write_text(output_file, claude_content):
+                if not safe_write_text(output_file, claude_content, durable=False):
                     print(f"[ERROR] Failed to write {output_file}")
 
     def _classify_fabric_pattern_type(self, pattern_name: str, content: str) -> str:
@@ -400,13 +400,13 @@ The original pattern's logic and instructions have been preserved.
 
         if not self.dry_run:
             run_cmd_path.parent.mkdir(parents=True, exist_ok=True)
-            safe_write_text(run_cmd_path, run_command)
+            safe_write_text(run_cmd_path, run_command, durable=False)
 
             agent_path.parent.mkdir(parents=True, exist_ok=True)
-            safe_write_text(agent_path, assistant_agent)
+            safe_write_text(agent_path, assistant_agent, durable=False)
 
             report_path.parent.mkdir(parents=True, exist_ok=True)
-            safe_write_text(report_path, report)
+            safe_write_text(report_path, report, durable=False)
 
             print(f"\n✓ Scaffold written to {self.output_dir}")
         else:
@@ -610,13 +610,13 @@ This skill provides context for working with the LangChain codebase.
 
         if not self.dry_run:
             run_cmd_path.parent.mkdir(parents=True, exist_ok=True)
-            safe_write_text(run_cmd_path, run_command)
+            safe_write_text(run_cmd_path, run_command, durable=False)
 
             agent_path.parent.mkdir(parents=True, exist_ok=True)
-            safe_write_text(agent_path, coordinator)
+            safe_write_text(agent_path, coordinator, durable=False)
 
             report_path.parent.mkdir(parents=True, exist_ok=True)
-            safe_write_text(report_path, report)
+            safe_write_text(report_path, report, durable=False)
 
             print(f"\n✓ Scaffold written to {self.output_dir}")
         else:
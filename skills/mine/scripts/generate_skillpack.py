@@ -596,14 +596,14 @@ https://github.com/upstash/context7
         self.target_dir.mkdir(parents=True, exist_ok=True)
 
         # Write SKILL.md
-        if not safe_write_text(self.target_dir / "SKILL.md", skill_md):
+        if not safe_write_text(self.target_dir / "SKILL.md", skill_md, durable=False):
             print(f"Error: Failed to write SKILL.md to {self.target_dir}", file=sys.stderr)
 
         # Write REFERENCE.md if applicable
         if reference_md:
             refs_dir = self.target_dir / "references"
             refs_dir.mkdir(exist_ok=True)
-            if not safe_write_text(refs_dir / "REFERENCE.md", reference_md):
+            if not safe_write_text(refs_dir / "REFERENCE.md", reference_md, durable=False):
                 print(f"Error: Failed to write REFERENCE.md to {refs_dir}", file=sys.stderr)
 
         # Write commands (to parent .claude/commands if project scope)
@@ -619,7 +619,7 @@ https://github.com/upstash/context7
             commands_dir.mkdir(parents=True, exist_ok=True)
 
             for cmd_name, cmd_content in commands.items():
-                if not safe_write_text(commands_dir / f"{cmd_name}.md", cmd_content):
+                if not safe_write_text(commands_dir / f"{cmd_name}.md", cmd_content, durable=False):
                     print(f"Error: Failed to write command {cmd_name} to {commands_dir}", file=sys.stderr)
 
 
@@ -14,12 +14,13 @@ import os
 import re
 import logging
 import shutil
+import stat
 import subprocess
 import sys
 import tempfile
 import time
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional, Union
 
 import _init_shared
 from safe_io import safe_write_json
@@ -45,6 +46,19 @@ def is_binary_file(file_path: Path) -> bool:
         return False
 
 
+def _is_symlink_fast(path) -> bool:
+    """
+    Tell whether path itself is a symlink, from one lstat() of the path as given.
+
+    The path is never resolved first (a resolved path is never a link), and a
+    path that cannot be examined counts as a link so the scanner fails closed.
+    """
+    try:
+        return stat.S_ISLNK(os.lstat(path).st_mode)
+    except OSError:
+        return True
+
+
 class RepoScanner:
     """Scans repositories for Claude Code artifacts."""
 
@@ -59,6 +73,8 @@ class RepoScanner:
         self.start_time = None
         self.repo_path: Optional[Path] = None
         self.temp_dir: Optional[str] = None
+        self._git_files: Optional[List[str]] = None
+        self._git_files_loaded = False
         self.repo_id = self._extract_repo_id(self.source)
         self.logger = get_logger(__name__)
 
@@ -245,18 +261,115 @@ class RepoScanner:
             if self.temp_dir and os.path.exists(self.temp_dir):
                 shutil.rmtree(self.temp_dir)
 
-    def _scan_skills(self, report: Dict[str, Any]):
-        """Scan for skill artifacts."""
-        skill_patterns = [".claude/skills/**/SKILL.md", "skills/**/SKILL.md"]
+    @staticmethod
+    def _entry_is_symlink(entry: os.DirEntry) -> bool:
+        """DirEntry.is_symlink() (lstat semantics, usually free from d_type), failing closed."""
+        try:
+            return entry.is_symlink()
+        except OSError:
+            return True
 
-        for pattern in skill_patterns:
-            for skill_file in self.repo_path.glob(pattern):
-                if skill_file.is_symlink():
-                    self._log(f"Skipping symlink: {skill_file.relative_to(self.repo_path)}")
-                    continue
+    def _find_skill_files(self, top: Union[str, Path]):
+        """
+        Yield every SKILL.md below top, in the order glob("**/SKILL.md") would.
+
+        Walks with os.scandir and judges entries by their directory entry type,
+        so symlinks are neither descended into nor returned and no entry costs
+        an extra stat. A symlinked top directory is not walked either. Paths are
+        yielded as plain strings relative to repo_path.
+        """
+        top = os.fspath(top)
+        if _is_symlink_fast(top):
+            # Missing, unreadable or a symlink: nothing to walk
+            return
 
-                skill_dir = skill_file.parent
-                self._log(f"Found skill: {skill_file.relative_to(self.repo_path)}")
+        # top lies under repo_path, so slicing off this prefix makes a path relative
+        root_len = len(os.path.join(os.fspath(self.repo_path), ""))
+        stack = [top]
+        while stack:
+            subdirs = []
+            skill_entry = None
+            try:
+                with os.scandir(stack.pop()) as it:
+                    for entry in it:
+                        if self._entry_is_symlink(entry):
+                            if entry.name == "SKILL.md":
+                                self._log(f"Skipping symlink: {entry.path[root_len:]}")
+                            continue
+                        if entry.is_dir(follow_symlinks=False):
+                            subdirs.append(entry.path)
+                        elif entry.name == "SKILL.md":
+                            skill_entry = entry
+            except OSError:
+                continue
+
+            if skill_entry is not None:
+                yield skill_entry.path[root_len:]
+            # Reversed so the stack pops subdirectories in scandir order (depth-first, like glob)
+            stack.extend(reversed(subdirs))
+
+    def _git_visible_files(self) -> Optional[List[str]]:
+        """
+        List the files git would show under repo_path (tracked plus untracked, not ignored).
+
+        Paths are relative to repo_path with "/" separators. Returns None when repo_path
+        is not inside a git work tree or git cannot be run, so callers fall back to
+        walking the filesystem. The listing is taken once per scanner.
+        """
+        if not self._git_files_loaded:
+            self._git_files_loaded = True
+            try:
+                result = subprocess.run(
+                    ["git", "-C", str(self.repo_path), "ls-files", "-z", "--cached", "--others", "--exclude-standard"],
+                    capture_output=True,
+                    timeout=60,
+                )
+            except (OSError, subprocess.SubprocessError):
+                return None
+            if result.returncode == 0:
+                self._git_files = [os.fsdecode(rel) for rel in result.stdout.split(b"\0") if rel]
+        return self._git_files
+
+    def _git_skill_files(self, git_files: List[str], prefix: str):
+        """
+        Yield SKILL.md files under prefix from a git listing, skipping symlinks.
+
+        Git does not descend into symlinked directories or ignored trees such as
+        node_modules, but it does list a symlinked SKILL.md, so each hit still gets
+        the lstat gate. Paths are yielded like _find_skill_files() yields them.
+        """
+        repo = os.fspath(self.repo_path)
+        for rel in git_files:
+            if not rel.startswith(prefix) or rel.rpartition("/")[2] != "SKILL.md":
+                continue
+            if os.sep != "/":
+                rel = rel.replace("/", os.sep)
+            if _is_symlink_fast(os.path.join(repo, rel)):
+                self._log(f"Skipping symlink: {rel}")
+                continue
+            yield rel
+
+    def _scan_skills(self, report: Dict[str, Any]):
+        """Scan for skill artifacts."""
+        skill_roots = [".claude/skills/", "skills/"]
+        git_files = self._git_visible_files()
+        repo = os.fspath(self.repo_path)
+
+        for skill_root in skill_roots:
+            skill_files = None
+            # .claude/ is routinely gitignored (local settings, personal skills), so it is
+            # always walked; the git listing only prunes ignored trees such as node_modules
+            # under a project's skills/, and is not trusted when it hides that root entirely
+            if git_files is not None and skill_root != ".claude/skills/":
+                skill_files = list(self._git_skill_files(git_files, skill_root)) or None
+            if skill_files is None:
+                # No trailing separator: lstat("skills/") would follow a symlinked root
+                skill_files = self._find_skill_files(os.path.join(repo, skill_root.rstrip("/")))
+            # Plain strings throughout: no Path objects are built per skill
+            for skill_rel in skill_files:
+                skill_file = os.path.join(repo, skill_rel)
+                skill_dir = os.path.dirname(skill_file)
+                self._log(f"Found skill: {skill_rel}")
 
                 # Validate YAML frontmatter
                 notes = "Complete skill"
@@ -271,9 +384,9 @@ class RepoScanner:
                             notes = "Warning: Missing 'description' field"
 
                         # Check for bundled resources
-                        has_scripts = (skill_dir / "scripts").exists()
-                        has_refs = (skill_dir / "references").exists()
-                        has_assets = (skill_dir / "assets").exists()
+                        has_scripts = os.path.exists(os.path.join(skill_dir, "scripts"))
+                        has_refs = os.path.exists(os.path.join(skill_dir, "references"))
+                        has_assets = os.path.exists(os.path.join(skill_dir, "assets"))
 
                         if has_scripts or has_refs or has_assets:
                             resources = []
@@ -288,12 +401,12 @@ class RepoScanner:
                 except Exception as e:
                     notes = f"Error reading skill: {e}"
 
-                skill_name = skill_dir.name
+                skill_name = os.path.basename(skill_dir)
                 self._track_artifact(
                     report,
                     {
                         "type": "skill",
-                        "source_path": self._safe_path_str(skill_file.relative_to(self.repo_path)),
+                        "source_path": self._safe_path_str(skill_rel),
                         "destination_suggestions": {
                             "user": f"~/.claude/skills/{skill_name}/",
                             "project": f".claude/skills/{skill_name}/",
@@ -1,11 +1,14 @@
 """
 conftest.py - Pytest configuration for MINE tests
 
-Sets up import paths for skill modules.
+Sets up import paths for skill modules and shared test fixtures.
 """
 
 import sys
 from pathlib import Path
+from typing import Dict
+
+import pytest
 
 # Add skill scripts directories to Python path
 REPO_ROOT = Path(__file__).parent.parent
@@ -13,6 +16,29 @@ MINE_SCRIPTS = REPO_ROOT / "skills" / "mine" / "scripts"
 MINE_MINE_SCRIPTS = REPO_ROOT / "skills" / "mine-mine" / "scripts"
 SHARED_SCRIPTS = REPO_ROOT / "skills" / "_shared"
 
-sys.path.insert(0, str(MINE_MINE_SCRIPTS))
-sys.path.insert(0, str(MINE_SCRIPTS))
-sys.path.insert(0, str(SHARED_SCRIPTS))
+# pyproject.toml's [tool.pytest.ini_options] pythonpath normally covers these;
+# the guarded inserts keep direct conftest imports working without duplicates.
+for _scripts_dir in (MINE_MINE_SCRIPTS, MINE_SCRIPTS, SHARED_SCRIPTS):
+    if str(_scripts_dir) not in sys.path:
+        sys.path.insert(0, str(_scripts_dir))
+
+
+@pytest.fixture
+def make_source_repo(tmp_path):
+    """
+    Factory for minimal source repositories under tmp_path.
+
+    Usage: make_source_repo({".claude/commands/x.md": "# X"}, name="source")
+    creates tmp_path/<name>/.git plus each relpath -> content file.
+    """
+
+    def _make(extras: Dict[str, str], name: str = "source") -> Path:
+        repo = tmp_path / name
+        (repo / ".git").mkdir(parents=True)
+        for relpath, content in extras.items():
+            file_path = repo / relpath
+            file_path.parent.mkdir(parents=True, exist_ok=True)
+            file_path.write_text(content)
+        return repo
+
+    return _make
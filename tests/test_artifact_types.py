@@ -4,13 +4,6 @@ test_artifact_types.py - Tests for the artifact_types shared module
 """
 
 import pytest
-import sys
-from pathlib import Path
-
-# Add _shared to path
-_shared_dir = Path(__file__).resolve().parent.parent / "skills" / "_shared"
-if str(_shared_dir) not in sys.path:
-    sys.path.insert(0, str(_shared_dir))
 
 from artifact_types import (
     ArtifactType,
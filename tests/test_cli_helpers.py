@@ -5,14 +5,9 @@ Tests the standardized --dry-run flag handling and argument resolution.
 """
 
 import argparse
-import sys
-from pathlib import Path
 
 import pytest
 
-# Setup path for shared modules
-sys.path.insert(0, str(Path(__file__).parent.parent / "skills" / "_shared"))
-
 from cli_helpers import (
     DryRunAction,
     NoDryRunAction,
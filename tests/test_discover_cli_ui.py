@@ -4,16 +4,11 @@ Tests for CLI UI formatting functions.
 Tests the format_* functions in discover/cli_ui.py.
 """
 
-import sys
 import io
 from pathlib import Path
 
 import pytest
 
-# Setup path for modules
-sys.path.insert(0, str(Path(__file__).parent.parent / "skills" / "mine-mine" / "scripts"))
-sys.path.insert(0, str(Path(__file__).parent.parent / "skills" / "_shared"))
-
 from discover.cli_ui import (
     format_discovery_result,
     format_list_result,
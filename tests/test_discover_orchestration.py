@@ -5,15 +5,9 @@ Tests the run_discovery() function and related orchestration entrypoints.
 """
 
 import json
-import sys
-from pathlib import Path
 
 import pytest
 
-# Setup path for modules
-sys.path.insert(0, str(Path(__file__).parent.parent / "skills" / "mine-mine" / "scripts"))
-sys.path.insert(0, str(Path(__file__).parent.parent / "skills" / "_shared"))
-
 from discover import (
     DiscoverConfig,
     DiscoveryResult,
@@ -21,18 +21,16 @@ from git_helpers import hash_file
 DOC_CLAIMS = ["local_mods_protected"]
 
 
+# Every registry in this module shares its header; only the integrations differ
+_REGISTRY_TEMPLATE = {
+    "version": "1.0",
+    "config": {"search_roots": [], "auto_track": True, "ask_confirmation": False},
+}
+
+
 def _write_registry(registry_path: Path, integrations: dict) -> None:
-    registry_path.write_text(
-        json.dumps(
-            {
-                "version": "1.0",
-                "config": {"search_roots": [], "auto_track": True, "ask_confirmation": False},
-                "integrations": integrations,
-            },
-            indent=2,
-        ),
-        encoding="utf-8",
-    )
+    # json.dumps escapes non-ASCII by default, so its output is already valid UTF-8
+    registry_path.write_bytes(json.dumps({**_REGISTRY_TEMPLATE, "integrations": integrations}).encode())
 
 
 class TestFileLifecycle:
@@ -6,19 +6,9 @@ Tests for framework detection logic in scan_repo.py.
 Verifies that Fabric, LangChain, and AutoGen detection avoids false positives.
 """
 
-import sys
 import os
-from pathlib import Path
 import pytest
 
-# Add scripts modules to path
-MINE_SCRIPTS = Path(__file__).resolve().parent.parent / "skills" / "mine" / "scripts"
-SHARED_DIR = Path(__file__).resolve().parent.parent / "skills" / "_shared"
-if str(MINE_SCRIPTS) not in sys.path:
-    sys.path.insert(0, str(MINE_SCRIPTS))
-if str(SHARED_DIR) not in sys.path:
-    sys.path.insert(0, str(SHARED_DIR))
-
 
 class TestFabricDetection:
     """Tests for Fabric repository detection."""
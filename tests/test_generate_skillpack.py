@@ -5,19 +5,12 @@ test_generate_skillpack.py
 Tests for skill pack generation, specifically reproducible builds.
 """
 
-import sys
 import os
 import zipfile
 import time
-from pathlib import Path
 import pytest
 import shutil
 
-# Add scripts directory to path to import generate_skillpack
-PROJECT_ROOT = Path(__file__).resolve().parent.parent
-SCRIPTS_DIR = PROJECT_ROOT / "skills" / "mine" / "scripts"
-sys.path.insert(0, str(SCRIPTS_DIR))
-
 from generate_skillpack import create_reproducible_zip
 
 
@@ -4,15 +4,12 @@ Tests for hash_helpers.py module.
 Covers file hashing, string hashing, directory hashing, and file comparison utilities.
 """
 
-import sys
 from pathlib import Path
 
 import pytest
 
-# Setup path for modules
-sys.path.insert(0, str(Path(__file__).parent.parent / "skills" / "_shared"))
-
 from hash_helpers import (
+    clear_hash_cache,
     files_match,
     has_file_changed,
     hash_directory_files,
@@ -20,6 +17,10 @@ from hash_helpers import (
     hash_string,
 )
 
+# Known SHA-256 digests reused across tests
+SHA256_HELLO_WORLD = "b94d27b9934d3e08a52e52d7da7dabfac484efe37a5380ee9088f7ace2efcde9"
+SHA256_EMPTY = "e3b0c44298fc1c149afbf4c8996fb92427ae41e4649b934ca495991b7852b855"
+
 
 class TestHashFile:
     """Tests for hash_file()."""
@@ -33,7 +34,7 @@ class TestHashFile:
 
         assert result is not None
         assert len(result) == 64  # SHA-256 hex digest length
-        assert result == "b94d27b9934d3e08a52e52d7da7dabfac484efe37a5380ee9088f7ace2efcde9"
+        assert result == SHA256_HELLO_WORLD
 
     def test_hash_file_nonexistent(self, tmp_path):
         """Returns None for nonexistent file."""
@@ -57,8 +58,7 @@ class TestHashFile:
         result = hash_file(empty_file)
 
         assert result is not None
-        # SHA-256 of empty string
-        assert result == "e3b0c44298fc1c149afbf4c8996fb92427ae41e4649b934ca495991b7852b855"
+        assert result == SHA256_EMPTY
 
     def test_hash_file_binary(self, tmp_path):
         """Hash a binary file."""
@@ -91,13 +91,13 @@ class TestHashString:
         result = hash_string("hello world")
 
         assert len(result) == 64
-        assert result == "b94d27b9934d3e08a52e52d7da7dabfac484efe37a5380ee9088f7ace2efcde9"
+        assert result == SHA256_HELLO_WORLD
 
     def test_hash_string_empty(self):
         """Hash an empty string."""
         result = hash_string("")
 
-        assert result == "e3b0c44298fc1c149afbf4c8996fb92427ae41e4649b934ca495991b7852b855"
+        assert result == SHA256_EMPTY
 
     def test_hash_string_unicode(self):
         """Hash a unicode string."""
@@ -150,6 +150,31 @@ class TestHashDirectoryFiles:
         assert "also_keep.md" in result
         assert "exclude.txt" not in result
 
+    def test_hash_directory_patterns_with_directories(self, tmp_path):
+        """Patterns containing '/' match the trailing segments of the relative path."""
+        (tmp_path / "scripts").mkdir()
+        (tmp_path / "scripts" / "run.py").write_text("run")
+        (tmp_path / "scripts" / "gen").mkdir()
+        (tmp_path / "scripts" / "gen" / "out.py").write_text("gen")
+        (tmp_path / "pkg" / "scripts").mkdir(parents=True)
+        (tmp_path / "pkg" / "scripts" / "tool.py").write_text("tool")
+        (tmp_path / "top.py").write_text("top")
+
+        result = hash_directory_files(tmp_path, patterns=["scripts/*.py"], exclude_patterns=["pkg/scripts/*"])
+
+        assert set(result) == {str(Path("scripts") / "run.py")}
+
+    def test_hash_directory_recursive_pattern(self, tmp_path):
+        """A '**' segment matches any number of directories, as in rglob."""
+        (tmp_path / "a" / "b").mkdir(parents=True)
+        (tmp_path / "a" / "x.md").write_text("x")
+        (tmp_path / "a" / "b" / "y.md").write_text("y")
+        (tmp_path / "z.md").write_text("z")
+
+        result = hash_directory_files(tmp_path, patterns=["a/**/*.md"])
+
+        assert set(result) == {str(Path("a") / "x.md"), str(Path("a") / "b" / "y.md")}
+
     def test_hash_directory_nonexistent(self, tmp_path):
         """Returns empty dict for nonexistent directory."""
         nonexistent = tmp_path / "nonexistent"
@@ -205,6 +230,41 @@ class TestFilesMatch:
 
         assert files_match(file1, file2) is False
 
+    def test_files_match_different_sizes(self, tmp_path):
+        """Files of different sizes never match."""
+        file1 = tmp_path / "short.txt"
+        file2 = tmp_path / "long.txt"
+        file1.write_text("same")
+        file2.write_text("same content")
+
+        assert files_match(file1, file2) is False
+
+    def test_files_match_multi_block(self, tmp_path):
+        """Content differing past the first block is detected."""
+        file1 = tmp_path / "file1.bin"
+        file2 = tmp_path / "file2.bin"
+        file1.write_bytes(b"a" * 100 + b"x")
+        file2.write_bytes(b"a" * 100 + b"y")
+
+        assert files_match(file1, file2, chunk_size=16) is False
+        assert files_match(file1, file1, chunk_size=16) is True
+
+    def test_files_match_directory(self, tmp_path):
+        """Directories are not regular files and never match."""
+        assert files_match(tmp_path, tmp_path) is False
+
+    def test_files_match_read_error(self, tmp_path):
+        """Read errors are treated as a mismatch."""
+        file1 = tmp_path / "file1.txt"
+        file2 = tmp_path / "file2.txt"
+        file1.write_text("content")
+        file2.write_text("content")
+
+        from unittest.mock import patch
+
+        with patch("builtins.open", side_effect=OSError("Read error")):
+            assert files_match(file1, file2) is False
+
 
 class TestHasFileChanged:
     """Tests for has_file_changed()."""
@@ -213,7 +273,7 @@ class TestHasFileChanged:
         """File with matching hash is unchanged."""
         test_file = tmp_path / "test.txt"
         test_file.write_text("hello world")
-        expected_hash = "b94d27b9934d3e08a52e52d7da7dabfac484efe37a5380ee9088f7ace2efcde9"
+        expected_hash = SHA256_HELLO_WORLD
 
         assert has_file_changed(test_file, expected_hash) is False
 
@@ -221,7 +281,7 @@ class TestHasFileChanged:
         """File with different hash has changed."""
         test_file = tmp_path / "test.txt"
         test_file.write_text("new content")
-        old_hash = "b94d27b9934d3e08a52e52d7da7dabfac484efe37a5380ee9088f7ace2efcde9"
+        old_hash = SHA256_HELLO_WORLD
 
         assert has_file_changed(test_file, old_hash) is True
 
@@ -231,3 +291,89 @@ class TestHasFileChanged:
         some_hash = "abc123"
 
         assert has_file_changed(missing, some_hash) is True
+
+    def test_unchanged_stat_reuses_cached_digest(self, tmp_path):
+        """Second check with identical mtime/size skips re-hashing."""
+        from unittest.mock import patch
+
+        test_file = tmp_path / "test.txt"
+        test_file.write_text("hello world")
+
+        assert has_file_changed(test_file, SHA256_HELLO_WORLD) is False
+        with patch("hash_helpers.hash_file") as mock_hash:
+            assert has_file_changed(test_file, SHA256_HELLO_WORLD) is False
+            assert has_file_changed(test_file, SHA256_EMPTY) is True
+            mock_hash.assert_not_called()
+
+    def test_modified_file_is_rehashed(self, tmp_path):
+        """A stat change invalidates the cached digest."""
+        import os
+
+        test_file = tmp_path / "test.txt"
+        test_file.write_text("hello world")
+        assert has_file_changed(test_file, SHA256_HELLO_WORLD) is False
+
+        test_file.write_text("")
+        st = test_file.stat()
+        os.utime(test_file, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+
+        assert has_file_changed(test_file, SHA256_HELLO_WORLD) is True
+        assert has_file_changed(test_file, SHA256_EMPTY) is False
+
+    def test_renamed_over_file_is_rehashed(self, tmp_path):
+        """An atomic rename swap with the same size and mtime is re-hashed."""
+        import os
+
+        test_file = tmp_path / "test.txt"
+        test_file.write_text("hello world")
+        assert has_file_changed(test_file, SHA256_HELLO_WORLD) is False
+
+        replacement = tmp_path / "replacement.txt"
+        replacement.write_text("HELLO WORLD")
+        st = test_file.stat()
+        os.utime(replacement, ns=(st.st_atime_ns, st.st_mtime_ns))
+        os.replace(replacement, test_file)
+
+        assert has_file_changed(test_file, SHA256_HELLO_WORLD) is True
+
+    def test_cache_is_bounded(self, tmp_path, monkeypatch):
+        """Only the most recently checked paths stay cached."""
+        import hash_helpers
+
+        monkeypatch.setattr(hash_helpers, "_MTIME_CACHE_MAX", 2)
+        clear_hash_cache()
+        files = []
+        for name in ("a.txt", "b.txt", "c.txt"):
+            files.append(tmp_path / name)
+            files[-1].write_text("hello world")
+
+        has_file_changed(files[0], SHA256_HELLO_WORLD)
+        has_file_changed(files[1], SHA256_HELLO_WORLD)
+        has_file_changed(files[0], SHA256_HELLO_WORLD)  # a.txt is now most recent
+        has_file_changed(files[2], SHA256_HELLO_WORLD)
+
+        assert list(hash_helpers._mtime_cache) == [str(files[0]), str(files[2])]
+
+    def test_unreadable_file_is_changed(self, tmp_path):
+        """A file that stats but cannot be hashed counts as changed."""
+        from unittest.mock import patch
+
+        test_file = tmp_path / "test.txt"
+        test_file.write_text("hello world")
+
+        with patch("hash_helpers.hash_file", return_value=None):
+            assert has_file_changed(test_file, SHA256_HELLO_WORLD) is True
+
+    def test_clear_hash_cache(self, tmp_path):
+        """clear_hash_cache() forces the next check to hash again."""
+        from unittest.mock import patch
+
+        test_file = tmp_path / "test.txt"
+        test_file.write_text("hello world")
+        has_file_changed(test_file, SHA256_HELLO_WORLD)
+
+        clear_hash_cache()
+
+        with patch("hash_helpers.hash_file", return_value=SHA256_HELLO_WORLD) as mock_hash:
+            assert has_file_changed(test_file, SHA256_HELLO_WORLD) is False
+            mock_hash.assert_called_once()
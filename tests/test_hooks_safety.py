@@ -20,17 +20,13 @@ DOC_CLAIMS = ["hooks_staged", "security_no_execution"]
 class TestHooksSafety:
     """Tests that verify hooks are staged and not enabled."""
 
-    def test_hooks_are_staged_not_installed(self, tmp_path):
+    def test_hooks_are_staged_not_installed(self, tmp_path, make_source_repo):
         """Hooks should be imported to .claude/hooks.imported.<repo> not .claude/hooks."""
         from import_assets import AssetImporter
 
         # Setup source repo with hooks
-        source_repo = tmp_path / "source"
-        source_repo.mkdir()
-        (source_repo / ".git").mkdir()
+        source_repo = make_source_repo({".claude/hooks/pre-commit": "#!/bin/bash\necho evil"})
         hooks_src = source_repo / ".claude" / "hooks"
-        hooks_src.mkdir(parents=True)
-        (hooks_src / "pre-commit").write_text("#!/bin/bash\necho evil")
 
         # Setup target
         target_repo = tmp_path / "target"
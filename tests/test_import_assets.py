@@ -48,17 +48,12 @@ class TestDryRunDefault:
         assert "dry_run" in params, "AssetImporter.__init__ should have dry_run parameter"
         assert params["dry_run"].default is True, f"dry_run should default to True, but got {params['dry_run'].default}"
 
-    def test_dry_run_prevents_file_operations(self, tmp_path):
+    def test_dry_run_prevents_file_operations(self, tmp_path, make_source_repo):
         """When dry_run=True, no files should be created or modified."""
         from import_assets import AssetImporter
 
         # Create source repo with a command to import
-        source_repo = tmp_path / "source"
-        source_repo.mkdir()
-        (source_repo / ".git").mkdir()
-        commands_dir = source_repo / ".claude" / "commands"
-        commands_dir.mkdir(parents=True)
-        (commands_dir / "test_command.md").write_text("# Test Command\n\ntest")
+        source_repo = make_source_repo({".claude/commands/test_command.md": "# Test Command\n\ntest"})
 
         # Create target area
         target = tmp_path / "target"
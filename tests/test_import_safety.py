@@ -25,19 +25,13 @@ class TestSymlinksSafety:
     @pytest.mark.skipif(
         os.name == "nt" and not os.environ.get("CI"), reason="Symlinks require admin on Windows outside CI"
     )
-    def test_symlinks_skipped_during_scan(self, tmp_path):
+    def test_symlinks_skipped_during_scan(self, tmp_path, make_source_repo):
         """Scanner should skip symlinks and not follow them."""
         from scan_repo import RepoScanner
 
         # Create a mock repo structure
-        repo_root = tmp_path / "repo"
-        repo_root.mkdir()
-        (repo_root / ".git").mkdir()  # Mark as git repo
-
-        # Create a real file
+        repo_root = make_source_repo({".claude/commands/real_command.md": "# Real Command"}, name="repo")
         real_dir = repo_root / ".claude" / "commands"
-        real_dir.mkdir(parents=True)
-        (real_dir / "real_command.md").write_text("# Real Command")
 
         # Create a symlink (on Unix-like systems)
         try:
@@ -91,8 +85,6 @@ class TestOverlappingDestinations:
         from update_integrations import IntegrationUpdater
 
         # Create mock registry with two integrations claiming same dest
-        registry_path = tmp_path / "registry.json"
-
         mock_registry = {
             "version": "1.0",
             "integrations": {
@@ -119,12 +111,8 @@ class TestOverlappingDestinations:
             },
         }
 
-        import json
-
-        registry_path.write_text(json.dumps(mock_registry, indent=2))
-
-        # Initialize updater
-        updater = IntegrationUpdater(registry_path, dry_run=True)
+        # Initialize updater from the in-memory registry (no disk round-trip)
+        updater = IntegrationUpdater.from_dict(mock_registry, tmp_path / "registry.json", dry_run=True)
 
         # Detect conflicts
         conflicts = updater._detect_destination_conflicts()
@@ -141,8 +129,6 @@ class TestOverlappingDestinations:
         """Non-overlapping destinations should not report conflicts."""
         from update_integrations import IntegrationUpdater
 
-        registry_path = tmp_path / "registry.json"
-
         mock_registry = {
             "version": "1.0",
             "integrations": {
@@ -169,11 +155,7 @@ class TestOverlappingDestinations:
             },
         }
 
-        import json
-
-        registry_path.write_text(json.dumps(mock_registry, indent=2))
-
-        updater = IntegrationUpdater(registry_path, dry_run=True)
+        updater = IntegrationUpdater.from_dict(mock_registry, tmp_path / "registry.json", dry_run=True)
         conflicts = updater._detect_destination_conflicts()
 
         assert len(conflicts) == 0, f"Should have no conflicts, but found: {conflicts}"
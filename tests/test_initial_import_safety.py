@@ -12,12 +12,7 @@ from pathlib import Path
 import pytest
 from unittest.mock import patch, MagicMock
 
-# Add scripts dirs to path for imports
-SCRIPTS_DIR = Path(__file__).parent.parent.parent / "skills" / "mine" / "scripts"
-UPDATE_SCRIPTS_DIR = Path(__file__).parent.parent.parent / "skills" / "mine-mine" / "scripts"
-sys.path.insert(0, str(SCRIPTS_DIR))
-sys.path.insert(0, str(UPDATE_SCRIPTS_DIR))
-
+# Import paths are configured by conftest.py / pyproject.toml (pythonpath)
 from import_assets import AssetImporter
 from logging_utils import setup_logging
 
@@ -83,7 +78,7 @@ class TestInitialImportSafety:
         # Assert
         assert result == 4  # Overlap error code
 
-    def test_reimport_detection_warning(self, tmp_path, mock_discovery, capsys):
+    def test_reimport_detection_warning(self, tmp_path, mock_discovery, capfd):
         """Initial import should detect if the repo is already integrated."""
         # Ensure logging is enabled (since we bypass main)
         setup_logging(verbose=True)
@@ -115,7 +110,7 @@ class TestInitialImportSafety:
             importer.import_assets()
 
         # Assert
-        captured = capsys.readouterr()
+        captured = capfd.readouterr()
         # Logging might go to stderr or stdout depending on configuration
         output = captured.out + captured.err
         assert "Repository already integrated as: existing-repo" in output
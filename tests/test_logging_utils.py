@@ -2,13 +2,10 @@
 
 import argparse
 import logging
-import sys
+import mmap
 
 import pytest
 
-# Add skills/_shared to path for imports
-sys.path.insert(0, str(__file__).replace("/tests/test_logging_utils.py", "/skills/_shared"))
-
 from logging_utils import (
     MINEFormatter,
     setup_logging,
@@ -19,67 +16,37 @@ from logging_utils import (
 )
 
 
+@pytest.fixture(scope="module", autouse=True)
+def _configured_logger():
+    """Configure the MINE root logger once for the whole module."""
+    setup_logging()
+    yield
+
+
+def _rec(level: int, msg: str, name: str = "test") -> logging.LogRecord:
+    """Build a minimal LogRecord for formatter tests."""
+    return logging.LogRecord(name, level, "", 0, msg, (), None)
+
+
 class TestMINEFormatter:
     """Tests for the custom log formatter."""
 
-    def test_format_info_clean(self):
-        """INFO level should produce clean output without prefix."""
-        formatter = MINEFormatter()
-        record = logging.LogRecord(
-            name="test",
-            level=logging.INFO,
-            pathname="",
-            lineno=0,
-            msg="Test message",
-            args=(),
-            exc_info=None,
-        )
-        result = formatter.format(record)
-        assert result == "Test message"
-
-    def test_format_error_with_prefix(self):
-        """ERROR level should have ERROR: prefix."""
-        formatter = MINEFormatter()
-        record = logging.LogRecord(
-            name="test",
-            level=logging.ERROR,
-            pathname="",
-            lineno=0,
-            msg="Something went wrong",
-            args=(),
-            exc_info=None,
-        )
-        result = formatter.format(record)
-        assert result == "ERROR: Something went wrong"
-
-    def test_format_warning_with_prefix(self):
-        """WARNING level should have WARNING: prefix."""
-        formatter = MINEFormatter()
-        record = logging.LogRecord(
-            name="test",
-            level=logging.WARNING,
-            pathname="",
-            lineno=0,
-            msg="Be careful",
-            args=(),
-            exc_info=None,
-        )
-        result = formatter.format(record)
-        assert result == "WARNING: Be careful"
+    @pytest.mark.parametrize(
+        "level,msg,expected",
+        [
+            (logging.INFO, "Test message", "Test message"),
+            (logging.ERROR, "Something went wrong", "ERROR: Something went wrong"),
+            (logging.WARNING, "Be careful", "WARNING: Be careful"),
+        ],
+        ids=["info_clean", "error_prefix", "warning_prefix"],
+    )
+    def test_format_level_prefix(self, level, msg, expected):
+        """INFO is unprefixed; WARNING/ERROR carry a level prefix."""
+        assert MINEFormatter().format(_rec(level, msg)) == expected
 
     def test_format_debug_with_name(self):
         """DEBUG level should include module name."""
-        formatter = MINEFormatter()
-        record = logging.LogRecord(
-            name="mine.module",
-            level=logging.DEBUG,
-            pathname="",
-            lineno=0,
-            msg="Debug info",
-            args=(),
-            exc_info=None,
-        )
-        result = formatter.format(record)
+        result = MINEFormatter().format(_rec(logging.DEBUG, "Debug info", name="mine.module"))
         assert "[DEBUG]" in result
         assert "mine.module" in result
         assert "Debug info" in result
@@ -88,6 +55,12 @@ class TestMINEFormatter:
 class TestSetupLogging:
     """Tests for the setup_logging function."""
 
+    @pytest.fixture(autouse=True)
+    def _restore_default_logging(self):
+        """These tests reconfigure logging; put the default setup back afterwards."""
+        yield
+        setup_logging()
+
     def test_default_level_is_info(self):
         """Default logging level should be INFO."""
         logger = setup_logging()
@@ -126,11 +99,11 @@ class TestSetupLogging:
 
         logger.info("Test log message")
 
-        # Verify file creation and content
+        # Verify file creation and content (byte scan, no decode)
         assert log_file.exists()
-        content = log_file.read_text()
-        assert "Test log message" in content
-        assert "mine" in content  # Logger name
+        with open(log_file, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            assert mm.find(b"Test log message") != -1
+            assert mm.find(b"mine") != -1  # Logger name
 
 
 class TestGetLogger:
@@ -138,53 +111,49 @@ class TestGetLogger:
 
     def test_returns_child_logger(self):
         """Should return a child of the MINE root logger."""
-        setup_logging()  # Ensure configured
         logger = get_logger("test_module")
         assert logger.name == "mine.test_module"
 
     def test_mine_prefixed_names_unchanged(self):
         """Names starting with 'mine' should be used as-is."""
-        setup_logging()
         logger = get_logger("mine.something")
         assert logger.name == "mine.something"
 
     def test_shared_prefixed_names_unchanged(self):
         """Names starting with '_shared' should be used as-is."""
-        setup_logging()
         logger = get_logger("_shared.module")
         assert logger.name == "_shared.module"
 
 
+@pytest.fixture(scope="module")
+def parser():
+    """One parser with logging arguments for the module; parse_args() does not mutate it."""
+    p = argparse.ArgumentParser()
+    add_logging_arguments(p)
+    return p
+
+
 class TestAddLoggingArguments:
     """Tests for the add_logging_arguments function."""
 
-    def test_adds_verbose_flag(self):
+    def test_adds_verbose_flag(self, parser):
         """Should add --verbose / -v flag."""
-        parser = argparse.ArgumentParser()
-        add_logging_arguments(parser)
-
         args = parser.parse_args(["-v"])
         assert args.verbose is True
 
         args = parser.parse_args(["--verbose"])
         assert args.verbose is True
 
-    def test_adds_quiet_flag(self):
+    def test_adds_quiet_flag(self, parser):
         """Should add --quiet / -q flag."""
-        parser = argparse.ArgumentParser()
-        add_logging_arguments(parser)
-
         args = parser.parse_args(["-q"])
         assert args.quiet is True
 
         args = parser.parse_args(["--quiet"])
         assert args.quiet is True
 
-    def test_verbose_and_quiet_mutually_exclusive(self):
+    def test_verbose_and_quiet_mutually_exclusive(self, parser):
         """--verbose and --quiet should be mutually exclusive."""
-        parser = argparse.ArgumentParser()
-        add_logging_arguments(parser)
-
         with pytest.raises(SystemExit):
             parser.parse_args(["--verbose", "--quiet"])
 
@@ -194,18 +163,17 @@ class TestLogAction:
 
     def test_log_action_normal(self, caplog):
         """Should log action without dry-run prefix."""
-        setup_logging()
+        caplog.clear()
         with caplog.at_level(logging.INFO):
             log_action("Creating", "/path/to/file.md", dry_run=False)
-        assert "Creating /path/to/file.md" in caplog.text
-        assert "[DRY-RUN]" not in caplog.text
+        assert caplog.records[-1].getMessage() == "Creating /path/to/file.md"
 
     def test_log_action_dry_run(self, caplog):
         """Should log action with dry-run prefix."""
-        setup_logging()
+        caplog.clear()
         with caplog.at_level(logging.INFO):
             log_action("Creating", "/path/to/file.md", dry_run=True)
-        assert "[DRY-RUN] Creating /path/to/file.md" in caplog.text
+        assert caplog.records[-1].getMessage() == "[DRY-RUN] Creating /path/to/file.md"
 
 
 class TestLogSkip:
@@ -213,7 +181,63 @@ class TestLogSkip:
 
     def test_log_skip_with_reason(self, caplog):
         """Should log skip with reason in parentheses."""
-        setup_logging()
+        caplog.clear()
         with caplog.at_level(logging.INFO):
             log_skip("Already exists", "/path/to/file.md")
-        assert "SKIP: /path/to/file.md (Already exists)" in caplog.text
+        assert caplog.records[-1].getMessage() == "SKIP: /path/to/file.md (Already exists)"
+
+
+class TestLogActionLazyFormat:
+    """log_action/log_skip must hand the logger a template plus args, not a pre-built string."""
+
+    class _RawHandler(logging.Handler):
+        def __init__(self):
+            super().__init__(level=logging.DEBUG)
+            self.records = []
+
+        def emit(self, record):
+            self.records.append(record)
+
+    class _StrCounter:
+        def __init__(self):
+            self.calls = 0
+
+        def __str__(self):
+            self.calls += 1
+            return "/path/to/file.md"
+
+    @pytest.fixture
+    def raw_handler(self):
+        logger = get_logger("mine")
+        handler = self._RawHandler()
+        logger.addHandler(handler)
+        yield handler
+        logger.removeHandler(handler)
+
+    def test_log_action_passes_template(self, raw_handler):
+        """The emitted record keeps the unformatted template in msg."""
+        log_action("Creating", "/path/to/file.md", dry_run=True)
+        record = raw_handler.records[-1]
+        assert record.msg == "%s%s %s"
+        assert record.getMessage() == "[DRY-RUN] Creating /path/to/file.md"
+
+    def test_log_skip_passes_template(self, raw_handler):
+        """log_skip also defers formatting to the handler."""
+        log_skip("Already exists", "/path/to/file.md")
+        record = raw_handler.records[-1]
+        assert record.msg == "SKIP: %s (%s)"
+        assert record.getMessage() == "SKIP: /path/to/file.md (Already exists)"
+
+    def test_disabled_level_skips_formatting(self):
+        """When INFO is filtered out, the target is never stringified."""
+        logger = get_logger("mine")
+        old_level = logger.level
+        logger.setLevel(logging.CRITICAL)
+        target = self._StrCounter()
+        try:
+            log_action("Creating", target)
+            log_skip("Already exists", target)
+        finally:
+            logger.setLevel(old_level)
+
+        assert target.calls == 0
@@ -3,17 +3,20 @@ Tests for platform_utils.py module.
 
 Covers platform detection, WSL detection, path utilities, and case sensitivity.
 Uses mocking to test WSL-specific code paths on non-WSL systems.
+
+Assertions here are plain identity/equality checks, so pytest's assertion
+rewriting is switched off for this module: PYTEST_DONT_REWRITE
 """
 
 import os
 import sys
 from pathlib import Path
-from unittest.mock import MagicMock, PropertyMock, patch
+from types import SimpleNamespace
+from unittest.mock import MagicMock
 
 import pytest
 
-# Setup path for modules
-sys.path.insert(0, str(Path(__file__).parent.parent / "skills" / "_shared"))
+# Import paths are configured by conftest.py / pyproject.toml (pythonpath)
 
 import platform_utils
 from platform_utils import (
@@ -29,640 +32,508 @@ from platform_utils import (
 )
 
 
-def reset_platform_utils_cache():
+def _clear_platform_caches():
     """Reset all cached values in platform_utils."""
     platform_utils._IS_WSL = None
     platform_utils._WSL_VERSION = None
     platform_utils._CASE_SENSITIVE = None
 
 
-class TestGetLongPath:
-    """Tests for get_long_path()."""
-
-    def test_get_long_path_on_non_windows(self):
-        """On non-Windows, returns path unchanged."""
-        with patch.object(sys, "platform", "linux"):
-            result = get_long_path("/home/user/file.txt")
-            assert result == "/home/user/file.txt"
-
-    @pytest.mark.skipif(sys.platform != "win32", reason="Windows-only test")
-    def test_get_long_path_on_windows(self, tmp_path):
-        """On Windows, prefixes with \\\\?\\."""
-        test_path = tmp_path / "test.txt"
-        result = get_long_path(test_path)
-        assert result.startswith("\\\\?\\")
-
-    @pytest.mark.skipif(sys.platform != "win32", reason="Windows-only test")
-    def test_get_long_path_already_prefixed(self):
-        """Already prefixed paths are returned unchanged."""
-        prefixed = "\\\\?\\C:\\some\\path"
-        result = get_long_path(prefixed)
-        assert result == prefixed
-
-    def test_get_long_path_unc_path(self):
-        """UNC paths get proper \\\\?\\UNC\\ prefix."""
-        with patch.object(sys, "platform", "win32"):
-            with patch("os.path.abspath", return_value="\\\\server\\share\\path"):
-                result = get_long_path("\\\\server\\share\\path")
-                assert result == "\\\\?\\UNC\\server\\share\\path"
-
-    def test_get_long_path_regular_windows_path(self):
-        """Regular Windows paths get \\\\?\\ prefix."""
-        with patch.object(sys, "platform", "win32"):
-            with patch("os.path.abspath", return_value="C:\\Users\\test"):
-                result = get_long_path("C:\\Users\\test")
-                assert result == "\\\\?\\C:\\Users\\test"
-
-    def test_get_long_path_exception_handling(self):
-        """Handles exceptions gracefully."""
-        with patch("os.path.abspath", side_effect=Exception("test error")):
-            with patch.object(sys, "platform", "win32"):
-                result = get_long_path("some/path")
-                assert result == "some/path"
-
+def _raise(exc):
+    """Build a stand-in callable that raises exc whatever it is called with."""
 
-class TestIsWsl:
-    """Tests for is_wsl()."""
+    def _raiser(*args, **kwargs):
+        raise exc
 
-    def test_is_wsl_cached_true(self):
-        """Returns cached True value."""
-        platform_utils._IS_WSL = True
-        assert is_wsl() is True
-        reset_platform_utils_cache()
+    return _raiser
 
-    def test_is_wsl_cached_false(self):
-        """Returns cached False value."""
-        platform_utils._IS_WSL = False
-        assert is_wsl() is False
-        reset_platform_utils_cache()
 
-    def test_is_wsl_from_proc_version_microsoft(self):
-        """Detects WSL from /proc/version containing 'microsoft'."""
-        reset_platform_utils_cache()
+def _returns(*values):
+    """Build a stand-in callable returning values in order, like side_effect=[...]."""
+    it = iter(values)
+    return lambda *args, **kwargs: next(it)
 
-        mock_path = MagicMock()
-        mock_path.exists.return_value = True
-        mock_path.read_text.return_value = "Linux version 5.10.16.3-microsoft-standard"
 
-        with patch("platform_utils.Path", return_value=mock_path):
-            with patch.dict(os.environ, {}, clear=True):
-                result = is_wsl()
-                assert result is True
+def _proc_stub(text=None, err=False, exists=True):
+    """Build a stand-in for Path("/proc/version") with the given exists()/read_text() behaviour."""
+    stub = MagicMock()
+    stub.exists.return_value = exists
+    if err:
+        stub.read_text.side_effect = OSError("Permission denied")
+    else:
+        stub.read_text.return_value = text
+    return stub
 
-        reset_platform_utils_cache()
 
-    def test_is_wsl_from_proc_version_wsl(self):
-        """Detects WSL from /proc/version containing 'wsl'."""
-        reset_platform_utils_cache()
+# Prebuilt /proc/version stubs shared by the module; tests must not mutate them
+_PROC_MICROSOFT = _proc_stub("Linux version 5.10.16.3-microsoft-standard")
+_PROC_WSL2 = _proc_stub("Linux version 5.10.16.3-WSL2-something")
+_PROC_OSERROR = _proc_stub(err=True)
+_NO_PROC_PATH = _proc_stub(exists=False)
 
-        mock_path = MagicMock()
-        mock_path.exists.return_value = True
-        mock_path.read_text.return_value = "Linux version 5.10.16.3-WSL2-something"
 
-        with patch("platform_utils.Path", return_value=mock_path):
-            with patch.dict(os.environ, {}, clear=True):
-                result = is_wsl()
-                assert result is True
+@pytest.fixture(scope="session")
+def shared_src(tmp_path_factory):
+    """A real source file created once per session for tests that only read or link to it."""
+    src = tmp_path_factory.mktemp("sym") / "source.txt"
+    src.write_text("content")
+    return src
 
-        reset_platform_utils_cache()
 
-    def test_is_wsl_from_wsl_distro_name_env(self):
-        """Detects WSL from WSL_DISTRO_NAME environment variable."""
-        reset_platform_utils_cache()
+@pytest.fixture
+def clean_env(monkeypatch):
+    """Replace os.environ with an empty dict for the test; returns it for seeding."""
+    fake = {}
+    monkeypatch.setattr(os, "environ", fake)
+    return fake
 
-        mock_path = MagicMock()
-        mock_path.exists.return_value = False
 
-        with patch("platform_utils.Path", return_value=mock_path):
-            with patch.dict(os.environ, {"WSL_DISTRO_NAME": "Ubuntu"}, clear=True):
-                result = is_wsl()
-                assert result is True
+@pytest.fixture
+def path_dispatch():
+    """
+    Factory for a platform_utils.Path replacement used by get_wsl_version().
 
-        reset_platform_utils_cache()
+    The returned callable maps "/run/WSL" and "/proc/version" to stubs with
+    the requested exists()/read_text() behaviour.
+    """
 
-    def test_is_wsl_from_wsl_interop_env(self):
-        """Detects WSL from WSL_INTEROP environment variable."""
-        reset_platform_utils_cache()
+    def make(run_wsl_exists, proc_text=None, proc_raises=False):
+        run_wsl = MagicMock()
+        run_wsl.exists.return_value = run_wsl_exists
+        proc_version = _proc_stub(proc_text, err=proc_raises)
 
-        mock_path = MagicMock()
-        mock_path.exists.return_value = False
-
-        with patch("platform_utils.Path", return_value=mock_path):
-            with patch.dict(os.environ, {"WSL_INTEROP": "/run/WSL/1_interop"}, clear=True):
-                result = is_wsl()
-                assert result is True
-
-        reset_platform_utils_cache()
+        def dispatch(p):
+            if p == "/run/WSL":
+                return run_wsl
+            elif p == "/proc/version":
+                return proc_version
+            return MagicMock()
 
-    def test_is_wsl_not_wsl(self):
-        """Returns False when not in WSL."""
-        reset_platform_utils_cache()
+        return dispatch
 
-        mock_path = MagicMock()
-        mock_path.exists.return_value = False
+    return make
 
-        with patch("platform_utils.Path", return_value=mock_path):
-            with patch.dict(os.environ, {}, clear=True):
-                result = is_wsl()
-                assert result is False
 
-        reset_platform_utils_cache()
+@pytest.fixture(autouse=True)
+def _reset_cache():
+    """Run every test against empty platform_utils caches and clear them afterwards."""
+    _clear_platform_caches()
+    yield
+    _clear_platform_caches()
 
-    def test_is_wsl_proc_version_oserror(self):
-        """Handles OSError when reading /proc/version."""
-        reset_platform_utils_cache()
 
-        mock_path = MagicMock()
-        mock_path.exists.return_value = True
-        mock_path.read_text.side_effect = OSError("Permission denied")
+# =============================================================================
+# get_long_path()
+# =============================================================================
 
-        with patch("platform_utils.Path", return_value=mock_path):
-            with patch.dict(os.environ, {}, clear=True):
-                result = is_wsl()
-                assert result is False
 
-        reset_platform_utils_cache()
+def test_get_long_path_on_non_windows(monkeypatch):
+    """On non-Windows, returns path unchanged."""
+    monkeypatch.setattr(sys, "platform", "linux")
+    result = get_long_path("/home/user/file.txt")
+    assert result == "/home/user/file.txt"
 
 
-class TestGetWslVersion:
-    """Tests for get_wsl_version()."""
+def test_get_long_path_unc_path(monkeypatch):
+    """UNC paths get proper \\\\?\\UNC\\ prefix."""
+    monkeypatch.setattr(sys, "platform", "win32")
+    monkeypatch.setattr(os.path, "abspath", lambda p: "\\\\server\\share\\path")
+    result = get_long_path("\\\\server\\share\\path")
+    assert result == "\\\\?\\UNC\\server\\share\\path"
 
-    def test_get_wsl_version_cached(self):
-        """Returns cached value."""
-        platform_utils._WSL_VERSION = 2
-        platform_utils._IS_WSL = True
-        assert get_wsl_version() == 2
-        reset_platform_utils_cache()
 
-    def test_get_wsl_version_not_wsl(self):
-        """Returns None when not WSL."""
-        platform_utils._IS_WSL = False
-        platform_utils._WSL_VERSION = None
-        assert get_wsl_version() is None
-        reset_platform_utils_cache()
+def test_get_long_path_regular_windows_path(monkeypatch):
+    """Regular Windows paths get \\\\?\\ prefix."""
+    monkeypatch.setattr(sys, "platform", "win32")
+    monkeypatch.setattr(os.path, "abspath", lambda p: "C:\\Users\\test")
+    result = get_long_path("C:\\Users\\test")
+    assert result == "\\\\?\\C:\\Users\\test"
 
-    def test_get_wsl_version_wsl2_from_run_wsl(self):
-        """Detects WSL2 from /run/WSL directory."""
-        reset_platform_utils_cache()
-        platform_utils._IS_WSL = True
 
-        mock_run_wsl = MagicMock()
-        mock_run_wsl.exists.return_value = True
+def test_get_long_path_exception_handling(monkeypatch):
+    """Handles exceptions gracefully."""
+    monkeypatch.setattr(os.path, "abspath", _raise(Exception("test error")))
+    monkeypatch.setattr(sys, "platform", "win32")
+    result = get_long_path("some/path")
+    assert result == "some/path"
 
-        with patch("platform_utils.Path") as mock_path_class:
-            mock_path_class.return_value = mock_run_wsl
-            result = get_wsl_version()
-            assert result == 2
 
-        reset_platform_utils_cache()
+class TestGetLongPathWindows:
+    """Tests for get_long_path() against the real Windows path APIs."""
 
-    def test_get_wsl_version_wsl2_from_proc_version(self):
-        """Detects WSL2 from /proc/version kernel string."""
-        reset_platform_utils_cache()
-        platform_utils._IS_WSL = True
+    pytestmark = pytest.mark.skipif(sys.platform != "win32", reason="Windows-only test")
 
-        mock_run_wsl = MagicMock()
-        mock_run_wsl.exists.return_value = False
+    def test_get_long_path_on_windows(self, shared_src):
+        """On Windows, prefixes with \\\\?\\."""
+        result = get_long_path(shared_src)
+        assert result.startswith("\\\\?\\")
 
-        mock_proc_version = MagicMock()
-        mock_proc_version.read_text.return_value = "Linux 5.10.16.3-microsoft-standard-WSL2"
+    def test_get_long_path_already_prefixed(self):
+        """Already prefixed paths are returned unchanged."""
+        prefixed = "\\\\?\\C:\\some\\path"
+        result = get_long_path(prefixed)
+        assert result == prefixed
 
-        def path_side_effect(p):
-            if p == "/run/WSL":
-                return mock_run_wsl
-            elif p == "/proc/version":
-                return mock_proc_version
-            return MagicMock()
 
-        with patch("platform_utils.Path", side_effect=path_side_effect):
-            result = get_wsl_version()
-            assert result == 2
+# =============================================================================
+# is_wsl()
+# =============================================================================
+
+
+def test_is_wsl_cached_true():
+    """Returns cached True value."""
+    platform_utils._IS_WSL = True
+    assert is_wsl() is True
+
+
+def test_is_wsl_cached_false():
+    """Returns cached False value."""
+    platform_utils._IS_WSL = False
+    assert is_wsl() is False
+
+
+@pytest.mark.parametrize(
+    "proc_path, env, expected",
+    [
+        (_PROC_MICROSOFT, {}, True),
+        (_PROC_WSL2, {}, True),
+        (_NO_PROC_PATH, {"WSL_DISTRO_NAME": "Ubuntu"}, True),
+        (_NO_PROC_PATH, {"WSL_INTEROP": "/run/WSL/1_interop"}, True),
+        (_NO_PROC_PATH, {}, False),
+        (_PROC_OSERROR, {}, False),
+    ],
+    ids=[
+        "proc_version_microsoft",
+        "proc_version_wsl",
+        "wsl_distro_name_env",
+        "wsl_interop_env",
+        "not_wsl",
+        "proc_version_oserror",
+    ],
+)
+def test_is_wsl_detection(monkeypatch, clean_env, proc_path, env, expected):
+    """Detects WSL from /proc/version or the WSL environment variables."""
+    monkeypatch.setattr(platform_utils, "Path", lambda *args, **kwargs: proc_path)
+    clean_env.update(env)
+    assert is_wsl() is expected
 
-        reset_platform_utils_cache()
 
-    def test_get_wsl_version_wsl1_default(self):
-        """Defaults to WSL1 when WSL detected but not WSL2."""
-        reset_platform_utils_cache()
-        platform_utils._IS_WSL = True
+# =============================================================================
+# get_wsl_version()
+# =============================================================================
 
-        mock_run_wsl = MagicMock()
-        mock_run_wsl.exists.return_value = False
 
-        mock_proc_version = MagicMock()
-        mock_proc_version.read_text.return_value = "Linux 4.4.0-microsoft"
+def test_get_wsl_version_cached():
+    """Returns cached value."""
+    platform_utils._WSL_VERSION = 2
+    platform_utils._IS_WSL = True
+    assert get_wsl_version() == 2
 
-        def path_side_effect(p):
-            if p == "/run/WSL":
-                return mock_run_wsl
-            elif p == "/proc/version":
-                return mock_proc_version
-            return MagicMock()
 
-        with patch("platform_utils.Path", side_effect=path_side_effect):
-            result = get_wsl_version()
-            assert result == 1
+def test_get_wsl_version_not_wsl():
+    """Returns None when not WSL."""
+    platform_utils._IS_WSL = False
+    platform_utils._WSL_VERSION = None
+    assert get_wsl_version() is None
 
-        reset_platform_utils_cache()
 
-    def test_get_wsl_version_proc_version_oserror(self):
-        """Handles OSError when checking WSL version, defaults to WSL1."""
-        reset_platform_utils_cache()
-        platform_utils._IS_WSL = True
+def test_get_wsl_version_wsl2_from_run_wsl(monkeypatch):
+    """Detects WSL2 from /run/WSL directory."""
+    platform_utils._IS_WSL = True
 
-        mock_run_wsl = MagicMock()
-        mock_run_wsl.exists.return_value = False
+    mock_run_wsl = MagicMock()
+    mock_run_wsl.exists.return_value = True
 
-        mock_proc_version = MagicMock()
-        mock_proc_version.read_text.side_effect = OSError("Permission denied")
+    monkeypatch.setattr(platform_utils, "Path", lambda *args, **kwargs: mock_run_wsl)
+    result = get_wsl_version()
+    assert result == 2
 
-        def path_side_effect(p):
-            if p == "/run/WSL":
-                return mock_run_wsl
-            elif p == "/proc/version":
-                return mock_proc_version
-            return MagicMock()
 
-        with patch("platform_utils.Path", side_effect=path_side_effect):
-            result = get_wsl_version()
-            assert result == 1  # Default to WSL1
+def test_get_wsl_version_wsl2_from_proc_version(monkeypatch, path_dispatch):
+    """Detects WSL2 from /proc/version kernel string."""
+    platform_utils._IS_WSL = True
 
-        reset_platform_utils_cache()
+    monkeypatch.setattr(platform_utils, "Path", path_dispatch(False, "Linux 5.10.16.3-microsoft-standard-WSL2"))
+    result = get_wsl_version()
+    assert result == 2
 
 
-class TestIsWindowsPath:
-    """Tests for is_windows_path()."""
+def test_get_wsl_version_wsl1_default(monkeypatch, path_dispatch):
+    """Defaults to WSL1 when WSL detected but not WSL2."""
+    platform_utils._IS_WSL = True
 
-    def test_is_windows_path_not_wsl(self):
-        """Returns False when not in WSL."""
-        reset_platform_utils_cache()
-        platform_utils._IS_WSL = False
+    monkeypatch.setattr(platform_utils, "Path", path_dispatch(False, "Linux 4.4.0-microsoft"))
+    result = get_wsl_version()
+    assert result == 1
 
-        result = is_windows_path(Path("/mnt/c/Users"))
-        assert result is False
 
-        reset_platform_utils_cache()
+def test_get_wsl_version_proc_version_oserror(monkeypatch, path_dispatch):
+    """Handles OSError when checking WSL version, defaults to WSL1."""
+    platform_utils._IS_WSL = True
 
-    def test_is_windows_path_wsl_mnt_path(self):
-        """Detects /mnt/c/ style paths in WSL."""
-        reset_platform_utils_cache()
-        platform_utils._IS_WSL = True
+    monkeypatch.setattr(platform_utils, "Path", path_dispatch(False, proc_raises=True))
+    result = get_wsl_version()
+    assert result == 1  # Default to WSL1
 
-        mock_path = MagicMock()
-        mock_path.resolve.return_value = mock_path
-        mock_path.parts = ("/", "mnt", "c", "Users")
 
-        result = is_windows_path(mock_path)
-        assert result is True
+# =============================================================================
+# is_windows_path()
+# =============================================================================
 
-        reset_platform_utils_cache()
 
-    def test_is_windows_path_wsl_linux_path(self):
-        """Returns False for Linux paths in WSL."""
-        reset_platform_utils_cache()
-        platform_utils._IS_WSL = True
+def test_is_windows_path_not_wsl():
+    """Returns False when not in WSL."""
+    platform_utils._IS_WSL = False
 
-        mock_path = MagicMock()
-        mock_path.resolve.return_value = mock_path
-        mock_path.parts = ("/", "home", "user")
+    result = is_windows_path(Path("/mnt/c/Users"))
+    assert result is False
 
-        result = is_windows_path(mock_path)
-        assert result is False
 
-        reset_platform_utils_cache()
+def test_is_windows_path_wsl_mnt_path():
+    """Detects /mnt/c/ style paths in WSL."""
+    platform_utils._IS_WSL = True
 
-    def test_is_windows_path_short_parts(self):
-        """Returns False for paths with fewer than 3 parts."""
-        reset_platform_utils_cache()
-        platform_utils._IS_WSL = True
+    mock_path = SimpleNamespace(parts=("/", "mnt", "c", "Users"))
+    mock_path.resolve = lambda: mock_path
 
-        mock_path = MagicMock()
-        mock_path.resolve.return_value = mock_path
-        mock_path.parts = ("/", "mnt")
+    result = is_windows_path(mock_path)
+    assert result is True
 
-        result = is_windows_path(mock_path)
-        assert result is False
 
-        reset_platform_utils_cache()
+def test_is_windows_path_wsl_linux_path():
+    """Returns False for Linux paths in WSL."""
+    platform_utils._IS_WSL = True
 
-    def test_is_windows_path_oserror_on_resolve(self):
-        """Handles OSError when resolving path."""
-        reset_platform_utils_cache()
-        platform_utils._IS_WSL = True
+    mock_path = SimpleNamespace(parts=("/", "home", "user"))
+    mock_path.resolve = lambda: mock_path
 
-        mock_path = MagicMock()
-        mock_path.resolve.side_effect = OSError("Cannot resolve")
-        mock_path.parts = ("/", "mnt", "c", "Users")
+    result = is_windows_path(mock_path)
+    assert result is False
 
-        result = is_windows_path(mock_path)
-        assert result is True
 
-        reset_platform_utils_cache()
+def test_is_windows_path_short_parts():
+    """Returns False for paths with fewer than 3 parts."""
+    platform_utils._IS_WSL = True
 
-    def test_is_windows_path_non_single_char_drive(self):
-        """Returns False when drive letter is not single char."""
-        reset_platform_utils_cache()
-        platform_utils._IS_WSL = True
+    mock_path = SimpleNamespace(parts=("/", "mnt"))
+    mock_path.resolve = lambda: mock_path
 
-        mock_path = MagicMock()
-        mock_path.resolve.return_value = mock_path
-        mock_path.parts = ("/", "mnt", "cd", "Users")  # 'cd' is not a valid drive
+    result = is_windows_path(mock_path)
+    assert result is False
 
-        result = is_windows_path(mock_path)
-        assert result is False
 
-        reset_platform_utils_cache()
+def test_is_windows_path_oserror_on_resolve():
+    """Handles OSError when resolving path."""
+    platform_utils._IS_WSL = True
 
+    mock_path = SimpleNamespace(parts=("/", "mnt", "c", "Users"), resolve=_raise(OSError("Cannot resolve")))
 
-class TestGetNativeWindowsPath:
-    """Tests for get_native_windows_path()."""
+    result = is_windows_path(mock_path)
+    assert result is True
 
-    def test_get_native_windows_path_not_windows_path(self):
-        """Returns None for non-Windows paths."""
-        reset_platform_utils_cache()
-        platform_utils._IS_WSL = False
 
-        result = get_native_windows_path(Path("/home/user"))
-        assert result is None
+def test_is_windows_path_non_single_char_drive():
+    """Returns False when drive letter is not single char."""
+    platform_utils._IS_WSL = True
 
-        reset_platform_utils_cache()
+    mock_path = SimpleNamespace(parts=("/", "mnt", "cd", "Users"))  # 'cd' is not a valid drive
+    mock_path.resolve = lambda: mock_path
 
-    def test_get_native_windows_path_conversion(self):
-        """Converts WSL path to Windows path."""
-        reset_platform_utils_cache()
-        platform_utils._IS_WSL = True
+    result = is_windows_path(mock_path)
+    assert result is False
 
-        mock_path = MagicMock()
-        mock_path.resolve.return_value = mock_path
-        mock_path.parts = ("/", "mnt", "c", "Users", "test")
 
-        with patch("platform_utils.is_windows_path", return_value=True):
-            result = get_native_windows_path(mock_path)
+# =============================================================================
+# get_native_windows_path()
+# =============================================================================
 
-        assert result == "C:\\Users\\test"
-        reset_platform_utils_cache()
 
-    def test_get_native_windows_path_oserror_on_resolve(self):
-        """Handles OSError when resolving path."""
-        reset_platform_utils_cache()
-        platform_utils._IS_WSL = True
+def test_get_native_windows_path_not_windows_path():
+    """Returns None for non-Windows paths."""
+    platform_utils._IS_WSL = False
 
-        mock_path = MagicMock()
-        mock_path.resolve.side_effect = OSError("Cannot resolve")
-        mock_path.parts = ("/", "mnt", "d", "Data", "files")
+    result = get_native_windows_path(Path("/home/user"))
+    assert result is None
 
-        with patch("platform_utils.is_windows_path", return_value=True):
-            result = get_native_windows_path(mock_path)
 
-        assert result == "D:\\Data\\files"
-        reset_platform_utils_cache()
+def test_get_native_windows_path_conversion(monkeypatch):
+    """Converts WSL path to Windows path."""
+    platform_utils._IS_WSL = True
 
-    def test_get_native_windows_path_short_path(self):
-        """Returns None for path with fewer than 3 parts after resolution."""
-        reset_platform_utils_cache()
-        platform_utils._IS_WSL = True
+    mock_path = SimpleNamespace(parts=("/", "mnt", "c", "Users", "test"))
+    mock_path.resolve = lambda: mock_path
 
-        mock_path = MagicMock()
-        mock_path.resolve.return_value = mock_path
-        mock_path.parts = ("/", "mnt")
+    monkeypatch.setattr(platform_utils, "is_windows_path", lambda path: True)
+    result = get_native_windows_path(mock_path)
 
-        with patch("platform_utils.is_windows_path", return_value=True):
-            result = get_native_windows_path(mock_path)
+    assert result == "C:\\Users\\test"
 
-        assert result is None
-        reset_platform_utils_cache()
 
+def test_get_native_windows_path_oserror_on_resolve(monkeypatch):
+    """Handles OSError when resolving path."""
+    platform_utils._IS_WSL = True
 
-class TestIsFilesystemCaseSensitive:
-    """Tests for is_filesystem_case_sensitive()."""
+    mock_path = SimpleNamespace(parts=("/", "mnt", "d", "Data", "files"), resolve=_raise(OSError("Cannot resolve")))
 
-    def test_is_filesystem_case_sensitive_detection(self):
-        """Detects case sensitivity correctly."""
-        reset_platform_utils_cache()
+    monkeypatch.setattr(platform_utils, "is_windows_path", lambda path: True)
+    result = get_native_windows_path(mock_path)
 
-        result = is_filesystem_case_sensitive()
-        assert isinstance(result, bool)
+    assert result == "D:\\Data\\files"
 
-        # On Windows, typically False; on Linux, typically True
-        if sys.platform == "win32":
-            assert result is False
 
-        reset_platform_utils_cache()
+def test_get_native_windows_path_short_path(monkeypatch):
+    """Returns None for path with fewer than 3 parts after resolution."""
+    platform_utils._IS_WSL = True
 
-    def test_is_filesystem_case_sensitive_cached_true(self):
-        """Returns cached True value."""
-        platform_utils._CASE_SENSITIVE = True
-        assert is_filesystem_case_sensitive() is True
-        reset_platform_utils_cache()
+    mock_path = SimpleNamespace(parts=("/", "mnt"))
+    mock_path.resolve = lambda: mock_path
 
-    def test_is_filesystem_case_sensitive_cached_false(self):
-        """Returns cached False value."""
-        platform_utils._CASE_SENSITIVE = False
-        assert is_filesystem_case_sensitive() is False
-        reset_platform_utils_cache()
+    monkeypatch.setattr(platform_utils, "is_windows_path", lambda path: True)
+    result = get_native_windows_path(mock_path)
 
+    assert result is None
 
-class TestIsPathCaseSensitive:
-    """Tests for is_path_case_sensitive()."""
 
-    def test_is_path_case_sensitive_windows_path_in_wsl(self):
-        """Windows paths in WSL are case-insensitive."""
-        reset_platform_utils_cache()
-        platform_utils._IS_WSL = True
+# =============================================================================
+# is_filesystem_case_sensitive()
+# =============================================================================
 
-        mock_path = MagicMock()
-        mock_path.resolve.return_value = mock_path
-        mock_path.parts = ("/", "mnt", "c", "Users")
 
-        with patch("platform_utils.is_windows_path", return_value=True):
-            result = is_path_case_sensitive(mock_path)
+def test_is_filesystem_case_sensitive_detection():
+    """Detects case sensitivity correctly."""
+    result = is_filesystem_case_sensitive()
+    assert isinstance(result, bool)
 
+    # On Windows, typically False; on Linux, typically True
+    if sys.platform == "win32":
         assert result is False
-        reset_platform_utils_cache()
 
-    def test_is_path_case_sensitive_linux_path_in_wsl(self):
-        """Linux paths in WSL use filesystem detection."""
-        reset_platform_utils_cache()
-        platform_utils._IS_WSL = True
-        platform_utils._CASE_SENSITIVE = True
 
-        mock_path = MagicMock()
-        with patch("platform_utils.is_windows_path", return_value=False):
-            result = is_path_case_sensitive(mock_path)
+def test_is_filesystem_case_sensitive_cached_true():
+    """Returns cached True value."""
+    platform_utils._CASE_SENSITIVE = True
+    assert is_filesystem_case_sensitive() is True
 
-        assert result is True
-        reset_platform_utils_cache()
 
-    def test_is_path_case_sensitive_native_path(self, tmp_path):
-        """Native paths use filesystem detection."""
-        reset_platform_utils_cache()
-        platform_utils._IS_WSL = False
+def test_is_filesystem_case_sensitive_cached_false():
+    """Returns cached False value."""
+    platform_utils._CASE_SENSITIVE = False
+    assert is_filesystem_case_sensitive() is False
 
-        result = is_path_case_sensitive(tmp_path)
-        assert isinstance(result, bool)
 
-        reset_platform_utils_cache()
+# =============================================================================
+# is_path_case_sensitive()
+# =============================================================================
 
 
-class TestIsCaseOnlyRename:
-    """Tests for is_case_only_rename()."""
+def test_is_path_case_sensitive_windows_path_in_wsl(monkeypatch):
+    """Windows paths in WSL are case-insensitive."""
+    platform_utils._IS_WSL = True
 
-    def test_is_case_only_rename_true(self):
-        """Detects case-only renames."""
-        old = Path("/path/to/File.txt")
-        new = Path("/path/to/file.txt")
-        assert is_case_only_rename(old, new) is True
+    mock_path = SimpleNamespace(parts=("/", "mnt", "c", "Users"))
+    mock_path.resolve = lambda: mock_path
 
-    def test_is_case_only_rename_false_different_names(self):
-        """Different names are not case-only renames."""
-        old = Path("/path/to/file1.txt")
-        new = Path("/path/to/file2.txt")
-        assert is_case_only_rename(old, new) is False
+    monkeypatch.setattr(platform_utils, "is_windows_path", lambda path: True)
+    result = is_path_case_sensitive(mock_path)
 
-    def test_is_case_only_rename_false_same_case(self):
-        """Same case is not a rename."""
-        old = Path("/path/to/file.txt")
-        new = Path("/path/to/file.txt")
-        assert is_case_only_rename(old, new) is False
+    assert result is False
 
-    def test_is_case_only_rename_all_uppercase(self):
-        """Detects uppercase to lowercase rename."""
-        old = Path("/path/to/FILE.TXT")
-        new = Path("/path/to/file.txt")
-        assert is_case_only_rename(old, new) is True
 
+def test_is_path_case_sensitive_linux_path_in_wsl(monkeypatch):
+    """Linux paths in WSL use filesystem detection."""
+    platform_utils._IS_WSL = True
+    platform_utils._CASE_SENSITIVE = True
 
-class TestHandleWslSymlink:
-    """Tests for handle_wsl_symlink()."""
+    mock_path = SimpleNamespace()
+    monkeypatch.setattr(platform_utils, "is_windows_path", lambda path: False)
+    result = is_path_case_sensitive(mock_path)
 
-    def test_handle_wsl_symlink_cross_filesystem_windows_to_linux(self):
-        """Cross-filesystem symlinks (Windows to Linux) return False."""
-        reset_platform_utils_cache()
-        platform_utils._IS_WSL = True
+    assert result is True
 
-        source = MagicMock()
-        target = MagicMock()
 
-        with patch("platform_utils.is_windows_path", side_effect=[True, False]):
-            result = handle_wsl_symlink(source, target)
+def test_is_path_case_sensitive_native_path(tmp_path):
+    """Native paths use filesystem detection."""
+    platform_utils._IS_WSL = False
 
-        assert result is False
-        reset_platform_utils_cache()
+    result = is_path_case_sensitive(tmp_path)
+    assert isinstance(result, bool)
 
-    def test_handle_wsl_symlink_cross_filesystem_linux_to_windows(self):
-        """Cross-filesystem symlinks (Linux to Windows) return False."""
-        reset_platform_utils_cache()
-        platform_utils._IS_WSL = True
 
-        source = MagicMock()
-        target = MagicMock()
+# =============================================================================
+# is_case_only_rename()
+# =============================================================================
 
-        with patch("platform_utils.is_windows_path", side_effect=[False, True]):
-            result = handle_wsl_symlink(source, target)
 
-        assert result is False
-        reset_platform_utils_cache()
-
-    def test_handle_wsl_symlink_wsl1_ntfs_success(self):
-        """WSL1 on NTFS symlink success."""
-        reset_platform_utils_cache()
-        platform_utils._IS_WSL = True
-        platform_utils._WSL_VERSION = 1
+@pytest.mark.parametrize(
+    "old, new, expected",
+    [
+        ("/path/to/File.txt", "/path/to/file.txt", True),
+        ("/path/to/file1.txt", "/path/to/file2.txt", False),
+        ("/path/to/file.txt", "/path/to/file.txt", False),
+        ("/path/to/FILE.TXT", "/path/to/file.txt", True),
+    ],
+    ids=["case_only", "different_names", "same_case", "all_uppercase"],
+)
+def test_is_case_only_rename(old, new, expected):
+    """Only names differing solely by case count as case-only renames."""
+    assert is_case_only_rename(Path(old), Path(new)) is expected
+
+
+# =============================================================================
+# handle_wsl_symlink()
+# =============================================================================
+
+
+@pytest.mark.parametrize(
+    "windows_paths, wsl_version, symlink_error, expected",
+    [
+        ((True, False), 2, None, False),
+        ((False, True), 2, None, False),
+        ((True, True), 1, None, True),
+        ((True, True), 1, OSError("Permission denied"), False),
+        ((False, False), 2, None, True),
+        ((False, False), 2, OSError("Operation not permitted"), False),
+        ((True, True), 2, None, True),
+    ],
+    ids=[
+        "cross_filesystem_windows_to_linux",
+        "cross_filesystem_linux_to_windows",
+        "wsl1_ntfs_success",
+        "wsl1_ntfs_failure",
+        "wsl2_success",
+        "wsl2_failure",
+        "both_windows_paths_non_wsl1",
+    ],
+)
+def test_handle_wsl_symlink(monkeypatch, windows_paths, wsl_version, symlink_error, expected):
+    """Cross-filesystem links are refused; otherwise the result follows symlink_to()."""
+    platform_utils._IS_WSL = True
+    platform_utils._WSL_VERSION = wsl_version
 
-        source = MagicMock()
-        target = MagicMock()
-        target.symlink_to.return_value = None  # Success
+    source = MagicMock()
+    target = MagicMock()
+    target.symlink_to.side_effect = symlink_error
 
-        with patch("platform_utils.is_windows_path", return_value=True):
-            with patch("platform_utils.get_wsl_version", return_value=1):
-                result = handle_wsl_symlink(source, target)
+    monkeypatch.setattr(platform_utils, "is_windows_path", _returns(*windows_paths))
+    result = handle_wsl_symlink(source, target)
 
-        assert result is True
+    assert result is expected
+    if windows_paths[0] == windows_paths[1]:
         target.symlink_to.assert_called_once_with(source)
-        reset_platform_utils_cache()
-
-    def test_handle_wsl_symlink_wsl1_ntfs_failure(self):
-        """WSL1 on NTFS symlink failure."""
-        reset_platform_utils_cache()
-        platform_utils._IS_WSL = True
-        platform_utils._WSL_VERSION = 1
-
-        source = MagicMock()
-        target = MagicMock()
-        target.symlink_to.side_effect = OSError("Permission denied")
-
-        with patch("platform_utils.is_windows_path", return_value=True):
-            with patch("platform_utils.get_wsl_version", return_value=1):
-                result = handle_wsl_symlink(source, target)
-
-        assert result is False
-        reset_platform_utils_cache()
-
-    def test_handle_wsl_symlink_wsl2_success(self):
-        """WSL2 or Linux filesystem symlink success."""
-        reset_platform_utils_cache()
-        platform_utils._IS_WSL = True
-        platform_utils._WSL_VERSION = 2
+    else:
+        target.symlink_to.assert_not_called()
 
-        source = MagicMock()
-        target = MagicMock()
-        target.symlink_to.return_value = None
 
-        with patch("platform_utils.is_windows_path", return_value=False):
-            with patch("platform_utils.get_wsl_version", return_value=2):
-                result = handle_wsl_symlink(source, target)
-
-        assert result is True
-        target.symlink_to.assert_called_once_with(source)
-        reset_platform_utils_cache()
-
-    def test_handle_wsl_symlink_wsl2_failure(self):
-        """WSL2 or Linux filesystem symlink failure."""
-        reset_platform_utils_cache()
-        platform_utils._IS_WSL = True
-        platform_utils._WSL_VERSION = 2
+def test_handle_wsl_symlink_same_filesystem_linux(shared_src, tmp_path, monkeypatch):
+    """Same-filesystem Linux symlinks attempt creation."""
+    platform_utils._IS_WSL = False
+    platform_utils._WSL_VERSION = None
 
-        source = MagicMock()
-        target = MagicMock()
-        target.symlink_to.side_effect = OSError("Operation not permitted")
+    source = shared_src
+    target = tmp_path / "link.txt"
 
-        with patch("platform_utils.is_windows_path", return_value=False):
-            with patch("platform_utils.get_wsl_version", return_value=2):
-                result = handle_wsl_symlink(source, target)
+    monkeypatch.setattr(platform_utils, "is_windows_path", lambda path: False)
+    result = handle_wsl_symlink(source, target)
 
-        assert result is False
-        reset_platform_utils_cache()
-
-    def test_handle_wsl_symlink_same_filesystem_linux(self, tmp_path):
-        """Same-filesystem Linux symlinks attempt creation."""
-        reset_platform_utils_cache()
-        platform_utils._IS_WSL = False
-        platform_utils._WSL_VERSION = None
-
-        source = tmp_path / "source.txt"
-        source.write_text("content")
-        target = tmp_path / "link.txt"
-
-        with patch("platform_utils.is_windows_path", return_value=False):
-            with patch("platform_utils.get_wsl_version", return_value=None):
-                result = handle_wsl_symlink(source, target)
-
-        # May succeed or fail depending on permissions
-        assert isinstance(result, bool)
-        reset_platform_utils_cache()
-
-    def test_handle_wsl_symlink_both_windows_paths_non_wsl1(self):
-        """Both Windows paths with non-WSL1 version."""
-        reset_platform_utils_cache()
-        platform_utils._IS_WSL = True
-        platform_utils._WSL_VERSION = 2
-
-        source = MagicMock()
-        target = MagicMock()
-        target.symlink_to.return_value = None
-
-        with patch("platform_utils.is_windows_path", return_value=True):
-            with patch("platform_utils.get_wsl_version", return_value=2):
-                result = handle_wsl_symlink(source, target)
-
-        assert result is True
-        reset_platform_utils_cache()
+    # May succeed or fail depending on permissions
+    assert isinstance(result, bool)
@@ -10,8 +10,11 @@ import json
 import threading
 import time
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from unittest.mock import patch
+from unittest.mock import call, patch
+
+import safe_io
 
 from safe_io import (
     safe_write_json,
@@ -21,6 +24,17 @@ from safe_io import (
 )
 
 
+def _raise_oserror(*args, **kwargs):
+    raise OSError("operation not permitted")
+
+
+@pytest.fixture(scope="module")
+def executor():
+    """Worker threads shared by the concurrency tests, started once per module."""
+    with ThreadPoolExecutor(max_workers=10) as ex:
+        yield ex
+
+
 class TestAtomicWrites:
     """Test atomic write guarantees."""
 
@@ -51,6 +65,134 @@ class TestAtomicWrites:
         backup_data = json.loads(backups[0].read_text())
         assert backup_data == {"version": 1}
 
+    def test_backup_falls_back_to_copy_without_hardlinks(self, tmp_path):
+        """Filesystems without hardlink support still get a .bak copy."""
+        path = tmp_path / "test.json"
+        safe_write_json(path, {"version": 1})
+
+        with patch("safe_io.os.link", side_effect=OSError("Links not supported")):
+            assert safe_write_json(path, {"version": 2})
+
+        backup_path = tmp_path / "test.json.bak"
+        assert json.loads(backup_path.read_text()) == {"version": 1}
+        assert not list(tmp_path.glob("*.link"))
+
+    def test_copied_backup_leaves_other_links_alone(self, tmp_path):
+        """A copied backup replaces the old .bak instead of rewriting its shared inode."""
+        import os
+
+        path = tmp_path / "test.txt"
+        path.write_text("v1")
+        os.link(path, tmp_path / "mine.txt")
+
+        assert safe_write_text(path, "v2")  # .bak is now a hardlink to the v1 inode
+        with patch("safe_io.os.link", side_effect=OSError("Links not supported")):
+            assert safe_write_text(path, "v3")
+
+        assert (tmp_path / "test.txt.bak").read_text() == "v2"
+        assert (tmp_path / "mine.txt").read_text() == "v1"
+
+    def test_failed_backup_rename_removes_staging_link(self, tmp_path):
+        """If the hardlinked backup cannot be renamed into place, the staging link is removed."""
+        import os
+
+        path = tmp_path / "test.txt"
+        path.write_text("content")
+        real_replace = os.replace
+
+        def refuse_link_rename(src, dst):
+            if str(src).endswith(".link"):
+                raise OSError("rename refused")
+            real_replace(src, dst)
+
+        with patch("safe_io.os.replace", side_effect=refuse_link_rename):
+            safe_io._backup_file(path, tmp_path / "test.txt.bak")
+
+        assert (tmp_path / "test.txt.bak").read_text() == "content"
+        assert sorted(p.name for p in tmp_path.iterdir()) == ["test.txt", "test.txt.bak"]
+
+    def test_short_writes_are_completed(self, tmp_path):
+        """A temp-file os.write() that accepts only part of the buffer is retried."""
+        import os
+
+        real_write = os.write
+        path = tmp_path / "test.json"
+        data = {"key": "value " * 50, "unicode": "héllo"}
+
+        with patch("safe_io.os.write", side_effect=lambda fd, buf: real_write(fd, buf[:7])):
+            assert safe_write_json(path, data)
+
+        assert json.loads(path.read_text(encoding="utf-8")) == data
+
+    def test_fast_copy_keeps_content_and_mode(self, tmp_path):
+        """_fast_copy reproduces the bytes and permission bits of the source."""
+        src = tmp_path / "src.txt"
+        dst = tmp_path / "dst.txt"
+        src.write_bytes(b"x" * 70000)
+        src.chmod(0o640)
+        dst.write_bytes(b"stale, longer than nothing")
+
+        safe_io._fast_copy(src, dst)
+
+        assert dst.read_bytes() == src.read_bytes()
+        if sys.platform != "win32":
+            assert dst.stat().st_mode & 0o777 == 0o640
+
+    @pytest.mark.skipif(not hasattr(safe_io.os, "copy_file_range"), reason="copy_file_range not available")
+    def test_fast_copy_falls_back_to_copy2(self, tmp_path):
+        """An unsupported copy_file_range() pair is copied with shutil.copy2."""
+        import errno
+
+        src = tmp_path / "src.txt"
+        src.write_text("content")
+
+        with patch("safe_io.os.copy_file_range", side_effect=OSError(errno.EXDEV, "cross-device")):
+            safe_io._fast_copy(src, tmp_path / "dst.txt")
+
+        assert (tmp_path / "dst.txt").read_text() == "content"
+
+    @pytest.mark.skipif(not safe_io._O_TMPFILE, reason="O_TMPFILE not available")
+    def test_unnamed_tempfile_skips_mkstemp(self, tmp_path):
+        """On Linux the temp file starts unnamed, so no named temp file is created."""
+        path = tmp_path / "test.json"
+
+        with patch("safe_io._create_tempfile", side_effect=AssertionError("named temp file")):
+            assert safe_write_json(path, {"a": 1})
+            assert safe_write_text(tmp_path / "test.txt", "content")
+
+        assert json.loads(path.read_text()) == {"a": 1}
+        assert (tmp_path / "test.txt").read_text() == "content"
+        assert not list(tmp_path.glob("*.tmp"))
+
+    @pytest.mark.skipif(not safe_io._O_TMPFILE, reason="O_TMPFILE not available")
+    def test_unnamed_tempfile_keeps_unrelated_tmp_file(self, tmp_path):
+        """A user file named `<target>.tmp` is neither replaced nor removed."""
+        path = tmp_path / "test.txt"
+        (tmp_path / "test.txt.tmp").write_text("user data")
+
+        assert safe_write_text(path, "content")
+
+        assert path.read_text() == "content"
+        assert (tmp_path / "test.txt.tmp").read_text() == "user data"
+
+    def test_tempfile_falls_back_when_unlinkable(self, tmp_path):
+        """Without O_TMPFILE or a usable /proc link, writes use a named temp file."""
+        path = tmp_path / "test.json"
+
+        with (
+            patch("safe_io._O_TMPFILE", 0),
+            patch("safe_io._create_tempfile", wraps=safe_io._create_tempfile) as mock_create,
+        ):
+            assert safe_write_json(path, {"a": 1})
+            mock_create.assert_called_once_with(tmp_path, "test.json.")
+        with patch("safe_io.os.link", side_effect=OSError("hidepid")):
+            assert safe_write_json(path, {"a": 2})
+            assert safe_write_text(tmp_path / "test.txt", "content")
+
+        assert json.loads(path.read_text()) == {"a": 2}
+        assert (tmp_path / "test.txt").read_text() == "content"
+        assert not list(tmp_path.glob("*.tmp"))
+
     def test_write_creates_parent_directories(self, tmp_path):
         """safe_write_json creates parent directories if needed."""
         path = tmp_path / "deep" / "nested" / "dir" / "test.json"
@@ -68,6 +210,22 @@ class TestAtomicWrites:
         assert safe_write_text(path, content)
         assert path.read_text() == content
 
+    @pytest.mark.skipif(not hasattr(safe_io.os, "posix_fadvise"), reason="posix_fadvise not available")
+    def test_write_text_drops_page_cache(self, tmp_path):
+        """safe_write_text advises the kernel to drop the synced temp file pages."""
+        import os
+
+        path = tmp_path / "test.txt"
+        with patch("safe_io.os.posix_fadvise") as mock_fadvise:
+            assert safe_write_text(path, "content")
+            mock_fadvise.assert_called_once()
+            assert mock_fadvise.call_args.args[1:] == (0, 0, os.POSIX_FADV_DONTNEED)
+
+            assert safe_write_json(tmp_path / "test.json", {"a": 1})
+            mock_fadvise.assert_called_once()
+
+        assert path.read_text() == "content"
+
     def test_write_text_backup_created(self, tmp_path):
         """Updating text file creates backup."""
         path = tmp_path / "test.md"
@@ -87,7 +245,7 @@ class TestAtomicWrites:
 class TestConcurrentAccess:
     """Test locking prevents races."""
 
-    def test_concurrent_updates_no_lost_writes(self, tmp_path):
+    def test_concurrent_updates_no_lost_writes(self, tmp_path, executor):
         """Concurrent updates don't lose writes due to locking."""
         path = tmp_path / "counter.json"
         safe_write_json(path, {"count": 0})
@@ -104,17 +262,13 @@ class TestConcurrentAccess:
 
                 safe_update_json(path, updater, default={"count": 0})
 
-        threads = [threading.Thread(target=increment) for _ in range(num_threads)]
-        for t in threads:
-            t.start()
-        for t in threads:
-            t.join()
+        list(executor.map(lambda _: increment(), range(num_threads)))
 
         result = safe_load_json(path)
         expected_count = num_threads * increments_per_thread
         assert result["count"] == expected_count, f"Lost updates: expected {expected_count}, got {result['count']}"
 
-    def test_concurrent_text_writes_no_corruption(self, tmp_path):
+    def test_concurrent_text_writes_no_corruption(self, tmp_path, executor):
         """Concurrent text writes don't corrupt file."""
         path = tmp_path / "content.txt"
         safe_write_text(path, "initial")
@@ -127,11 +281,7 @@ class TestConcurrentAccess:
             success = safe_write_text(path, content)
             results.append((thread_id, success))
 
-        threads = [threading.Thread(target=write_content, args=(i,)) for i in range(num_threads)]
-        for t in threads:
-            t.start()
-        for t in threads:
-            t.join()
+        list(executor.map(write_content, range(num_threads)))
 
         # All writes should succeed
         assert all(success for _, success in results)
@@ -177,6 +327,26 @@ class TestPreserveMode:
         mode = os.stat(script).st_mode
         assert mode & stat.S_IXUSR, "Executable bit was lost after atomic write"
 
+    def test_preserve_mode_survives_link_fallback(self, tmp_path, is_posix, monkeypatch):
+        """The mode is kept when the O_TMPFILE inode has to be copied instead of linked."""
+        if not is_posix:
+            pytest.skip("chmod semantics are different on Windows")
+
+        import stat
+        import os
+
+        script = tmp_path / "script.sh"
+        script.write_text("#!/bin/sh\necho hello\n")
+        os.chmod(script, 0o755)
+
+        # /proc/self/fd cannot be linked through (hidepid, sandboxes): the copy path runs
+        monkeypatch.setattr(safe_io.os, "link", _raise_oserror, raising=False)
+
+        assert safe_write_text(script, "#!/bin/sh\necho updated\n", preserve_mode=True)
+
+        assert script.read_text() == "#!/bin/sh\necho updated\n"
+        assert stat.S_IMODE(os.stat(script).st_mode) == 0o755
+
     def test_preserve_mode_false_uses_default(self, tmp_path, is_posix):
         """Atomic write with preserve_mode=False uses default permissions."""
         if not is_posix:
@@ -194,12 +364,41 @@ class TestPreserveMode:
         # Atomic write with preserve_mode=False (default)
         safe_write_text(script, "#!/bin/sh\necho updated\n", preserve_mode=False)
 
-        # tempfile.mkstemp creates files with 0o600 (no execute) on POSIX
+        # Temp files are created 0o600 (no execute) on POSIX
         # After atomic replace, execute bits should be cleared
         mode = os.stat(script).st_mode
         assert not (mode & stat.S_IXUSR), "Execute bit should be cleared with preserve_mode=False"
 
 
+class TestDeferredDirSync:
+    """Tests for batching the parent-directory fsync."""
+
+    def test_writes_defer_directory_fsync(self, tmp_path):
+        """durable=False writes queue one directory fsync for flush_pending()."""
+        safe_io.flush_pending()  # drain writes left by earlier tests
+        with patch("safe_io._fsync_dir_if_possible") as mock_dir_sync:
+            for i in range(5):
+                assert safe_update_json(tmp_path / "counter.json", lambda d: {"n": i}, durable=False)
+            assert safe_write_text(tmp_path / "note.txt", "content", durable=False)
+            mock_dir_sync.assert_not_called()
+
+            safe_io.flush_pending()
+            mock_dir_sync.assert_called_once_with(tmp_path)
+
+            safe_io.flush_pending()
+            mock_dir_sync.assert_called_once()
+
+    def test_writes_sync_immediately_by_default(self, tmp_path):
+        """Writes fsync the directory before returning unless durable=False."""
+        safe_io.flush_pending()  # drain writes left by earlier tests
+        with patch("safe_io._fsync_dir_if_possible") as mock_dir_sync:
+            assert safe_write_json(tmp_path / "a.json", {"a": 1})
+            mock_dir_sync.assert_called_once_with(tmp_path)
+
+            safe_io.flush_pending()
+            mock_dir_sync.assert_called_once()
+
+
 class TestSafeLoadJson:
     """Test safe_load_json behavior."""
 
@@ -226,6 +425,14 @@ class TestSafeLoadJson:
         result = safe_load_json(path)
         assert result is None
 
+    def test_load_large_file(self, tmp_path):
+        """Large files with non-ASCII text load intact."""
+        path = tmp_path / "large.json"
+        data = {"items": [{"id": i, "name": f"item-{i}"} for i in range(5000)], "note": "héllo"}
+        path.write_text(json.dumps(data), encoding="utf-8")
+
+        assert safe_load_json(path) == data
+
 
 class TestSafeUpdateJson:
     """Test safe_update_json behavior."""
@@ -254,6 +461,19 @@ class TestSafeUpdateJson:
 
         safe_update_json(path, set_field, default={"count": 0})
 
+    def test_update_creates_parent_once(self, tmp_path):
+        """Read-modify-write in a new directory creates it once, under the lock."""
+        import os
+
+        path = tmp_path / "nested" / "dir" / "data.json"
+
+        with patch("safe_io.os.makedirs", wraps=os.makedirs) as mock_makedirs:
+            assert safe_update_json(path, lambda d: {"count": d["count"] + 1}, default={"count": 0})
+            # (os.makedirs recurses into itself for the missing ancestors)
+            assert mock_makedirs.call_args_list.count(call(path.parent, exist_ok=True)) == 1
+
+        assert safe_load_json(path) == {"count": 1}
+
 
 class TestSafeIoErrors:
     """Tests for error conditions in safe_io."""
@@ -296,7 +516,7 @@ class TestSafeIoErrors:
         result = safe_write_json(path, {"a": 1})
         assert result is False
 
-    @patch("safe_io.tempfile.mkstemp")
+    @patch("safe_io._mkstemp_fast")
     def test_temp_file_creation_failure(self, mock_mkstemp, tmp_path):
         """Test failure during temp file creation."""
         mock_mkstemp.side_effect = OSError("Disk full")
@@ -384,6 +604,67 @@ class TestIsValidJsonFile:
 
         assert _is_valid_json_file(path) is False
 
+    def test_non_json_prefix_rejected_without_parsing(self, tmp_path):
+        """A file that cannot start a JSON value is rejected before json.loads."""
+        from safe_io import _is_valid_json_file
+
+        path = tmp_path / "text.json"
+        path.write_text("<html>" * 1000)
+
+        with patch("safe_io.json.loads", side_effect=AssertionError("parsed")):
+            assert _is_valid_json_file(path) is False
+
+    def test_leading_whitespace_is_valid(self, tmp_path):
+        """Whitespace before the JSON value does not make the file invalid."""
+        from safe_io import _is_valid_json_file
+
+        path = tmp_path / "padded.json"
+        path.write_text(' \n\t [1, "two"]\n')
+
+        assert _is_valid_json_file(path) is True
+
+    def test_freshly_loaded_file_is_not_reparsed(self, tmp_path):
+        """A file just read by safe_load_json is validated from its stat alone."""
+        from safe_io import _is_valid_json_file
+
+        path = tmp_path / "cached.json"
+        path.write_text('{"cached": true}')
+        assert safe_load_json(path) == {"cached": True}
+
+        with patch("safe_io.json.loads", side_effect=AssertionError("re-parsed")):
+            assert _is_valid_json_file(path) is True
+
+    def test_rewritten_file_is_reparsed(self, tmp_path):
+        """Replacing the file after a load invalidates the cached result."""
+        from safe_io import _is_valid_json_file
+
+        path = tmp_path / "cached.json"
+        path.write_text('{"cached": true}')
+        safe_load_json(path)
+
+        tmp = tmp_path / "replacement.json"
+        tmp.write_text("not json")
+        tmp.replace(path)
+
+        assert _is_valid_json_file(path) is False
+
+    def test_validity_cache_is_bounded(self, tmp_path, monkeypatch):
+        """Only the most recently seen paths stay cached."""
+        from safe_io import _is_valid_json_file
+
+        monkeypatch.setattr(safe_io, "_valid_json_stats", {})
+        monkeypatch.setattr(safe_io, "_VALID_JSON_CACHE_MAX", 2)
+        paths = [tmp_path / f"{name}.json" for name in "abc"]
+        for path in paths:
+            path.write_text("{}")
+
+        safe_load_json(paths[0])
+        safe_load_json(paths[1])
+        assert _is_valid_json_file(paths[0])  # a.json is now most recent
+        safe_load_json(paths[2])
+
+        assert list(safe_io._valid_json_stats) == [str(paths[0]), str(paths[2])]
+
 
 class TestUpdateFunctionErrors:
     """Tests for update function error handling."""
@@ -438,6 +719,67 @@ class TestFileLock:
         with file_lock(lock_path, timeout_s=1.0):
             assert lock_path.exists()
 
+    def test_file_lock_waits_in_process_before_os_lock(self, tmp_path):
+        """A second thread times out on the in-process lock without opening the lock file."""
+        from safe_io import file_lock, FileLockTimeoutError
+
+        lock_path = tmp_path / "test.lock"
+        outcome = []
+
+        def contender():
+            with patch("safe_io.open", side_effect=AssertionError("opened"), create=True):
+                try:
+                    with file_lock(lock_path, timeout_s=0.05):
+                        outcome.append("acquired")
+                except FileLockTimeoutError:
+                    outcome.append("timeout")
+
+        with file_lock(lock_path, timeout_s=1.0):
+            t = threading.Thread(target=contender)
+            t.start()
+            t.join()
+
+        assert outcome == ["timeout"]
+
+    def test_file_lock_is_reentrant_per_thread(self, tmp_path):
+        """A thread holding a lock path can take it again without deadlocking."""
+        from safe_io import file_lock
+
+        path = tmp_path / "data.json"
+
+        def nested_update(data):
+            # Re-enters the same lock from inside safe_update_json
+            assert safe_write_json(tmp_path / "data.json", {"nested": True}, timeout_s=0.5)
+            return {"outer": True}
+
+        with file_lock(tmp_path / "test.lock", timeout_s=0.5):
+            with file_lock(tmp_path / "test.lock", timeout_s=0.5):
+                pass
+        assert safe_update_json(path, nested_update, default={}, timeout_s=0.5)
+        assert safe_load_json(path) == {"outer": True}
+
+    @pytest.mark.skipif(sys.platform == "win32", reason="fcntl/SIGALRM are POSIX-only")
+    def test_contended_lock_blocks_under_timer(self, tmp_path):
+        """On the main thread a held OS lock is waited out in flock(), not a sleep loop."""
+        import fcntl
+        import signal
+        from safe_io import file_lock, FileLockTimeoutError
+
+        lock_path = tmp_path / "held.lock"
+        with open(lock_path, "a+") as holder:
+            # flock() locks belong to the open file description, so this
+            # second descriptor contends even within one process.
+            fcntl.flock(holder.fileno(), fcntl.LOCK_EX)
+            with patch("safe_io.time.sleep", side_effect=AssertionError("polled")):
+                with pytest.raises(FileLockTimeoutError):
+                    with file_lock(lock_path, timeout_s=0.05):
+                        pass
+
+        assert signal.getsignal(signal.SIGALRM) == signal.SIG_DFL
+        assert signal.getitimer(signal.ITIMER_REAL) == (0.0, 0.0)
+        with file_lock(lock_path, timeout_s=1.0):
+            pass
+
 
 class TestWriteJsonOptions:
     """Tests for write options."""
@@ -470,6 +812,16 @@ class TestWriteJsonOptions:
         content = path.read_text()
         assert "    " in content  # 4-space indent
 
+    @pytest.mark.parametrize("indent", [0, None])
+    def test_write_json_compact_without_indent(self, tmp_path, indent):
+        """indent=0/None writes compact JSON with no separator spaces."""
+        path = tmp_path / "data.json"
+        data = {"a": [1, 2], "b": {"c": "d e"}}
+        safe_write_json(path, data, indent=indent)
+
+        assert path.read_text() == '{"a":[1,2],"b":{"c":"d e"}}'
+        assert safe_load_json(path) == data
+
 
 class TestSafeUpdateJsonTimeout:
     """Tests for lock timeout in safe_update_json."""
@@ -507,7 +859,7 @@ class TestSafeWriteTextErrorHandling:
         result = safe_write_text(path, "content")
         assert result is False
 
-    @patch("safe_io.tempfile.mkstemp")
+    @patch("safe_io._mkstemp_fast")
     def test_safe_write_text_temp_creation_failure(self, mock_mkstemp, tmp_path):
         """safe_write_text handles temp file creation failure."""
         mock_mkstemp.side_effect = OSError("Disk full")
@@ -533,10 +885,10 @@ class TestSafeWriteTextErrorHandling:
 
         def stat_side_effect():
             call_count[0] += 1
-            # First call is for preserve_mode capture - raise error
+            # First call captures the mode and size together - raise error
             if call_count[0] == 1:
                 raise OSError("Permission denied")
-            # Subsequent calls (like for st_size check) return real stat
+            # Any later calls return real stat
             return real_stat
 
         # We need to mock the stat on the specific path instance used in safe_write_text
@@ -551,31 +903,56 @@ class TestSafeWriteTextErrorHandling:
         path = tmp_path / "test.txt"
         path.write_text("original content")
 
-        # Mock shutil.copy2 to fail
-        with patch("safe_io.shutil.copy2", side_effect=OSError("Copy failed")):
+        # Make both the hardlink and the copy fallback fail
+        with (
+            patch("safe_io.os.link", side_effect=OSError("Link failed")),
+            patch("safe_io._fast_copy", side_effect=OSError("Copy failed")),
+        ):
             result = safe_write_text(path, "new content")
             assert result is True
             assert path.read_text() == "new content"
 
+    def test_failed_text_write_leaves_backup_alone(self, tmp_path):
+        """The .bak is only refreshed once the new content has been written."""
+        path = tmp_path / "test.txt"
+        path.write_text("original content")
+
+        result = safe_write_text(path, "caf\u00e9", encoding="ascii")
+
+        assert result is False
+        assert path.read_text() == "original content"
+        assert not (tmp_path / "test.txt.bak").exists()
+
+    @pytest.mark.skipif(not hasattr(safe_io.os, "fchmod"), reason="os.fchmod not available")
     def test_chmod_failure_after_write(self, tmp_path):
         """safe_write_text handles chmod failure gracefully."""
         import os
 
         path = tmp_path / "script.sh"
         path.write_text("#!/bin/sh\n")
+        os.chmod(path, 0o755)
 
-        # Mock os.chmod to fail during mode restoration
-        original_chmod = os.chmod
-
-        def failing_chmod(p, mode):
-            if str(p) == str(path):
-                raise OSError("chmod failed")
-            return original_chmod(p, mode)
-
-        with patch("safe_io.os.chmod", side_effect=failing_chmod):
+        # Mock os.fchmod to fail during mode restoration on the temp file
+        with patch("safe_io.os.fchmod", side_effect=OSError("chmod failed")) as mock_fchmod:
             # Should succeed even if chmod fails (best-effort mode restoration)
             result = safe_write_text(path, "#!/bin/sh\nupdated\n", preserve_mode=True)
             assert result is True
+            mock_fchmod.assert_called_once()
+
+    @pytest.mark.skipif(not hasattr(safe_io.os, "fchmod"), reason="os.fchmod not available")
+    def test_matching_mode_skips_chmod(self, tmp_path):
+        """No fchmod is issued when the temp file already has the original mode."""
+        import os
+
+        path = tmp_path / "private.txt"
+        path.write_text("secret\n")
+        os.chmod(path, 0o600)
+
+        with patch("safe_io.os.fchmod") as mock_fchmod:
+            assert safe_write_text(path, "updated\n", preserve_mode=True)
+            mock_fchmod.assert_not_called()
+
+        assert path.stat().st_mode & 0o777 == 0o600
 
 
 class TestTempFileCleanup:
@@ -674,9 +1051,8 @@ class TestSafeIoCoverage:
         path.write_text("content")
 
         # We need to mock path.stat() to raise OSError ONLY during the size check
-        # path.stat() is called:
-        # 1. capture mode (if preserve_mode=True) - handled in other test
-        # 2. check non-empty (st_size > 0)
+        # path.stat() is called once, inside the lock, for both the
+        # non-empty check (st_size > 0) and the preserve_mode capture
 
         real_stat = path.stat()
 
@@ -684,7 +1060,8 @@ class TestSafeIoCoverage:
             # Simply always raise OSError implies we can't check size
             # Code:
             # try:
-            #    should_backup = path.stat().st_size > 0
+            #    st = path.stat()
+            #    should_backup = create_backup and st.st_size > 0
             # except OSError: pass
             raise OSError("Stat failed")
 
@@ -6,11 +6,14 @@ Verifies symlink handling and resource limits in scanning.
 """
 
 import os
+import shutil
+import subprocess
 import sys
 import pytest
 import tempfile
 import time
 from pathlib import Path
+from types import SimpleNamespace
 from unittest.mock import patch, MagicMock
 
 # Import modules under test
@@ -19,39 +22,74 @@ from scan_repo import RepoScanner, MAX_ARTIFACTS, MAX_SCAN_TIME
 DOC_CLAIMS = ["security_resource_limits"]
 
 
+@pytest.fixture(scope="session")
+def scan_repo_source():
+    """Source text of RepoScanner, read and tokenized once for every meta-test."""
+    import inspect
+
+    return inspect.getsource(RepoScanner)
+
+
+def _build_tree(root, files):
+    """
+    Create files under root from {relative path: text}, making each parent directory once.
+
+    A path ending in "/" creates just that (empty) directory.
+    """
+    made = set()
+    for rel, content in files.items():
+        path = os.path.join(root, *rel.split("/"))
+        parent = path if rel.endswith("/") else os.path.dirname(path)
+        if parent not in made:
+            os.makedirs(parent, exist_ok=True)
+            made.add(parent)
+        if not rel.endswith("/"):
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(content)
+    return root
+
+
+@pytest.fixture(scope="module")
+def symlink_tree(tmp_path_factory):
+    """
+    Read-only tree shared by the symlink tests, built once per module.
+
+    base/
+      scan_root/.claude/skills/legit/SKILL.md
+      scan_root/.claude/skills/sneaky -> outside
+      linked_repo/.claude/skills/my-skill/SKILL.md -> real_skill.md
+      real_skill.md
+      main/normal.txt
+      main/link -> outside
+      outside/secret.txt
+    """
+    base = tmp_path_factory.mktemp("symlinks")
+    _build_tree(
+        base,
+        {
+            "outside/secret.txt": "SECRET DATA",
+            "scan_root/.claude/skills/legit/SKILL.md": "---\nname: legit\n---\n# Legit",
+            "linked_repo/.claude/skills/my-skill/": None,
+            "real_skill.md": "---\nname: test\n---\n# Test",
+            "main/normal.txt": "normal",
+        },
+    )
+    outside_dir = base / "outside"
+    (base / "scan_root" / ".claude" / "skills" / "sneaky").symlink_to(outside_dir)
+    (base / "linked_repo" / ".claude" / "skills" / "my-skill" / "SKILL.md").symlink_to(base / "real_skill.md")
+    (base / "main" / "link").symlink_to(outside_dir)
+
+    return SimpleNamespace(scan_root=base / "scan_root", linked_repo=base / "linked_repo", main_dir=base / "main")
+
+
 class TestSymlinkNotFollowed:
     """Tests that symlinks are not followed during scan."""
 
     @pytest.mark.skipif(sys.platform == "win32", reason="Symlinks require admin on Windows")
-    def test_symlink_pointing_outside_skipped(self, tmp_path):
+    def test_symlink_pointing_outside_skipped(self, symlink_tree):
         """Symlinks pointing outside scan root are skipped."""
-        # Create structure:
-        #   scan_root/
-        #     .claude/
-        #       skills/
-        #         legit/SKILL.md
-        #         sneaky -> /etc (symlink to outside)
-        #   outside/
-        #     secret.txt
-
-        scan_root = tmp_path / "scan_root"
-        outside_dir = tmp_path / "outside"
-
-        scan_root.mkdir()
-        outside_dir.mkdir()
-
-        # Create legit skill
-        legit_skill = scan_root / ".claude" / "skills" / "legit"
-        legit_skill.mkdir(parents=True)
-        (legit_skill / "SKILL.md").write_text("---\nname: legit\n---\n# Legit")
-
-        # Create outside content
-        secret_file = outside_dir / "secret.txt"
-        secret_file.write_text("SECRET DATA")
-
-        # Create sneaky symlink to outside
-        sneaky_link = scan_root / ".claude" / "skills" / "sneaky"
-        sneaky_link.symlink_to(outside_dir)
+        # scan_root/.claude/skills/ holds legit/SKILL.md and sneaky -> outside/
+        scan_root = symlink_tree.scan_root
 
         # Scan should find only the legit skill, not follow symlink
         scanner = RepoScanner(str(scan_root), verbose=False)
@@ -71,31 +109,134 @@ class TestSymlinkNotFollowed:
         assert not any("secret" in p for p in skill_paths)
 
     @pytest.mark.skipif(sys.platform == "win32", reason="Symlinks require admin on Windows")
-    def test_symlink_skill_file_skipped(self, tmp_path):
+    def test_symlink_skill_file_skipped(self, symlink_tree):
         """Symlinked SKILL.md files are skipped."""
+        # linked_repo/.claude/skills/my-skill/SKILL.md is a symlink to a file outside the repo
+        scan_root = symlink_tree.linked_repo
+
+        scanner = RepoScanner(str(scan_root), verbose=True)
+        scanner.repo_path = scan_root
+        scanner.start_time = time.monotonic()
+
+        report = {"detected_artifacts": [], "truncated": False, "truncation_reason": None}
+
+        scanner._scan_skills(report)
+
+        # Symlinked skill should be skipped
+        assert len(report["detected_artifacts"]) == 0
+
+    def test_skill_walk_matches_glob_order(self, tmp_path):
+        """The scandir walk finds the same SKILL.md files, in the same order, as glob."""
         scan_root = tmp_path / "repo"
-        scan_root.mkdir()
+        skills_dir = scan_root / "skills"
+        skill = "---\nname: x\n---\n"
+        _build_tree(
+            skills_dir,
+            {
+                "a/SKILL.md": skill,
+                "b/nested/SKILL.md": skill,
+                "b/SKILL.md": skill,
+                "c/deeper/still/SKILL.md": skill,
+                "d/no-skill/": None,
+                "SKILL.md": "---\nname: top\n---\n",
+            },
+        )
+
+        scanner = RepoScanner(str(scan_root))
+        scanner.repo_path = scan_root
 
-        skills_dir = scan_root / ".claude" / "skills" / "my-skill"
-        skills_dir.mkdir(parents=True)
+        expected = [str(p.relative_to(scan_root)) for p in scan_root.glob("skills/**/SKILL.md")]
+        assert list(scanner._find_skill_files(skills_dir)) == expected
+        assert list(scanner._find_skill_files(scan_root / "missing")) == []
 
-        # Create actual skill file elsewhere
-        real_skill = tmp_path / "real_skill.md"
-        real_skill.write_text("---\nname: test\n---\n# Test")
+    @pytest.mark.skipif(sys.platform == "win32", reason="Symlinks require admin on Windows")
+    def test_symlinked_skills_root_not_walked(self, tmp_path):
+        """A symlinked skills directory is judged by lstat on the unresolved path and skipped."""
+        _build_tree(tmp_path, {"elsewhere/hidden/SKILL.md": "---\nname: hidden\n---\n", "repo/.claude/": None})
+        real_skills = tmp_path / "elsewhere"
+        scan_root = tmp_path / "repo"
+        (scan_root / ".claude" / "skills").symlink_to(real_skills, target_is_directory=True)
 
-        # Symlink the SKILL.md
-        (skills_dir / "SKILL.md").symlink_to(real_skill)
+        scanner = RepoScanner(str(scan_root))
+        scanner.repo_path = scan_root
+        scanner.start_time = time.monotonic()
+        report = {"detected_artifacts": [], "truncated": False, "truncation_reason": None}
 
-        scanner = RepoScanner(str(scan_root), verbose=True)
+        scanner._scan_skills(report)
+
+        # Resolving first would have hidden the link: the resolved path is never a symlink
+        assert (scan_root / ".claude" / "skills").resolve().is_symlink() is False
+        assert report["detected_artifacts"] == []
+
+    def test_is_symlink_fast_fails_closed(self, tmp_path):
+        """Paths that cannot be examined count as symlinks."""
+        from scan_repo import _is_symlink_fast
+
+        assert _is_symlink_fast(tmp_path / "missing") is True
+        assert _is_symlink_fast(tmp_path) is False
+
+    @pytest.mark.skipif(shutil.which("git") is None, reason="git not available")
+    def test_git_listing_skips_ignored_trees(self, tmp_path):
+        """Inside a git work tree, ignored directories are never enumerated."""
+        scan_root = tmp_path / "repo"
+        _build_tree(
+            scan_root,
+            {
+                "skills/visible/SKILL.md": "---\nname: x\n---\n",
+                "skills/node_modules/pkg/SKILL.md": "---\nname: x\n---\n",
+                ".gitignore": "node_modules/\n",
+            },
+        )
+        subprocess.run(["git", "init", "-q", str(scan_root)], check=True)
+
+        scanner = RepoScanner(str(scan_root))
         scanner.repo_path = scan_root
         scanner.start_time = time.monotonic()
+        report = {"detected_artifacts": [], "truncated": False, "truncation_reason": None}
 
+        scanner._scan_skills(report)
+
+        assert scanner._git_visible_files() is not None
+        assert [a["source_path"] for a in report["detected_artifacts"]] == [
+            os.path.join("skills", "visible", "SKILL.md")
+        ]
+
+    @pytest.mark.skipif(shutil.which("git") is None, reason="git not available")
+    @pytest.mark.parametrize("ignored", [".claude/", "skills/"])
+    def test_gitignored_skill_roots_still_scanned(self, tmp_path, ignored):
+        """Skills under a gitignored .claude/ or skills/ root are found, as without git."""
+        scan_root = tmp_path / "repo"
+        _build_tree(
+            scan_root,
+            {
+                ".claude/skills/local/SKILL.md": "---\nname: local\n---\n",
+                "skills/shared/SKILL.md": "---\nname: shared\n---\n",
+                ".gitignore": f"{ignored}\n",
+            },
+        )
+        subprocess.run(["git", "init", "-q", str(scan_root)], check=True)
+
+        scanner = RepoScanner(str(scan_root))
+        scanner.repo_path = scan_root
+        scanner.start_time = time.monotonic()
         report = {"detected_artifacts": [], "truncated": False, "truncation_reason": None}
 
         scanner._scan_skills(report)
 
-        # Symlinked skill should be skipped
-        assert len(report["detected_artifacts"]) == 0
+        assert [a["source_path"] for a in report["detected_artifacts"]] == [
+            os.path.join(".claude", "skills", "local", "SKILL.md"),
+            os.path.join("skills", "shared", "SKILL.md"),
+        ]
+
+    def test_non_git_tree_falls_back_to_walk(self, tmp_path):
+        """Outside a git work tree the listing is unavailable and the scandir walk is used."""
+        scanner = RepoScanner(str(tmp_path))
+        scanner.repo_path = tmp_path
+
+        with patch("scan_repo.subprocess.run", side_effect=FileNotFoundError("git")) as run:
+            assert scanner._git_visible_files() is None
+            assert scanner._git_visible_files() is None
+        assert run.call_count == 1
 
 
 class TestResourceLimits:
@@ -116,15 +257,12 @@ class TestResourceLimits:
     def test_scanner_respects_artifact_limit(self, tmp_path):
         """Scanner stops when hitting artifact limit."""
         scan_root = tmp_path / "repo"
-        scan_root.mkdir()
 
         # Create many skills (more than a small limit)
-        skills_dir = scan_root / ".claude" / "skills"
-
-        for i in range(10):
-            skill_dir = skills_dir / f"skill-{i}"
-            skill_dir.mkdir(parents=True)
-            (skill_dir / "SKILL.md").write_text(f"---\nname: skill-{i}\n---\n# Skill {i}")
+        _build_tree(
+            scan_root,
+            {f".claude/skills/skill-{i}/SKILL.md": f"---\nname: skill-{i}\n---\n# Skill {i}" for i in range(10)},
+        )
 
         # Create scanner with small limit
         scanner = RepoScanner(str(scan_root), max_artifacts=3)
@@ -145,22 +283,10 @@ class TestPathGlobSafety:
     """Tests that Path.glob/rglob don't follow symlinks by default."""
 
     @pytest.mark.skipif(sys.platform == "win32", reason="Symlinks require admin on Windows")
-    def test_glob_does_not_follow_symlinks(self, tmp_path):
+    def test_glob_does_not_follow_symlinks(self, symlink_tree):
         """Verify Path.glob behavior with symlinks."""
-        # Setup
-        main_dir = tmp_path / "main"
-        outside_dir = tmp_path / "outside"
-
-        main_dir.mkdir()
-        outside_dir.mkdir()
-
-        (outside_dir / "secret.txt").write_text("SECRET")
-
-        # Create symlink in main pointing to outside
-        (main_dir / "link").symlink_to(outside_dir)
-
-        # Create normal file in main
-        (main_dir / "normal.txt").write_text("normal")
+        # main/ holds normal.txt and link -> outside/ (which holds secret.txt)
+        main_dir = symlink_tree.main_dir
 
         # Glob should find normal.txt but not traverse symlink
         results = list(main_dir.glob("*.txt"))
@@ -174,13 +300,8 @@ class TestPathGlobSafety:
 class TestNoOsWalkWithFollowlinks:
     """Verify no os.walk with followlinks=True exists."""
 
-    def test_scan_repo_no_followlinks(self):
+    def test_scan_repo_no_followlinks(self, scan_repo_source):
         """scan_repo.py should not use os.walk with followlinks=True."""
-        import inspect
-        from scan_repo import RepoScanner
-
-        source = inspect.getsource(RepoScanner)
-
         # Should not contain followlinks=True
-        assert "followlinks=True" not in source
-        assert "followlinks = True" not in source
+        assert "followlinks=True" not in scan_repo_source
+        assert "followlinks = True" not in scan_repo_source
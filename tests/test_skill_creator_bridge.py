@@ -6,18 +6,11 @@ Tests the skill-creator detection, handoff logic, and inter-skill communication.
 """
 
 import json
-import os
-import sys
-import tempfile
 from pathlib import Path
 from unittest import mock
 
 import pytest
 
-# Add shared dir to path
-SHARED_DIR = Path(__file__).parent.parent / "skills" / "_shared"
-sys.path.insert(0, str(SHARED_DIR))
-
 from skill_creator_bridge import (
     DEFAULT_HANDOFF_THRESHOLD,
     SKILL_CREATOR_PATHS,
@@ -30,151 +23,144 @@ from skill_creator_bridge import (
 )
 
 
+# Never created: stands in for a skill-creator that is not installed
+MISSING_INSTALL = Path("/nonexistent/skill-creator")
+
+
+# Shared, read-only inputs: none of the functions under test mutate them
+_BASIC_ANALYSIS = {
+    "detected_patterns": ["build_file", "documentation"],
+    "language": "Python",
+    "frameworks": [],
+    "confidence_score": 0.4,
+}
+
+_SOURCE_CONTENT = {
+    "readme": "# My Project\n\nA cool project.",
+    "prompts": ["system prompt 1", "system prompt 2"],
+    "docs": ["doc1.md content", "doc2.md content"],
+}
+
+_BASIC_CONTEXT = {
+    "request": {
+        "source_repo": "https://github.com/user/repo",
+        "analysis": {
+            "reason_for_handoff": "Low confidence in template conversion",
+            "confidence_score": 0.35,
+        },
+    },
+    "constraints": {
+        "target_dir": "/home/user/.claude/skills/repo-workflow",
+        "scope": "user",
+    },
+}
+
+_VERBOSE_CONTEXT = {
+    "request": {
+        "source_repo": "https://github.com/user/repo",
+        "analysis": {
+            "reason_for_handoff": "Low confidence",
+            "confidence_score": 0.35,
+            "language": "Python",
+            "frameworks": ["custom"],
+            "detected_patterns": ["agent", "tool"],
+        },
+    },
+    "constraints": {
+        "target_dir": "/home/user/.claude/skills/repo-workflow",
+        "scope": "user",
+    },
+}
+
+
+@pytest.fixture(scope="module")
+def installed_skill_creator(tmp_path_factory):
+    """
+    A skill-creator install (directory plus SKILL.md), built once for the module.
+
+    SKILL.md is left empty: detection only checks that the file exists.
+    """
+    skill_creator_dir = tmp_path_factory.mktemp("skcreator") / "skill-creator"
+    skill_creator_dir.mkdir()
+    (skill_creator_dir / "SKILL.md").touch()
+    return skill_creator_dir
+
+
+@pytest.fixture(scope="class")
+def class_tmp(tmp_path_factory, request):
+    """One scratch directory per test class, for tests that write to distinct names in it."""
+    return tmp_path_factory.mktemp(request.cls.__name__.lower())
+
+
+@pytest.fixture
+def patched_paths(monkeypatch, installed_skill_creator):
+    """Point skill-creator detection at the shared install."""
+    monkeypatch.setattr("skill_creator_bridge.SKILL_CREATOR_PATHS", [installed_skill_creator])
+    return installed_skill_creator
+
+
 class TestSkillCreatorDetection:
     """Tests for skill-creator availability detection."""
 
-    def test_skill_creator_not_installed(self, tmp_path):
+    def test_skill_creator_not_installed(self, monkeypatch):
         """Test detection when skill-creator is not installed."""
-        with mock.patch(
-            "skill_creator_bridge.SKILL_CREATOR_PATHS",
-            [tmp_path / "nonexistent"],
-        ):
-            assert not is_skill_creator_available()
-            assert get_skill_creator_path() is None
-
-    def test_skill_creator_installed(self, tmp_path):
-        """Test detection when skill-creator is installed."""
-        skill_creator_dir = tmp_path / "skill-creator"
-        skill_creator_dir.mkdir()
-        (skill_creator_dir / "SKILL.md").write_text("# Skill Creator")
+        monkeypatch.setattr("skill_creator_bridge.SKILL_CREATOR_PATHS", [MISSING_INSTALL])
+        assert not is_skill_creator_available()
+        assert get_skill_creator_path() is None
 
-        with mock.patch(
-            "skill_creator_bridge.SKILL_CREATOR_PATHS",
-            [skill_creator_dir],
-        ):
-            assert is_skill_creator_available()
-            assert get_skill_creator_path() == skill_creator_dir
+    def test_skill_creator_installed(self, patched_paths):
+        """Test detection when skill-creator is installed."""
+        assert is_skill_creator_available()
+        assert get_skill_creator_path() == patched_paths
 
-    def test_skill_creator_installed_alternative_name(self, tmp_path):
+    def test_skill_creator_installed_alternative_name(self, class_tmp, monkeypatch):
         """Test detection with underscore naming convention."""
-        skill_creator_dir = tmp_path / "skill_creator"
+        skill_creator_dir = class_tmp / "skill_creator"
         skill_creator_dir.mkdir()
-        (skill_creator_dir / "SKILL.md").write_text("# Skill Creator")
+        (skill_creator_dir / "SKILL.md").touch()
 
-        with mock.patch(
-            "skill_creator_bridge.SKILL_CREATOR_PATHS",
-            [tmp_path / "nonexistent", skill_creator_dir],
-        ):
-            assert is_skill_creator_available()
-            assert get_skill_creator_path() == skill_creator_dir
+        monkeypatch.setattr("skill_creator_bridge.SKILL_CREATOR_PATHS", [MISSING_INSTALL, skill_creator_dir])
+        assert is_skill_creator_available()
+        assert get_skill_creator_path() == skill_creator_dir
 
-    def test_skill_creator_missing_skill_md(self, tmp_path):
+    def test_skill_creator_missing_skill_md(self, class_tmp, monkeypatch):
         """Test detection when directory exists but SKILL.md is missing."""
-        skill_creator_dir = tmp_path / "skill-creator"
+        skill_creator_dir = class_tmp / "skill-creator"
         skill_creator_dir.mkdir()
         # No SKILL.md file
 
-        with mock.patch(
-            "skill_creator_bridge.SKILL_CREATOR_PATHS",
-            [skill_creator_dir],
-        ):
-            assert not is_skill_creator_available()
+        monkeypatch.setattr("skill_creator_bridge.SKILL_CREATOR_PATHS", [skill_creator_dir])
+        assert not is_skill_creator_available()
+
+
+# (confidence, force, disable, installed, expected_handoff, reason substring)
+HANDOFF_CASES = [
+    pytest.param(0.8, False, False, True, False, "High confidence", id="high-confidence"),
+    pytest.param(0.3, False, False, True, True, "Low confidence", id="low-confidence-available"),
+    pytest.param(0.3, False, False, False, False, "not installed", id="low-confidence-unavailable"),
+    pytest.param(0.9, True, False, True, True, "User requested", id="force-overrides-confidence"),
+    pytest.param(0.9, True, False, False, False, "not installed", id="force-unavailable"),
+    pytest.param(0.1, False, True, True, False, "User disabled", id="disable-overrides-everything"),
+]
 
 
 class TestShouldHandoff:
     """Tests for handoff decision logic (Option B + Option C)."""
 
-    def test_high_confidence_no_handoff(self):
-        """Test that high confidence prevents handoff."""
+    @pytest.mark.parametrize("confidence, force, disable, installed, expected, substring", HANDOFF_CASES)
+    def test_should_handoff(
+        self, installed_skill_creator, monkeypatch, confidence, force, disable, installed, expected, substring
+    ):
+        """Test the handoff decision for each combination of confidence, flags and availability."""
+        path = installed_skill_creator if installed else MISSING_INSTALL
+        monkeypatch.setattr("skill_creator_bridge.SKILL_CREATOR_PATHS", [path])
         do_handoff, reason = should_handoff(
-            confidence_score=0.8,
-            force_handoff=False,
-            disable_handoff=False,
+            confidence_score=confidence,
+            force_handoff=force,
+            disable_handoff=disable,
         )
-        assert not do_handoff
-        assert "High confidence" in reason
-
-    def test_low_confidence_handoff_when_available(self, tmp_path):
-        """Test that low confidence triggers handoff when skill-creator available."""
-        skill_creator_dir = tmp_path / "skill-creator"
-        skill_creator_dir.mkdir()
-        (skill_creator_dir / "SKILL.md").write_text("# Skill Creator")
-
-        with mock.patch(
-            "skill_creator_bridge.SKILL_CREATOR_PATHS",
-            [skill_creator_dir],
-        ):
-            do_handoff, reason = should_handoff(
-                confidence_score=0.3,
-                force_handoff=False,
-                disable_handoff=False,
-            )
-            assert do_handoff
-            assert "Low confidence" in reason
-
-    def test_low_confidence_no_handoff_when_unavailable(self, tmp_path):
-        """Test that low confidence doesn't handoff when skill-creator unavailable."""
-        with mock.patch(
-            "skill_creator_bridge.SKILL_CREATOR_PATHS",
-            [tmp_path / "nonexistent"],
-        ):
-            do_handoff, reason = should_handoff(
-                confidence_score=0.3,
-                force_handoff=False,
-                disable_handoff=False,
-            )
-            assert not do_handoff
-            assert "not installed" in reason
-
-    def test_force_handoff_overrides_confidence(self, tmp_path):
-        """Test that --use-skill-creator forces handoff regardless of confidence."""
-        skill_creator_dir = tmp_path / "skill-creator"
-        skill_creator_dir.mkdir()
-        (skill_creator_dir / "SKILL.md").write_text("# Skill Creator")
-
-        with mock.patch(
-            "skill_creator_bridge.SKILL_CREATOR_PATHS",
-            [skill_creator_dir],
-        ):
-            do_handoff, reason = should_handoff(
-                confidence_score=0.9,  # Very high confidence
-                force_handoff=True,  # But user forced handoff
-                disable_handoff=False,
-            )
-            assert do_handoff
-            assert "User requested" in reason
-
-    def test_force_handoff_fails_when_unavailable(self, tmp_path):
-        """Test that force handoff fails gracefully when skill-creator not installed."""
-        with mock.patch(
-            "skill_creator_bridge.SKILL_CREATOR_PATHS",
-            [tmp_path / "nonexistent"],
-        ):
-            do_handoff, reason = should_handoff(
-                confidence_score=0.9,
-                force_handoff=True,
-                disable_handoff=False,
-            )
-            assert not do_handoff
-            assert "not installed" in reason
-
-    def test_disable_handoff_overrides_everything(self, tmp_path):
-        """Test that --no-skill-creator disables handoff completely."""
-        skill_creator_dir = tmp_path / "skill-creator"
-        skill_creator_dir.mkdir()
-        (skill_creator_dir / "SKILL.md").write_text("# Skill Creator")
-
-        with mock.patch(
-            "skill_creator_bridge.SKILL_CREATOR_PATHS",
-            [skill_creator_dir],
-        ):
-            do_handoff, reason = should_handoff(
-                confidence_score=0.1,  # Very low confidence
-                force_handoff=False,
-                disable_handoff=True,  # But user disabled handoff
-            )
-            assert not do_handoff
-            assert "User disabled" in reason
+        assert do_handoff == expected
+        assert substring in reason
 
     def test_custom_threshold(self):
         """Test that custom threshold is respected."""
@@ -200,12 +186,7 @@ class TestHandoffContext:
             source_type="workflow_generation",
             scope="user",
             target_dir="/home/user/.claude/skills/repo-workflow",
-            analysis={
-                "detected_patterns": ["build_file", "documentation"],
-                "language": "Python",
-                "frameworks": [],
-                "confidence_score": 0.4,
-            },
+            analysis=_BASIC_ANALYSIS,
         )
 
         assert context["handoff_type"] == "skill_creation"
@@ -223,11 +204,7 @@ class TestHandoffContext:
             scope="user",
             target_dir="/home/user/.claude/skills/repo-workflow",
             analysis={"confidence_score": 0.4},
-            source_content={
-                "readme": "# My Project\n\nA cool project.",
-                "prompts": ["system prompt 1", "system prompt 2"],
-                "docs": ["doc1.md content", "doc2.md content"],
-            },
+            source_content=_SOURCE_CONTENT,
         )
 
         assert "source_content" in context["request"]
@@ -238,9 +215,9 @@ class TestHandoffContext:
 class TestSkillCreatorRequestFile:
     """Tests for skill request file creation."""
 
-    def test_create_request_file(self, tmp_path):
+    def test_create_request_file(self, class_tmp):
         """Test creating a request file at a specific path."""
-        target_path = tmp_path / "request.json"
+        target_path = class_tmp / "request.json"
         context = {"test": "data", "handoff_type": "skill_creation"}
 
         from skill_creator_bridge import create_skill_request_file
@@ -250,30 +227,28 @@ class TestSkillCreatorRequestFile:
         assert result == target_path
         assert target_path.exists()
 
-        with open(target_path) as f:
-            saved_data = json.load(f)
-            assert saved_data == context
+        saved_data = json.loads(target_path.read_bytes())
+        assert saved_data == context
 
-    def test_create_request_file_default(self, tmp_path):
+    def test_create_request_file_default(self, class_tmp):
         """Test creating a request file at the default path (mocked)."""
         context = {"test": "data"}
-        default_path = tmp_path / "default_request.json"
+        default_path = class_tmp / "default_request.json"
 
-        # Mock Path.home() to point to tmp_path so we can verify file creation
-        with mock.patch("pathlib.Path.home", return_value=tmp_path):
+        # Mock Path.home() to point to class_tmp so we can verify file creation
+        with mock.patch("pathlib.Path.home", return_value=class_tmp):
             from skill_creator_bridge import create_skill_request_file
 
             # The function uses Path.home() / ".claude" / "mine" / "skill_creator_request.json"
-            expected_path = tmp_path / ".claude" / "mine" / "skill_creator_request.json"
+            expected_path = class_tmp / ".claude" / "mine" / "skill_creator_request.json"
 
             result = create_skill_request_file(context)
 
             assert result == expected_path
             assert expected_path.exists()
 
-            with open(expected_path) as f:
-                saved_data = json.load(f)
-                assert saved_data == context
+            saved_data = json.loads(expected_path.read_bytes())
+            assert saved_data == context
 
 
 class TestHandoffMessage:
@@ -281,21 +256,7 @@ class TestHandoffMessage:
 
     def test_format_basic_message(self):
         """Test basic message formatting."""
-        context = {
-            "request": {
-                "source_repo": "https://github.com/user/repo",
-                "analysis": {
-                    "reason_for_handoff": "Low confidence in template conversion",
-                    "confidence_score": 0.35,
-                },
-            },
-            "constraints": {
-                "target_dir": "/home/user/.claude/skills/repo-workflow",
-                "scope": "user",
-            },
-        }
-
-        message = format_handoff_message(context, verbose=False)
+        message = format_handoff_message(_BASIC_CONTEXT, verbose=False)
 
         assert "SKILL-CREATOR HANDOFF" in message
         assert "https://github.com/user/repo" in message
@@ -304,24 +265,7 @@ class TestHandoffMessage:
 
     def test_format_verbose_message(self):
         """Test verbose message includes additional details."""
-        context = {
-            "request": {
-                "source_repo": "https://github.com/user/repo",
-                "analysis": {
-                    "reason_for_handoff": "Low confidence",
-                    "confidence_score": 0.35,
-                    "language": "Python",
-                    "frameworks": ["custom"],
-                    "detected_patterns": ["agent", "tool"],
-                },
-            },
-            "constraints": {
-                "target_dir": "/home/user/.claude/skills/repo-workflow",
-                "scope": "user",
-            },
-        }
-
-        message = format_handoff_message(context, verbose=True)
+        message = format_handoff_message(_VERBOSE_CONTEXT, verbose=True)
 
         assert "Language: Python" in message
         assert "Frameworks: custom" in message
@@ -5,25 +5,131 @@ Tests that the UpdateTransaction class properly tracks changes and rolls back
 all modifications on failure, as required by SECURITY.md.
 """
 
+import shutil
 import pytest
-from pathlib import Path
+from pathlib import Path, PurePosixPath
+from types import SimpleNamespace
 
+import transaction
 from transaction import UpdateTransaction, TransactionError
 
 
+class MemoryFS:
+    """
+    Dict-backed stand-in for the few file operations transaction.py performs.
+
+    Files live in ``files`` keyed by path string. A source that was never written
+    here is read from the real disk, so shared on-disk fixtures can still be copied in.
+    """
+
+    def __init__(self):
+        self.files = {}
+        self.dirs = {"/"}
+
+    def exists(self, path) -> bool:
+        key = str(path)
+        return key in self.files or key in self.dirs
+
+    def makedirs(self, path, exist_ok=False):
+        for parent in (PurePosixPath(path), *PurePosixPath(path).parents):
+            self.dirs.add(str(parent))
+
+    def mkdtemp(self, prefix="tmp"):
+        path = f"/{prefix}{len(self.dirs)}"
+        self.makedirs(path)
+        return path
+
+    def copy2(self, src, dest):
+        key = str(src)
+        if key in self.files:
+            self.files[str(dest)] = self.files[key]
+        else:
+            self.files[str(dest)] = Path(key).read_text()
+
+    def unlink(self, path):
+        try:
+            del self.files[str(path)]
+        except KeyError:
+            raise FileNotFoundError(str(path)) from None
+
+    def rmtree(self, path):
+        prefix = str(path) + "/"
+        self.files = {k: v for k, v in self.files.items() if not k.startswith(prefix)}
+        self.dirs = {d for d in self.dirs if d != str(path) and not d.startswith(prefix)}
+
+
+class _MemPath(PurePosixPath):
+    """A PurePosixPath whose I/O goes to the MemoryFS bound on the subclass."""
+
+    fs: MemoryFS
+
+    def resolve(self):
+        return self
+
+    def exists(self):
+        return self.fs.exists(self)
+
+    def unlink(self):
+        self.fs.unlink(self)
+
+    def read_text(self):
+        return self.fs.files[str(self)]
+
+    def write_text(self, text):
+        self.fs.files[str(self)] = text
+
+
+@pytest.fixture(scope="session")
+def static_source(tmp_path_factory):
+    """A read-only source file on disk, written once and copied from by every test."""
+    path = tmp_path_factory.mktemp("src") / "source.txt"
+    path.write_text("source content")
+    return path
+
+
+@pytest.fixture
+def mem_root(monkeypatch):
+    """
+    Root of an in-memory tree with transaction.py's disk I/O routed into it.
+
+    Used like tmp_path: ``mem_root / "dest.txt"`` supports write_text/read_text/exists.
+    """
+    fs = MemoryFS()
+    mem_path = type("MemPath", (_MemPath,), {"fs": fs})
+    monkeypatch.setattr(transaction, "Path", mem_path)
+    monkeypatch.setattr(transaction, "platform_utils", SimpleNamespace(get_long_path=str))
+    monkeypatch.setattr(transaction, "tempfile", SimpleNamespace(mkdtemp=fs.mkdtemp))
+    monkeypatch.setattr(transaction, "shutil", SimpleNamespace(copy2=fs.copy2, rmtree=fs.rmtree))
+    monkeypatch.setattr(
+        transaction,
+        "os",
+        SimpleNamespace(path=SimpleNamespace(exists=fs.exists), makedirs=fs.makedirs, unlink=fs.unlink),
+    )
+    root = mem_path("/work")
+    fs.makedirs(root)
+    return root
+
+
+@pytest.fixture
+def tx(mem_root):
+    """
+    A transaction over the in-memory tree.
+
+    Teardown exits it like a with-block: rolled back unless committed, temp dir removed.
+    """
+    with UpdateTransaction() as txn:
+        yield txn
+
+
 class TestRollback:
     """Test transaction rollback behavior."""
 
-    def test_rollback_restores_copied_file(self, tmp_path):
+    def test_rollback_restores_copied_file(self, mem_root, tx, static_source):
         """Rollback restores file to original content after copy."""
-        src = tmp_path / "source.txt"
-        src.write_text("source content")
-
-        dest = tmp_path / "dest.txt"
+        dest = mem_root / "dest.txt"
         dest.write_text("original content")
 
-        tx = UpdateTransaction()
-        tx.copy_file(src, dest)
+        tx.copy_file(static_source, dest)
 
         # Dest should now have source content
         assert dest.read_text() == "source content"
@@ -33,16 +139,12 @@ class TestRollback:
 
         assert dest.read_text() == "original content"
 
-    def test_rollback_removes_new_file(self, tmp_path):
+    def test_rollback_removes_new_file(self, mem_root, tx, static_source):
         """Rollback removes files that didn't exist before copy."""
-        src = tmp_path / "source.txt"
-        src.write_text("new content")
-
-        new_dest = tmp_path / "new_file.txt"
+        new_dest = mem_root / "new_file.txt"
         assert not new_dest.exists()
 
-        tx = UpdateTransaction()
-        tx.copy_file(src, new_dest)
+        tx.copy_file(static_source, new_dest)
 
         assert new_dest.exists()
 
@@ -51,12 +153,11 @@ class TestRollback:
 
         assert not new_dest.exists()
 
-    def test_rollback_restores_deleted_file(self, tmp_path):
+    def test_rollback_restores_deleted_file(self, mem_root, tx):
         """Rollback restores deleted files."""
-        target = tmp_path / "to_delete.txt"
+        target = mem_root / "to_delete.txt"
         target.write_text("important content")
 
-        tx = UpdateTransaction()
         tx.delete_file(target)
 
         assert not target.exists()
@@ -67,20 +168,16 @@ class TestRollback:
         assert target.exists()
         assert target.read_text() == "important content"
 
-    def test_partial_failure_full_rollback(self, tmp_path):
+    def test_partial_failure_full_rollback(self, mem_root, tx, static_source):
         """Multiple operations should all rollback."""
-        src = tmp_path / "source.txt"
-        src.write_text("source")
-
-        file1 = tmp_path / "file1.txt"
-        file2 = tmp_path / "file2.txt"
+        file1 = mem_root / "file1.txt"
+        file2 = mem_root / "file2.txt"
 
         file1.write_text("original1")
         file2.write_text("original2")
 
-        tx = UpdateTransaction()
-        tx.copy_file(src, file1)
-        tx.copy_file(src, file2)
+        tx.copy_file(static_source, file1)
+        tx.copy_file(static_source, file2)
 
         # Simulate failure and rollback
         tx.rollback()
@@ -88,16 +185,12 @@ class TestRollback:
         assert file1.read_text() == "original1"
         assert file2.read_text() == "original2"
 
-    def test_commit_prevents_rollback(self, tmp_path):
+    def test_commit_prevents_rollback(self, mem_root, tx, static_source):
         """After commit, rollback has no effect."""
-        src = tmp_path / "source.txt"
-        src.write_text("new content")
-
-        dest = tmp_path / "dest.txt"
+        dest = mem_root / "dest.txt"
         dest.write_text("original content")
 
-        tx = UpdateTransaction()
-        tx.copy_file(src, dest)
+        tx.copy_file(static_source, dest)
 
         # Commit
         tx.commit()
@@ -105,34 +198,28 @@ class TestRollback:
         # Rollback should do nothing after commit
         tx.rollback()
 
-        assert dest.read_text() == "new content"
+        assert dest.read_text() == "source content"
 
-    def test_context_manager_commits_on_success(self, tmp_path):
+    def test_context_manager_commits_on_success(self, mem_root, static_source):
         """Transaction context manager commits on successful exit."""
-        src = tmp_path / "source.txt"
-        src.write_text("context manager content")
-
-        dest = tmp_path / "dest.txt"
+        dest = mem_root / "dest.txt"
         dest.write_text("original")
 
         with UpdateTransaction() as tx:
-            tx.copy_file(src, dest)
+            tx.copy_file(static_source, dest)
             tx.commit()
 
         # Should be committed (not rolled back)
-        assert dest.read_text() == "context manager content"
+        assert dest.read_text() == "source content"
 
-    def test_context_manager_rolls_back_on_exception(self, tmp_path):
+    def test_context_manager_rolls_back_on_exception(self, mem_root, static_source):
         """Transaction context manager rolls back on exception."""
-        src = tmp_path / "source.txt"
-        src.write_text("attempted change")
-
-        dest = tmp_path / "dest.txt"
+        dest = mem_root / "dest.txt"
         dest.write_text("original")
 
         try:
             with UpdateTransaction() as tx:
-                tx.copy_file(src, dest)
+                tx.copy_file(static_source, dest)
                 raise ValueError("Simulated failure")
         except ValueError:
             pass
@@ -144,49 +231,39 @@ class TestRollback:
 class TestTransactionEdgeCases:
     """Test edge cases in transaction handling."""
 
-    def test_empty_transaction_rollback(self, tmp_path):
+    def test_empty_transaction_rollback(self, tx):
         """Rollback on empty transaction does nothing."""
-        tx = UpdateTransaction()
         # Should not raise
         tx.rollback()
 
-    def test_double_rollback_is_safe(self, tmp_path):
+    def test_double_rollback_is_safe(self, mem_root, tx, static_source):
         """Calling rollback twice is safe."""
-        src = tmp_path / "source.txt"
-        src.write_text("new")
-
-        dest = tmp_path / "dest.txt"
+        dest = mem_root / "dest.txt"
         dest.write_text("original")
 
-        tx = UpdateTransaction()
-        tx.copy_file(src, dest)
+        tx.copy_file(static_source, dest)
 
         tx.rollback()
         tx.rollback()  # Should not raise
 
         assert dest.read_text() == "original"
 
-    def test_delete_nonexistent_file(self, tmp_path):
+    def test_delete_nonexistent_file(self, mem_root, tx):
         """Deleting nonexistent file is a no-op."""
-        missing = tmp_path / "missing.txt"
+        missing = mem_root / "missing.txt"
 
-        tx = UpdateTransaction()
         # Should not raise
         tx.delete_file(missing)
 
-    def test_multiple_operations_mixed(self, tmp_path):
+    def test_multiple_operations_mixed(self, mem_root, tx, static_source):
         """Tracks mix of copy and delete operations."""
-        src = tmp_path / "source.txt"
-        src.write_text("source")
-
-        existing = tmp_path / "existing.txt"
+        existing = mem_root / "existing.txt"
         existing.write_text("original")
 
-        to_delete = tmp_path / "to_delete.txt"
+        to_delete = mem_root / "to_delete.txt"
         to_delete.write_text("will be deleted")
 
-        tx = UpdateTransaction()
-        tx.copy_file(src, existing)
+        tx.copy_file(static_source, existing)
         tx.delete_file(to_delete)
 
         tx.rollback()
@@ -195,22 +272,38 @@ class TestTransactionEdgeCases:
         assert to_delete.exists()
         assert to_delete.read_text() == "will be deleted"
 
+    def test_copy_fn_handles_every_copy(self, mem_root, static_source):
+        """A custom copy_fn is used for the backup, the copy and the restore."""
+        calls = []
+
+        def copy_fn(src, dest):
+            calls.append((src, dest))
+            transaction.shutil.copy2(src, dest)
+
+        dest = mem_root / "dest.txt"
+        dest.write_text("original")
+
+        tx = UpdateTransaction(copy_fn=copy_fn)
+        tx.copy_file(static_source, dest)
+        tx.rollback()
+
+        assert len(calls) == 3
+        assert dest.read_text() == "original"
+
 
 class TestTransactionCopyIntoNewDirectory:
     """Test transaction handling when creating new directories."""
 
-    def test_copy_creates_parent_directories(self, tmp_path):
+    def test_copy_creates_parent_directories(self, tmp_path, static_source):
         """Copy operation creates parent directories as needed."""
-        src = tmp_path / "source.txt"
-        src.write_text("content")
-
         dest = tmp_path / "deep" / "nested" / "dir" / "file.txt"
 
-        tx = UpdateTransaction()
-        tx.copy_file(src, dest)
+        # Content is all these tests check, so skip copy2's metadata syscalls
+        tx = UpdateTransaction(copy_fn=shutil.copyfile)
+        tx.copy_file(static_source, dest)
 
         assert dest.exists()
-        assert dest.read_text() == "content"
+        assert dest.read_text() == "source content"
 
         # Rollback should remove the file
         tx.rollback()
@@ -6,21 +6,13 @@ Tests for path safety in update_integrations.py.
 Verifies that registry/provenance data is treated as untrusted input.
 """
 
-import sys
 import os
-import json
 from pathlib import Path
 import pytest
 
-# Add shared modules to path
-SHARED_DIR = Path(__file__).resolve().parent.parent / "skills" / "_shared"
-MINE_MINE_SCRIPTS = Path(__file__).resolve().parent.parent / "skills" / "mine-mine" / "scripts"
-if str(SHARED_DIR) not in sys.path:
-    sys.path.insert(0, str(SHARED_DIR))
-if str(MINE_MINE_SCRIPTS) not in sys.path:
-    sys.path.insert(0, str(MINE_MINE_SCRIPTS))
-
+# conftest.py puts skills/_shared and skills/mine-mine/scripts on sys.path
 from path_safety import PathSafetyError
+from update_integrations import IntegrationUpdater
 
 # This test file proves the following claims:
 DOC_CLAIMS = [
@@ -28,43 +20,97 @@ DOC_CLAIMS = [
 ]
 
 
+def _touch(path):
+    """Create an empty file at path, making its missing parent directories first."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    open(path, "wb").close()
+
+
+@pytest.fixture(scope="module")
+def make_updater():
+    """
+    Factory for (updater, integration) pairs over an in-memory registry.
+
+    The registry never touches disk: it goes straight to IntegrationUpdater.from_dict().
+    """
+
+    def _make(target_scope, target_repo_path=None, artifact_mappings=()):
+        integration = {
+            "source_url": "https://github.com/test/repo",
+            "target_scope": target_scope,
+            "artifact_mappings": list(artifact_mappings),
+        }
+        if target_repo_path is not None:
+            integration["target_repo_path"] = str(target_repo_path)
+        registry = {"integrations": {"test-integration": integration}}
+        return IntegrationUpdater.from_dict(registry, Path("unused-registry.json")), integration
+
+    return _make
+
+
+@pytest.fixture(scope="session")
+def prebuilt_project(tmp_path_factory):
+    """
+    Read-only tree shared by the validation tests that never modify it.
+
+    project/.claude/commands/good.md
+    project/.claude/agents/helper.md
+    other_project/secret.md
+    other_location/
+    """
+    base = tmp_path_factory.mktemp("update_paths")
+    for rel in ("project/.claude/commands/good.md", "project/.claude/agents/helper.md", "other_project/secret.md"):
+        _touch(base / rel)
+    os.mkdir(base / "other_location")
+    return base
+
+
+@pytest.fixture
+def fake_home(tmp_path):
+    """
+    Point Path.home() at a fresh directory for one test.
+
+    The descriptor is swapped and restored directly; this is the only patch the
+    test needs, so monkeypatch's undo stack buys nothing.
+    """
+    home = tmp_path / "fake_home"
+    original = Path.__dict__["home"]
+    Path.home = classmethod(lambda cls: home)
+    try:
+        yield home
+    finally:
+        Path.home = original
+
+
+@pytest.fixture(scope="session")
+def symlinks_supported(tmp_path_factory):
+    """Whether this platform lets us create symlinks, probed once per session."""
+    probe = tmp_path_factory.mktemp("symlink_probe")
+    try:
+        os.symlink(probe, probe / "link")
+    except (OSError, NotImplementedError):
+        return False
+    return True
+
+
 class TestRegistryPathValidation:
     """Tests that registry entries with malicious paths are blocked."""
 
-    def test_registry_entry_with_traversal_blocked(self, tmp_path):
+    def test_registry_entry_with_traversal_blocked(self, prebuilt_project, make_updater):
         """Registry entry with ../../ traversal path should be blocked."""
         # Create a mock integration with a malicious dest_abspath
-        root = tmp_path / "root" / ".claude"
-        root.mkdir(parents=True)
-
-        # Import the validation function
-        sys.path.insert(0, str(MINE_MINE_SCRIPTS))
-        import _init_shared
-        from update_integrations import IntegrationUpdater
-
-        # Create a minimal registry
-        registry_path = tmp_path / "registry.json"
-        registry = {
-            "integrations": {
-                "test-integration": {
-                    "source_url": "https://github.com/test/repo",
-                    "target_scope": "project",
-                    "target_repo_path": str(tmp_path / "root"),
-                    "artifact_mappings": [
-                        {
-                            "source_relpath": ".claude/commands/evil.md",
-                            # Malicious path trying to escape
-                            "dest_abspath": str(tmp_path / "root" / ".claude" / ".." / ".." / "evil.md"),
-                            "type": "command",
-                        }
-                    ],
+        updater, integration = make_updater(
+            "project",
+            prebuilt_project / "project",
+            artifact_mappings=[
+                {
+                    "source_relpath": ".claude/commands/evil.md",
+                    # Malicious path trying to escape
+                    "dest_abspath": str(prebuilt_project / "project" / ".claude" / ".." / ".." / "evil.md"),
+                    "type": "command",
                 }
-            }
-        }
-        registry_path.write_text(json.dumps(registry))
-
-        updater = IntegrationUpdater(registry_path, dry_run=True, verbose=False)
-        integration = registry["integrations"]["test-integration"]
+            ],
+        )
         dest_path = Path(integration["artifact_mappings"][0]["dest_abspath"])
 
         # Validation should raise PathSafetyError
@@ -73,69 +119,22 @@ class TestRegistryPathValidation:
 
         assert "traversal" in str(exc_info.value).lower() or "outside" in str(exc_info.value).lower()
 
-    def test_path_outside_root_blocked(self, tmp_path):
+    def test_path_outside_root_blocked(self, prebuilt_project, make_updater):
         """Absolute path outside install root should be blocked."""
-        root = tmp_path / "project" / ".claude"
-        root.mkdir(parents=True)
-
-        outside = tmp_path / "other_location"
-        outside.mkdir()
-
-        sys.path.insert(0, str(MINE_MINE_SCRIPTS))
-        import _init_shared
-        from update_integrations import IntegrationUpdater
-
-        registry_path = tmp_path / "registry.json"
-        registry = {
-            "integrations": {
-                "test-integration": {
-                    "source_url": "https://github.com/test/repo",
-                    "target_scope": "project",
-                    "target_repo_path": str(tmp_path / "project"),
-                    "artifact_mappings": [],
-                }
-            }
-        }
-        registry_path.write_text(json.dumps(registry))
-
-        updater = IntegrationUpdater(registry_path, dry_run=True, verbose=False)
-        integration = registry["integrations"]["test-integration"]
+        updater, integration = make_updater("project", prebuilt_project / "project")
 
         # Path completely outside install root
-        evil_path = outside / "malicious.md"
+        evil_path = prebuilt_project / "other_location" / "malicious.md"
 
         with pytest.raises(PathSafetyError):
             updater._validate_destination_path(evil_path, integration)
 
-    def test_valid_path_inside_root_allowed(self, tmp_path):
+    def test_valid_path_inside_root_allowed(self, prebuilt_project, make_updater):
         """Valid path inside install root should be allowed."""
-        root = tmp_path / "project" / ".claude"
-        root.mkdir(parents=True)
-
-        # Create a file inside root
-        valid_file = root / "commands" / "good.md"
-        valid_file.parent.mkdir(parents=True, exist_ok=True)
-        valid_file.touch()
-
-        sys.path.insert(0, str(MINE_MINE_SCRIPTS))
-        import _init_shared
-        from update_integrations import IntegrationUpdater
-
-        registry_path = tmp_path / "registry.json"
-        registry = {
-            "integrations": {
-                "test-integration": {
-                    "source_url": "https://github.com/test/repo",
-                    "target_scope": "project",
-                    "target_repo_path": str(tmp_path / "project"),
-                    "artifact_mappings": [],
-                }
-            }
-        }
-        registry_path.write_text(json.dumps(registry))
+        # An existing file inside root
+        valid_file = prebuilt_project / "project" / ".claude" / "commands" / "good.md"
 
-        updater = IntegrationUpdater(registry_path, dry_run=True, verbose=False)
-        integration = registry["integrations"]["test-integration"]
+        updater, integration = make_updater("project", prebuilt_project / "project")
 
         # This should NOT raise
         result = updater._validate_destination_path(valid_file, integration)
@@ -145,139 +144,125 @@ class TestRegistryPathValidation:
 class TestUpdateScopeEnforcement:
     """Tests that updates respect scope boundaries."""
 
-    def test_user_scope_respects_home_boundary(self, tmp_path, monkeypatch):
+    def test_user_scope_respects_home_boundary(self, fake_home, make_updater):
         """User scope updates should only write under ~/.claude."""
-        sys.path.insert(0, str(MINE_MINE_SCRIPTS))
-        import _init_shared
-        from update_integrations import IntegrationUpdater
-
-        # Mock home directory
-        fake_home = tmp_path / "fake_home"
-        fake_home.mkdir()
-        monkeypatch.setattr(Path, "home", lambda: fake_home)
-
         # Create .claude dir
         claude_dir = fake_home / ".claude"
-        claude_dir.mkdir()
-
-        registry_path = tmp_path / "registry.json"
-        registry = {
-            "integrations": {
-                "test-integration": {
-                    "source_url": "https://github.com/test/repo",
-                    "target_scope": "user",
-                    "artifact_mappings": [],
-                }
-            }
-        }
-        registry_path.write_text(json.dumps(registry))
+        os.makedirs(claude_dir)
 
-        updater = IntegrationUpdater(registry_path, dry_run=True, verbose=False)
-        integration = registry["integrations"]["test-integration"]
+        updater, integration = make_updater("user")
 
         # Path inside .claude - should work
         valid_path = claude_dir / "commands" / "test.md"
-        valid_path.parent.mkdir(parents=True, exist_ok=True)
-        valid_path.touch()
+        _touch(valid_path)
 
         result = updater._validate_destination_path(valid_path, integration)
         assert result is not None
 
         # Path outside .claude - should fail
         outside_path = fake_home / "Documents" / "evil.md"
-        outside_path.parent.mkdir(parents=True, exist_ok=True)
-        outside_path.touch()
+        _touch(outside_path)
 
         with pytest.raises(PathSafetyError):
             updater._validate_destination_path(outside_path, integration)
 
-    def test_project_scope_respects_repo_boundary(self, tmp_path):
+    def test_project_scope_respects_repo_boundary(self, prebuilt_project, make_updater):
         """Project scope updates should only write under <repo>/.claude."""
-        sys.path.insert(0, str(MINE_MINE_SCRIPTS))
-        import _init_shared
-        from update_integrations import IntegrationUpdater
-
-        project_root = tmp_path / "my_project"
-        project_root.mkdir()
-        claude_dir = project_root / ".claude"
-        claude_dir.mkdir()
-
-        registry_path = tmp_path / "registry.json"
-        registry = {
-            "integrations": {
-                "test-integration": {
-                    "source_url": "https://github.com/test/repo",
-                    "target_scope": "project",
-                    "target_repo_path": str(project_root),
-                    "artifact_mappings": [],
-                }
-            }
-        }
-        registry_path.write_text(json.dumps(registry))
+        project_root = prebuilt_project / "project"
 
-        updater = IntegrationUpdater(registry_path, dry_run=True, verbose=False)
-        integration = registry["integrations"]["test-integration"]
+        updater, integration = make_updater("project", project_root)
 
         # Path inside project/.claude - should work
-        valid_path = claude_dir / "agents" / "helper.md"
-        valid_path.parent.mkdir(parents=True, exist_ok=True)
-        valid_path.touch()
+        valid_path = project_root / ".claude" / "agents" / "helper.md"
 
         result = updater._validate_destination_path(valid_path, integration)
         assert result is not None
 
         # Path outside project - should fail
-        outside_path = tmp_path / "other_project" / "secret.md"
-        outside_path.parent.mkdir(parents=True, exist_ok=True)
-        outside_path.touch()
+        outside_path = prebuilt_project / "other_project" / "secret.md"
 
         with pytest.raises(PathSafetyError):
             updater._validate_destination_path(outside_path, integration)
 
+    def test_install_root_resolved_once(self, prebuilt_project, make_updater, monkeypatch):
+        """Validating many mappings of one integration canonicalizes its root only once."""
+        project_root = prebuilt_project / "project"
+        updater, integration = make_updater("project", project_root)
+
+        calls = []
+        real_get_install_root = updater._get_install_root
+
+        def counting_get_install_root(integ):
+            calls.append(integ)
+            return real_get_install_root(integ)
+
+        monkeypatch.setattr(updater, "_get_install_root", counting_get_install_root)
+
+        for name in ("a.md", "b.md", "c.md"):
+            dest = project_root / ".claude" / "commands" / name
+            assert updater._validate_destination_path(dest, integration) == dest.resolve()
+        assert len(calls) == 1
+
+    def test_install_root_shared_across_integrations(self, prebuilt_project, make_updater, monkeypatch):
+        """Integrations with the same scope and repo share one resolved root; other repos get their own."""
+        updater, first = make_updater("project", prebuilt_project / "project")
+        second = dict(first, source_url="https://github.com/test/other")
+        elsewhere = dict(first, target_repo_path=str(prebuilt_project / "other_project"))
+
+        calls = []
+        real_get_install_root = updater._get_install_root
+
+        def counting_get_install_root(integ):
+            calls.append(integ)
+            return real_get_install_root(integ)
+
+        monkeypatch.setattr(updater, "_get_install_root", counting_get_install_root)
+
+        assert updater._resolved_install_root(first) == updater._resolved_install_root(second)
+        assert len(calls) == 1
+        assert updater._resolved_install_root(elsewhere) == (prebuilt_project / "other_project" / ".claude").resolve()
+        assert len(calls) == 2
+
 
 class TestSymlinkEscapeBlocked:
     """Tests that symlink-based escapes are blocked."""
 
-    def test_symlink_escape_blocked(self, tmp_path):
+    @pytest.fixture(autouse=True)
+    def _require_symlinks(self, symlinks_supported):
+        """Skip before any test tree is built when symlinks cannot be created."""
+        if not symlinks_supported:
+            pytest.skip("Symlinks not supported on this system")
+
+    def test_symlink_escape_blocked(self, tmp_path, make_updater):
         """Symlinks pointing outside root should be blocked."""
         project_root = tmp_path / "project"
-        project_root.mkdir()
         claude_dir = project_root / ".claude"
-        claude_dir.mkdir()
+        os.makedirs(claude_dir)
 
-        outside = tmp_path / "outside"
-        outside.mkdir()
-        secret_file = outside / "secret.md"
-        secret_file.touch()
+        secret_file = tmp_path / "outside" / "secret.md"
+        _touch(secret_file)
 
         # Create a symlink inside .claude pointing outside
         link = claude_dir / "escape_link"
+        os.symlink(secret_file, link)
 
-        try:
-            os.symlink(secret_file, link)
-        except OSError:
-            pytest.skip("Symlinks not supported on this system")
-
-        sys.path.insert(0, str(MINE_MINE_SCRIPTS))
-        import _init_shared
-        from update_integrations import IntegrationUpdater
-
-        registry_path = tmp_path / "registry.json"
-        registry = {
-            "integrations": {
-                "test-integration": {
-                    "source_url": "https://github.com/test/repo",
-                    "target_scope": "project",
-                    "target_repo_path": str(project_root),
-                    "artifact_mappings": [],
-                }
-            }
-        }
-        registry_path.write_text(json.dumps(registry))
-
-        updater = IntegrationUpdater(registry_path, dry_run=True, verbose=False)
-        integration = registry["integrations"]["test-integration"]
+        updater, integration = make_updater("project", project_root)
 
         # Symlink pointing outside should be blocked
         with pytest.raises(PathSafetyError):
             updater._validate_destination_path(link, integration)
+
+    def test_dangling_symlink_blocked(self, tmp_path, make_updater):
+        """A symlink whose target does not exist yet is still rejected before resolution."""
+        project_root = tmp_path / "project"
+        claude_dir = project_root / ".claude"
+        os.makedirs(claude_dir)
+
+        # Points inside the root, at a file that does not exist: exists() is False for it
+        link = claude_dir / "dangling_link"
+        os.symlink(claude_dir / "not_yet_written.md", link)
+
+        updater, integration = make_updater("project", project_root)
+
+        with pytest.raises(PathSafetyError, match="Symlink not allowed"):
+            updater._validate_destination_path(link, integration)